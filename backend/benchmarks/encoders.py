@@ -0,0 +1,111 @@
+"""Benchmark the encoders used to cache Polars data sources.
+
+Compares encode and decode throughput and the encoded size of Parquet (zstd and
+lz4) and Arrow IPC (uncompressed and lz4) on a wide and a tall frame. Data is
+encoded to files and decoded by collecting the lazy scan of the file in full, as
+a view reading the whole data source would.
+
+Run from the `backend` directory with:
+
+    python -m benchmarks.encoders --rows 5000000 --repeat 3
+"""
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+
+from tacobi.data_source.encode import Encoder, IPCEncoder, PolarsEncoder
+
+ENCODERS: dict[str, Encoder] = {
+    "parquet-zstd": PolarsEncoder(compression="zstd"),
+    "parquet-lz4": PolarsEncoder(compression="lz4"),
+    "ipc": IPCEncoder(),
+    "ipc-lz4": IPCEncoder(compression="lz4"),
+}
+"""The encoders to compare."""
+
+
+def make_tall_frame(rows: int) -> pl.DataFrame:
+    """Create a frame with few columns and many rows."""
+    rng = np.random.default_rng(0)
+    return pl.DataFrame(
+        {
+            "id": np.arange(rows),
+            "category": rng.integers(0, 100, rows).astype(str),
+            "value": rng.normal(size=rows),
+            "count": rng.integers(0, 1000, rows),
+            "flag": rng.integers(0, 2, rows).astype(bool),
+        }
+    )
+
+
+def make_wide_frame(rows: int, columns: int = 200) -> pl.DataFrame:
+    """Create a frame with many columns and fewer rows."""
+    rng = np.random.default_rng(0)
+    return pl.DataFrame(
+        {
+            f"col_{i}": (
+                rng.normal(size=rows) if i % 2 else rng.integers(0, 1000, rows)
+            )
+            for i in range(columns)
+        }
+    )
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    """Return the fastest of several runs of a function, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench_frame(name: str, frame: pl.DataFrame, repeat: int) -> None:
+    """Benchmark all encoders on a frame and print the results."""
+    size_mb = frame.estimated_size() / 1e6
+    print(f"\n{name}: {frame.height} rows x {frame.width} columns, {size_mb:.1f} MB")
+    print(
+        f"{'encoder':<14}{'size MB':>10}{'ratio':>8}"
+        f"{'encode MB/s':>14}{'decode MB/s':>14}"
+    )
+
+    lazyframe = frame.lazy()
+    with tempfile.TemporaryDirectory() as tmp:
+        for encoder_name, encoder in ENCODERS.items():
+            path = Path(tmp) / encoder_name
+
+            encode_time = best_of(
+                repeat, lambda e=encoder, p=path: e.encode_to_file(lazyframe, p)
+            )
+            decode_time = best_of(
+                repeat, lambda e=encoder, p=path: e.decode_from_file(p).collect()
+            )
+            encoded_mb = path.stat().st_size / 1e6
+
+            print(
+                f"{encoder_name:<14}{encoded_mb:>10.1f}"
+                f"{encoded_mb / size_mb:>8.2f}"
+                f"{size_mb / encode_time:>14.0f}{size_mb / decode_time:>14.0f}"
+            )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    bench_frame("tall", make_tall_frame(args.rows), args.repeat)
+    bench_frame("wide", make_wide_frame(args.rows // 50), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark materialized view endpoints.
+
+Compares converting and serializing the latest data on every request (the
+previous behaviour) against returning the body pre-serialized on recompute, and
+serializing through a BaseModel per row against the column-wise serializer.
+
+Run from the `backend` directory with:
+
+    python -m benchmarks.materialized_response --rows 200000 --requests 20
+"""
+
+import argparse
+import asyncio
+import time
+
+import polars as pl
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pandera.polars import DataFrameModel
+from pandera.typing.polars import DataFrame
+
+from tacobi.view import MaterializedView, ViewManager
+
+
+class PersonFrame(DataFrameModel):
+    """Benchmark DataFrame."""
+
+    name: str
+    age: int
+    score: float
+
+
+def make_frame(rows: int) -> pl.DataFrame:
+    """Create a frame with the given number of rows."""
+    return pl.DataFrame(
+        {
+            "name": [f"person_{i}" for i in range(rows)],
+            "age": [i % 90 for i in range(rows)],
+            "score": [i / 7 for i in range(rows)],
+        }
+    )
+
+
+def time_requests(client: TestClient, route: str, requests: int) -> float:
+    """Return the mean latency in milliseconds of GET requests to a route."""
+    client.get(route)  # Warm up
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(route)
+        response.raise_for_status()
+    return (time.perf_counter() - start) / requests * 1000
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    frame = make_frame(args.rows)
+
+    async def people() -> DataFrame[PersonFrame]:
+        return frame.pipe(PersonFrame)
+
+    app = FastAPI()
+    view_manager = ViewManager(recompute_trigger=None, fastapi_app=app)
+    view = MaterializedView(name="people", function=people, route="/people")
+    view_manager.add_materialized_view(view)
+
+    # The previous per-request path, kept here for comparison
+    @app.get("/people_per_request", response_model=view.fastapi_response_model)
+    def per_request() -> view.fastapi_response_model:
+        return view.fastapi_response_model(
+            data=view.latest_data_as_base_model, last_updated=view.latest_update
+        )
+
+    start = time.perf_counter()
+    asyncio.run(view_manager._recompute_materialized_views())
+    recompute_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    view.fastapi_response_model(
+        data=view.convert_to_base_model(frame), last_updated=view.latest_update
+    ).model_dump_json()
+    per_row_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    view.serialize_response(frame, view.latest_update)
+    columnar_ms = (time.perf_counter() - start) * 1000
+
+    client = TestClient(app)
+    per_request_ms = time_requests(client, "/people_per_request", args.requests)
+    precomputed_ms = time_requests(client, "/people", args.requests)
+
+    print(f"rows: {args.rows}, requests: {args.requests}")
+    print(f"recompute (incl. serialization): {recompute_ms:10.2f} ms")
+    print(f"per-row serialization:           {per_row_ms:10.2f} ms")
+    print(f"column-wise serialization:       {columnar_ms:10.2f} ms")
+    print(f"per-request conversion:          {per_request_ms:10.2f} ms/request")
+    print(f"pre-serialized response:         {precomputed_ms:10.2f} ms/request")
+    print(f"speedup:                         {per_request_ms / precomputed_ms:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark the response formats of materialized view endpoints.
+
+Compares the latency of the first request after a recompute, which encodes the
+body, and of later requests served from the per-recompute cache, along with the
+body size of the JSON envelope and of the Arrow IPC, Parquet and CSV formats.
+The JSON body is serialized on recompute, so its first request includes it.
+
+Run from the `backend` directory with:
+
+    python -m benchmarks.response_formats --rows 200000 --requests 20
+"""
+
+import argparse
+import asyncio
+import time
+from dataclasses import replace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pandera.typing.polars import DataFrame
+
+from benchmarks.materialized_response import PersonFrame, make_frame
+from tacobi.view import MaterializedView, ViewManager
+from tacobi.view.response_formats import ResponseFormat
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    frame = make_frame(args.rows)
+
+    async def people() -> DataFrame[PersonFrame]:
+        return frame.pipe(PersonFrame)
+
+    app = FastAPI()
+    view_manager = ViewManager(recompute_trigger=None, fastapi_app=app)
+    view = MaterializedView(name="people", function=people, route="/people")
+    view_manager.add_materialized_view(view)
+    client = TestClient(app)
+
+    print(f"rows: {args.rows}, requests: {args.requests}")
+    print(f"{'format':<10}{'size MB':>10}{'first ms':>12}{'cached ms':>12}")
+    for response_format in ResponseFormat:
+        # Recompute with new content so the JSON body is part of the first request
+        if view.snapshot is not None:
+            view.store.publish({view.id: replace(view.snapshot, fingerprint=None)})
+        start = time.perf_counter()
+        asyncio.run(view_manager._recompute_materialized_views())
+        recompute_ms = (time.perf_counter() - start) * 1000
+
+        route = f"/people?format={response_format.value}"
+        start = time.perf_counter()
+        response = client.get(route)
+        response.raise_for_status()
+        first_ms = (time.perf_counter() - start) * 1000
+        if response_format == ResponseFormat.JSON:
+            first_ms += recompute_ms
+
+        start = time.perf_counter()
+        for _ in range(args.requests):
+            client.get(route).raise_for_status()
+        cached_ms = (time.perf_counter() - start) / args.requests * 1000
+
+        print(
+            f"{response_format.value:<10}{len(response.content) / 1e6:>10.1f}"
+            f"{first_ms:>12.2f}{cached_ms:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark SQLite cache latency under concurrent load.
+
+Writes large blobs while many small reads and an event loop heartbeat run
+concurrently, and reports read latency and how long the event loop was stalled.
+The baseline runs the same SQLite calls directly on the event loop, as the cache
+used to.
+
+Run from the `backend` directory with:
+
+    python -m benchmarks.sqlite_cache --blob-mb 200 --writes 3 --readers 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from tacobi.data_source.cache import SQLiteCache
+from tacobi.data_source.encode import EncodedDataType
+
+
+class BlockingSQLiteCache(SQLiteCache):
+    """Baseline running every database call on the event loop thread."""
+
+    async def get(self, key: str) -> EncodedDataType | None:
+        """Get the data for the given key, blocking the event loop."""
+        return self._read(key)
+
+    async def set(self, key: str, value: EncodedDataType) -> None:
+        """Set the data for the given key, blocking the event loop."""
+        self._conn.execute(
+            """
+            INSERT INTO cache (key, data)
+            VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET data = excluded.data
+        """,
+            (key, value),
+        )
+        self._conn.commit()
+
+
+async def heartbeat(stop: asyncio.Event, lags: list[float]) -> None:
+    """Record how late the event loop wakes up from 1ms sleeps."""
+    interval = 0.001
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def reader(
+    cache: SQLiteCache, stop: asyncio.Event, latencies: list[float]
+) -> None:
+    """Read a small key in a loop, recording the latency of each read."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await cache.get("small")
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.001)
+
+
+async def run(cache: SQLiteCache, blob: bytes, writes: int, readers: int) -> None:
+    """Run the load against a cache and print the results."""
+    await cache.set("small", b"small")
+
+    stop = asyncio.Event()
+    lags: list[float] = []
+    latencies: list[float] = []
+    tasks = [asyncio.create_task(heartbeat(stop, lags))] + [
+        asyncio.create_task(reader(cache, stop, latencies)) for _ in range(readers)
+    ]
+
+    # Let the readers settle, and give them room between writes
+    await asyncio.sleep(0.1)
+    start = time.perf_counter()
+    for i in range(writes):
+        await cache.set(f"large_{i}", blob)
+        await asyncio.sleep(0.1)
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await asyncio.gather(*tasks)
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"  writes:             {elapsed:8.2f} s total")
+    print(f"  reads:              {len(latencies):8d}")
+    print(f"  read latency p50:   {quantiles[49] * 1000:8.2f} ms")
+    print(f"  read latency p99:   {quantiles[98] * 1000:8.2f} ms")
+    print(f"  read latency max:   {max(latencies) * 1000:8.2f} ms")
+    print(f"  event loop lag max: {max(lags) * 1000:8.2f} ms")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blob-mb", type=int, default=200)
+    parser.add_argument("--writes", type=int, default=3)
+    parser.add_argument("--readers", type=int, default=50)
+    args = parser.parse_args()
+
+    blob = b"x" * args.blob_mb * 1024 * 1024
+
+    for cache_class in (BlockingSQLiteCache, SQLiteCache):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = cache_class(db_path=Path(tmp) / "cache.db")
+            print(f"{cache_class.__name__}:")
+            asyncio.run(run(cache, blob, args.writes, args.readers))
+            cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,21 @@
 """The main app class for TacoBI."""
 
+import asyncio
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
+from datetime import timedelta
 from typing import TypeVar
 from uuid import UUID
 
 from apscheduler.triggers.base import BaseTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
 from tacobi.data_model.models import DataModelType
 from tacobi.data_source import CachedDataSource, DataSourceManager
-from tacobi.view import MaterializedView, View, ViewManager
+from tacobi.data_source.encode import Encoder
+from tacobi.execution import ExecutionMode, Executors
+from tacobi.view import MaterializationMode, MaterializedView, View, ViewManager
+from tacobi.view.result_cache import ResultCache
 
 T = TypeVar("T", bound=Callable[[DataModelType], Awaitable[DataModelType]])
 
@@ -24,6 +30,10 @@ class TacoBIApp:
     data_source_manager: DataSourceManager = field(default_factory=DataSourceManager)
     """ Manager used for scheduling data sources."""
 
+    executors: Executors = field(default_factory=Executors)
+    """ The thread and process pools of views and data sources not running on the
+    event loop, e.g. `Executors(thread_workers=8, process_workers=4)`. """
+
     _view_name_ids: dict[str, UUID] = field(default_factory=dict)
     """ A dictionary of view names. """
 
@@ -33,6 +43,9 @@ class TacoBIApp:
         self,
         name: str,
         trigger: BaseTrigger,
+        encoder: Encoder | None = None,
+        *,
+        execution_mode: ExecutionMode = ExecutionMode.LOOP,
     ) -> Callable[
         [Callable[[DataModelType | None], Awaitable[DataModelType]]],
         Callable[[], DataModelType | None],
@@ -44,6 +57,11 @@ class TacoBIApp:
         ### Arguments:
         - name: The name of the data source.
         - trigger: The trigger that will be used to schedule the data source.
+        - encoder: The encoder used to store the data, e.g. `IPCEncoder()` for data
+          that is mostly read in full. If not provided, it's determined from the
+          return type of the function.
+        - execution_mode: Where the function runs. `thread` or `process` keep CPU
+          bound functions from blocking the event loop.
 
         ### Returns:
         A function that returns the latest data from the data source.
@@ -52,20 +70,39 @@ class TacoBIApp:
         def wrapper(
             func: Callable[[DataModelType | None], Awaitable[DataModelType]],
         ) -> Callable[[], DataModelType | None]:
-            data_source = CachedDataSource(name=name, function=func, trigger=trigger)
+            data_source = CachedDataSource(
+                name=name,
+                function=func,
+                trigger=trigger,
+                execution_mode=execution_mode,
+                executors=self.executors,
+                _encoder=encoder,
+            )
             self.data_source_manager.add_data_source(data_source)
 
-            return data_source.get_latest_data
+            # Named after the data source so it can be declared by views
+            def _inner_func() -> DataModelType | None:
+                return data_source.get_latest_data()
+
+            _inner_func.__name__ = name
+            # Lets process workers find the function behind the getter
+            _inner_func.__wrapped__ = func
+            return _inner_func
 
         return wrapper
 
     # View Management
 
-    def view(
+    def view(  # noqa: PLR0913
         self,
         name: str | None = None,
         route: str | None = None,
         dependencies: list[Callable | str] | None = None,
+        *,
+        cache: bool = False,
+        cache_ttl: timedelta | None = None,
+        cache_max_entries: int = 128,
+        execution_mode: ExecutionMode = ExecutionMode.LOOP,
     ) -> Callable[[T], T]:
         """Register a view.
 
@@ -73,6 +110,14 @@ class TacoBIApp:
         - name: The name of the view.
         - route: The route of the view.
         - dependencies: The dependencies of the view.
+        - cache: Whether to cache the results of the view's route by parameters.
+          Cached results are dropped whenever a dependency is recomputed.
+        - cache_ttl: How long cached results are kept. None to keep them until a
+          dependency is recomputed or they are evicted.
+        - cache_max_entries: The maximum number of cached results, evicting the
+          least recently used ones.
+        - execution_mode: Where the function runs. `thread` or `process` keep CPU
+          bound functions from blocking the event loop.
 
         ### Returns:
         The view function itself.
@@ -114,6 +159,13 @@ class TacoBIApp:
                 function=func,
                 route=route,
                 dependencies=dep_ids,
+                cache=(
+                    ResultCache(max_entries=cache_max_entries, ttl=cache_ttl)
+                    if cache
+                    else None
+                ),
+                execution_mode=execution_mode,
+                executors=self.executors,
             )
             self.view_manager.add_view(view)
 
@@ -125,11 +177,19 @@ class TacoBIApp:
 
         return wrapper
 
-    def materialized_view(
+    def materialized_view(  # noqa: PLR0913
         self,
         name: str | None = None,
         route: str | None = None,
         dependencies: list[Callable | str] | None = None,
+        *,
+        data_sources: list[Callable | str] | None = None,
+        trigger: BaseTrigger | None = None,
+        max_staleness: timedelta | None = None,
+        cache_max_age: timedelta | None = None,
+        execution_mode: ExecutionMode = ExecutionMode.LOOP,
+        materialization: MaterializationMode = MaterializationMode.EAGER,
+        ttl: timedelta | None = None,
     ) -> Callable[
         [Callable[[DataModelType | None], Awaitable[DataModelType]]],
         Callable[[], DataModelType | None],
@@ -143,6 +203,23 @@ class TacoBIApp:
           function will be used.
         - route: The route of the materialized view.
         - dependencies: The dependencies of the materialized view.
+        - data_sources: The data sources read by the materialized view. If provided,
+          the view is only recomputed when one of them or one of its dependencies
+          changed. Otherwise it's recomputed on every pass.
+        - trigger: The trigger used to recompute the materialized view. If neither
+          this nor `max_staleness` are provided, the view manager's
+          `recompute_trigger` is used.
+        - max_staleness: Shorthand for a trigger recomputing the materialized view
+          at this interval.
+        - cache_max_age: How long clients may reuse responses of the materialized
+          view's route before revalidating them with their ETag.
+        - execution_mode: Where the function runs. `thread` or `process` keep CPU
+          bound functions from blocking the event loop.
+        - materialization: `eager` to recompute the view on its trigger, or `lazy`
+          to compute it on first read and refresh it in the background once
+          expired, serving the stale data meanwhile.
+        - ttl: How long the data of a lazy view is served before it's refreshed.
+          None to only refresh it when a dependency changed.
 
         ### Returns:
         A non-async function that returns the latest data from the materialized view.
@@ -178,12 +255,48 @@ class TacoBIApp:
                 {self._view_name_ids.keys()}"""
                 raise ValueError(msg) from e
 
+            # Get the trigger
+            if trigger is not None and max_staleness is not None:
+                msg = "Only one of trigger and max_staleness can be provided"
+                raise ValueError(msg)
+            lazy = materialization == MaterializationMode.LAZY
+            if lazy and (trigger is not None or max_staleness is not None):
+                msg = "Lazy materialized views are refreshed on read, use ttl instead"
+                raise ValueError(msg)
+            if not lazy and ttl is not None:
+                msg = "ttl is only available for lazy materialized views"
+                raise ValueError(msg)
+            view_trigger = (
+                IntervalTrigger(seconds=max_staleness.total_seconds())
+                if max_staleness is not None
+                else trigger
+            )
+
+            # Get the data sources (as they could be strings or getters)
+            sources = (
+                [
+                    self.data_source_manager.get_data_source(
+                        source if isinstance(source, str) else source.__name__
+                    )
+                    for source in data_sources
+                ]
+                if data_sources is not None
+                else None
+            )
+
             # Add the view to the view manager
             view = MaterializedView(
                 name=view_name,
                 function=func,
                 route=route,
                 dependencies=dep_ids,
+                data_sources=sources,
+                trigger=view_trigger,
+                cache_max_age=cache_max_age,
+                execution_mode=execution_mode,
+                executors=self.executors,
+                materialization=materialization,
+                ttl=ttl,
             )
             self.view_manager.add_materialized_view(view)
 
@@ -195,6 +308,8 @@ class TacoBIApp:
                 return view.latest_data
 
             _inner_func.__name__ = view_name
+            # Lets process workers find the function behind the getter
+            _inner_func.__wrapped__ = func
             return _inner_func
 
         return wrapper
@@ -210,3 +325,4 @@ class TacoBIApp:
         """Stop the recomputation of datasets and materialized views."""
         await self.data_source_manager.stop()
         self.view_manager.stop()
+        await asyncio.to_thread(self.executors.shutdown)
@@ -4,7 +4,7 @@ They can be scheduled to be called at a specific time and can be cached to avoid
 redundant calls.
 """
 
-from tacobi.data_source.cache import CacheBackend, SQLiteCache
+from tacobi.data_source.cache import CacheBackend, FileCache, SQLiteCache
 from tacobi.data_source.models import (
     CachedDataSource,
     DataSourceManager,
@@ -14,5 +14,6 @@ __all__ = [
     "CachedDataSource",
     "CacheBackend",
     "DataSourceManager",
+    "FileCache",
     "SQLiteCache",
 ]
@@ -1,6 +1,7 @@
 """Cache backend for data sources."""
 
 from tacobi.data_source.cache.base import CacheBackend, EncodedDataType
+from tacobi.data_source.cache.file import FileCache
 from tacobi.data_source.cache.sqlite import SQLiteCache
 
-__all__ = ["CacheBackend", "SQLiteCache", "EncodedDataType"]
+__all__ = ["CacheBackend", "FileCache", "SQLiteCache", "EncodedDataType"]
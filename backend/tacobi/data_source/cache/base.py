@@ -1,9 +1,11 @@
 """Base class for cache backends."""
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 
-from tacobi.data_source.encode import EncodedDataType
+from tacobi.data_model.models import DataModelType
+from tacobi.data_source.encode import EncodedDataType, Encoder
 
 
 @dataclass
@@ -32,6 +34,40 @@ class CacheBackend(ABC):
         """
         ...
 
+    async def get_data(self, key: str, encoder: Encoder) -> DataModelType | None:
+        """Get and decode the data for the given key.
+
+        ### Arguments
+        - key: The key to get the data for.
+        - encoder: The encoder used to decode the data.
+
+        ### Returns
+        - The decoded data for the given key, or None if the data is not found.
+        """
+        data = await self.get(key)
+        if data is None:
+            return None
+        # Decoding can be CPU heavy, so keep it off the event loop
+        return await asyncio.to_thread(encoder.decode, data)
+
+    async def set_data(
+        self, key: str, data: DataModelType, encoder: Encoder
+    ) -> DataModelType:
+        """Encode and set the data for the given key.
+
+        ### Arguments
+        - key: The key to set the data for.
+        - data: The data to set.
+        - encoder: The encoder used to encode the data.
+
+        ### Returns
+        - The data to keep in memory, which backends may replace with an equivalent
+          that is cheaper to hold, such as a lazy scan of what was stored.
+        """
+        # Encoding can be CPU heavy too, so keep it off the event loop
+        await self.set(key, await asyncio.to_thread(encoder.encode, data))
+        return data
+
     @abstractmethod
     async def clear(self) -> None:
         """Clear the cache."""
@@ -0,0 +1,142 @@
+"""File-per-key cache backend."""
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import quote
+from uuid import uuid4
+
+from tacobi.data_model.models import DataModelType
+from tacobi.data_source.cache import CacheBackend
+from tacobi.data_source.encode import EncodedDataType, Encoder
+
+TMP_PREFIX = ".tmp-"
+"""The prefix of files that are still being written."""
+
+
+def default_cache_dir() -> Path:
+    """Generate a default path to the cache directory."""
+    return Path.cwd() / "cache"
+
+
+@dataclass
+class FileCache(CacheBackend):
+    """A cache backend that stores each key in its own file of a directory.
+
+    Data is written straight to disk by the encoder (e.g. Parquet for Polars data)
+    instead of going through an in-memory blob, and read back lazily from the file.
+    For Polars this means `pl.scan_parquet(path)`, which memory-maps the file and
+    only reads the row groups and columns a query actually needs.
+
+    Files are written to a temporary file first and atomically renamed into place,
+    so readers never see a partial file.
+    """
+
+    directory: Path = field(default_factory=default_cache_dir)
+    """The directory the files are stored in."""
+
+    def __post_init__(self) -> None:
+        """Create the cache directory if it doesn't exist."""
+        self.directory = Path(self.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, key: str) -> Path:
+        """Get the path of the file storing the given key."""
+        return self.directory / quote(key, safe="")
+
+    def _write_atomically(self, key: str, write: Callable[[Path], None]) -> Path:
+        """Write a file through a temporary file and rename it into place.
+
+        ### Arguments
+        - key: The key to write the file for.
+        - write: Writes the content to the given path.
+
+        ### Returns
+        - The path of the written file.
+        """
+        path = self.path_for(key)
+        tmp_path = self.directory / f"{TMP_PREFIX}{uuid4().hex}"
+        try:
+            write(tmp_path)
+            tmp_path.replace(path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return path
+
+    # Cache Operations
+
+    async def get(self, key: str) -> EncodedDataType | None:
+        """Get the data for the given key.
+
+        ### Arguments
+        - key: The key to get the data for.
+
+        ### Returns
+        - The data for the given key, or None if the data is not found.
+        """
+        path = self.path_for(key)
+        try:
+            return await asyncio.to_thread(path.read_bytes)
+        except FileNotFoundError:
+            return None
+
+    async def set(self, key: str, value: EncodedDataType) -> None:
+        """Set the data for the given key.
+
+        ### Arguments
+        - key: The key to set the data for.
+        - data: The data to set.
+        """
+        await asyncio.to_thread(
+            self._write_atomically, key, lambda p: p.write_bytes(value)
+        )
+
+    async def get_data(self, key: str, encoder: Encoder) -> DataModelType | None:
+        """Decode the data for the given key straight from its file.
+
+        ### Arguments
+        - key: The key to get the data for.
+        - encoder: The encoder used to decode the data.
+
+        ### Returns
+        - The decoded data for the given key, or None if the data is not found.
+        """
+        path = self.path_for(key)
+        if not path.exists():
+            return None
+        return await asyncio.to_thread(encoder.decode_from_file, path)
+
+    async def set_data(
+        self, key: str, data: DataModelType, encoder: Encoder
+    ) -> DataModelType:
+        """Encode the data for the given key straight into its file.
+
+        ### Arguments
+        - key: The key to set the data for.
+        - data: The data to set.
+        - encoder: The encoder used to encode the data.
+
+        ### Returns
+        - The data decoded back from the file, e.g. a lazy scan of it, so the
+          original data doesn't have to be kept in memory.
+        """
+
+        def write(path: Path) -> None:
+            encoder.encode_to_file(data, path)
+
+        path = await asyncio.to_thread(self._write_atomically, key, write)
+        return await asyncio.to_thread(encoder.decode_from_file, path)
+
+    async def clear(self) -> None:
+        """Clear the cache."""
+
+        def remove_files() -> None:
+            for path in self.directory.iterdir():
+                if path.is_file():
+                    path.unlink(missing_ok=True)
+
+        await asyncio.to_thread(remove_files)
+
+    async def cleanup(self) -> None:
+        """Cleanup the cache. Files are kept so they can be loaded on restart."""
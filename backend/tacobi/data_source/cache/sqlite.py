@@ -1,12 +1,35 @@
 """SQLite cache backend."""
 
+import asyncio
 import sqlite3 as sql
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TypeVar
 
 from tacobi.data_source.cache import CacheBackend
 from tacobi.data_source.encode import EncodedDataType
 
+T = TypeVar("T")
+
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "busy_timeout": "5000",
+    "cache_size": "-65536",
+    "mmap_size": str(256 * 1024 * 1024),
+}
+"""Pragmas applied to every connection. WAL lets readers run while a write is in
+progress, and NORMAL synchronous mode is durable enough in WAL mode while only
+syncing on checkpoints."""
+
+
+BLOB_CHUNK_SIZE = 1024 * 1024
+"""The size of the chunks large values are written in."""
+
 
 def default_db_path() -> Path:
     """Generate a default path to the SQLite database."""
@@ -15,23 +38,46 @@ def default_db_path() -> Path:
 
 @dataclass
 class SQLiteCache(CacheBackend):
-    """A cache backend that uses a SQLite database to store and retrieve data."""
+    """A cache backend that uses a SQLite database to store and retrieve data.
+
+    The database is accessed off the event loop: writes go through a single writer
+    thread and connection, and reads through a pool of reader threads with one
+    connection each, so large blobs don't stall the app while they are written.
+    """
 
     db_path: Path = field(default_factory=default_db_path)
     """The path to the SQLite database."""
 
+    readers: int = 4
+    """The number of reader threads, each with its own connection."""
+
     _conn: sql.Connection | None = None
-    """The SQLite connection."""
+    """The SQLite connection used for writes."""
+
+    _writer: ThreadPoolExecutor | None = None
+    """The single thread running all writes."""
+
+    _reader_pool: ThreadPoolExecutor | None = None
+    """The threads running reads."""
+
+    _reader_local: threading.local = field(default_factory=threading.local)
+    """Holds the connection of each reader thread."""
+
+    _reader_conns: list[sql.Connection] = field(default_factory=list)
+    """The connections of all reader threads, kept to close them."""
+
+    _reader_conns_lock: threading.Lock = field(default_factory=threading.Lock)
+    """Lock guarding `_reader_conns`."""
 
     # Init and cleanup
 
     def __post_init__(self) -> None:
-        """Initialize the SQLite connection.
+        """Initialize the SQLite connection and threads.
 
         Create the cache table if it doesn't exist.
         """
-        self._conn = sql.connect(self.db_path)
-        self._conn.row_factory = sql.Row
+        # Only ever used from the writer thread once created
+        self._conn = self._connect()
 
         cursor = self._conn.cursor()
         cursor.execute(
@@ -40,11 +86,92 @@ class SQLiteCache(CacheBackend):
             data BLOB
         )"""
         )
+        self._conn.commit()
+
+        self._writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="tacobi-sqlite-writer"
+        )
+        self._reader_pool = ThreadPoolExecutor(
+            max_workers=self.readers, thread_name_prefix="tacobi-sqlite-reader"
+        )
 
     def __del__(self) -> None:
         """Close the SQLite connection."""
         self.close()
 
+    def _connect(self) -> sql.Connection:
+        """Open a connection to the database with the cache pragmas applied."""
+        conn = sql.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sql.Row
+        for pragma, value in PRAGMAS.items():
+            conn.execute(f"PRAGMA {pragma} = {value}")
+        return conn
+
+    def _reader_conn(self) -> sql.Connection:
+        """Get the connection of the current reader thread, opening it if needed."""
+        conn: sql.Connection | None = getattr(self._reader_local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            conn.execute("PRAGMA query_only = ON")
+            self._reader_local.conn = conn
+            with self._reader_conns_lock:
+                self._reader_conns.append(conn)
+        return conn
+
+    async def _run(
+        self, executor: ThreadPoolExecutor | None, func: Callable[..., T], *args: object
+    ) -> T:
+        """Run a blocking database call on one of the cache's threads."""
+        if not self._conn or executor is None:
+            msg = "SQLite connection not initialized"
+            raise RuntimeError(msg)
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+    # Blocking operations, only called from the cache's threads
+
+    def _read(self, key: str) -> EncodedDataType | None:
+        """Read the data for the given key."""
+        cursor = self._reader_conn().cursor()
+        cursor.execute("SELECT data FROM cache WHERE key = ?", (key,))
+        result = cursor.fetchone()
+        return result[0] if result else None
+
+    def _write(self, key: str, value: EncodedDataType) -> None:
+        """Write the data for the given key and commit.
+
+        The blob is written in chunks so the GIL is released between them instead
+        of being held while the whole value is copied. If any of it fails the
+        transaction is rolled back, so the previous value is kept instead of a
+        partly written one being committed by the next write.
+        """
+        cursor = self._conn.cursor()
+        try:
+            cursor.execute(
+                """
+                INSERT INTO cache (key, data)
+                VALUES (?, zeroblob(?))
+                ON CONFLICT(key) DO UPDATE SET data = excluded.data
+            """,
+                (key, len(value)),
+            )
+            cursor.execute("SELECT rowid FROM cache WHERE key = ?", (key,))
+            rowid = cursor.fetchone()[0]
+
+            data = memoryview(value)
+            with self._conn.blobopen("cache", "data", rowid) as blob:
+                for offset in range(0, len(data), BLOB_CHUNK_SIZE):
+                    blob.write(data[offset : offset + BLOB_CHUNK_SIZE])
+        except BaseException:
+            self._conn.rollback()
+            raise
+        self._conn.commit()
+
+    def _clear(self) -> None:
+        """Delete all data and commit."""
+        cursor = self._conn.cursor()
+        cursor.execute("DELETE FROM cache")
+        self._conn.commit()
+
     # Cache Operations
 
     async def get(self, key: str) -> EncodedDataType | None:
@@ -56,14 +183,7 @@ class SQLiteCache(CacheBackend):
         ### Returns
         - The data for the given key, or None if the data is not found.
         """
-        if not self._conn:
-            msg = "SQLite connection not initialized"
-            raise RuntimeError(msg)
-
-        cursor = self._conn.cursor()
-        cursor.execute("SELECT data FROM cache WHERE key = ?", (key,))
-        result = cursor.fetchone()
-        return result[0] if result else None
+        return await self._run(self._reader_pool, self._read, key)
 
     async def set(self, key: str, value: EncodedDataType) -> None:
         """Set the data for the given key.
@@ -72,36 +192,29 @@ class SQLiteCache(CacheBackend):
         - key: The key to set the data for.
         - data: The data to set.
         """
-        if not self._conn:
-            msg = "SQLite connection not initialized"
-            raise RuntimeError(msg)
-
-        cursor = self._conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO cache (key, data)
-            VALUES (?, ?)
-            ON CONFLICT(key) DO UPDATE SET data = excluded.data
-        """,
-            (key, value),
-        )
-        self._conn.commit()
+        await self._run(self._writer, self._write, key, value)
 
     async def clear(self) -> None:
         """Clear the cache."""
-        if not self._conn:
-            msg = "SQLite connection not initialized"
-            raise RuntimeError(msg)
-
-        cursor = self._conn.cursor()
-        cursor.execute("DELETE FROM cache")
-        self._conn.commit()
+        await self._run(self._writer, self._clear)
 
     def close(self) -> None:
-        """Close the SQLite connection."""
+        """Wait for pending operations, then close the SQLite connections."""
+        for executor in (self._writer, self._reader_pool):
+            if executor:
+                executor.shutdown(wait=True)
+        self._writer = None
+        self._reader_pool = None
+
+        with self._reader_conns_lock:
+            for conn in self._reader_conns:
+                conn.close()
+            self._reader_conns.clear()
+
         if self._conn:
             self._conn.close()
+            self._conn = None
 
     async def cleanup(self) -> None:
         """Cleanup the cache."""
-        self.close()
+        await asyncio.to_thread(self.close)
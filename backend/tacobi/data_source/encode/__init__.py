@@ -1,7 +1,16 @@
 """Encoders for caching data sources."""
 
 from tacobi.data_source.encode.base import EncodedDataType, Encoder
+from tacobi.data_source.encode.factory import encoder_for_type
+from tacobi.data_source.encode.ipc import IPCEncoder
 from tacobi.data_source.encode.polars import PolarsEncoder
 from tacobi.data_source.encode.pydantic import PydanticEncoder
 
-__all__ = ["EncodedDataType", "Encoder", "PolarsEncoder", "PydanticEncoder"]
+__all__ = [
+    "EncodedDataType",
+    "Encoder",
+    "IPCEncoder",
+    "PolarsEncoder",
+    "PydanticEncoder",
+    "encoder_for_type",
+]
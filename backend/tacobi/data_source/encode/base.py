@@ -1,6 +1,7 @@
 """Models for data sources."""
 
 from abc import ABC, abstractmethod
+from pathlib import Path
 
 from tacobi.data_model.models import DataModelType
 
@@ -19,3 +20,17 @@ class Encoder(ABC):
     def decode(self, data: EncodedDataType) -> DataModelType:
         """Decode the data."""
         ...
+
+    def encode_to_file(self, data: DataModelType, path: Path) -> None:
+        """Encode the data into a file.
+
+        Encoders that can write files directly should override this.
+        """
+        path.write_bytes(self.encode(data))
+
+    def decode_from_file(self, path: Path) -> DataModelType:
+        """Decode the data from a file.
+
+        Encoders that can read files lazily should override this.
+        """
+        return self.decode(path.read_bytes())
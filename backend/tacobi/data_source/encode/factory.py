@@ -0,0 +1,39 @@
+"""Selection of encoders from data types."""
+
+import inspect
+from typing import get_origin
+
+import polars as pl
+from pydantic import BaseModel
+
+from tacobi.data_source.encode.base import Encoder
+from tacobi.data_source.encode.ipc import IPCEncoder
+from tacobi.data_source.encode.polars import PolarsEncoder
+from tacobi.data_source.encode.pydantic import PydanticEncoder
+
+
+def encoder_for_type(data_type: type) -> Encoder:
+    """Get an encoder able to encode and decode data of the given type.
+
+    ### Arguments:
+    - data_type: The type of the data, e.g. the return type of a data source.
+      Pandera `DataFrame[Model]` annotations are supported.
+
+    ### Returns:
+    The encoder. LazyFrames are stored as Parquet to be scanned lazily, while
+    DataFrames are stored as Arrow IPC as they are read back in full.
+
+    ### Raises:
+    - RuntimeError: If no encoder supports the type.
+    """
+    cls = get_origin(data_type) or data_type
+    if inspect.isclass(cls):
+        if issubclass(cls, pl.LazyFrame):
+            return PolarsEncoder()
+        if issubclass(cls, pl.DataFrame):
+            return IPCEncoder(lazy=False)
+        if issubclass(cls, BaseModel):
+            return PydanticEncoder(base_model=cls)
+
+    msg = f"No encoder found for type {data_type}"
+    raise RuntimeError(msg)
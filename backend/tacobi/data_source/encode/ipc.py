@@ -0,0 +1,51 @@
+"""Encoders for Polars data as Arrow IPC."""
+
+import io
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+import polars as pl
+
+from tacobi.data_source.encode import EncodedDataType, Encoder
+
+IPCCompression = Literal["uncompressed", "lz4", "zstd"]
+"""The compression codecs supported by Arrow IPC."""
+
+
+@dataclass
+class IPCEncoder(Encoder):
+    """An encoder that stores Polars data as Arrow IPC (Feather v2).
+
+    Unlike Parquet, uncompressed IPC is Arrow's in-memory layout, so decoding a file
+    memory-maps it and is effectively free. This suits data sources most views read
+    in full. Compressed IPC is smaller on disk but has to be decompressed on read.
+    """
+
+    compression: IPCCompression = "uncompressed"
+    """The compression codec of the record batches."""
+
+    lazy: bool = True
+    """Whether data is decoded as a LazyFrame rather than a DataFrame."""
+
+    def encode(self, data: pl.LazyFrame | pl.DataFrame) -> EncodedDataType:
+        """Encode the data."""
+        buffer = io.BytesIO()
+        data.lazy().sink_ipc(buffer, compression=self.compression)
+        return buffer.getvalue()
+
+    def decode(self, data: EncodedDataType) -> pl.LazyFrame | pl.DataFrame:
+        """Decode the data."""
+        if not self.lazy:
+            return pl.read_ipc(io.BytesIO(data))
+        return pl.scan_ipc(io.BytesIO(data))
+
+    def encode_to_file(self, data: pl.LazyFrame | pl.DataFrame, path: Path) -> None:
+        """Encode the data into an IPC file, streaming it when possible."""
+        data.lazy().sink_ipc(path, compression=self.compression)
+
+    def decode_from_file(self, path: Path) -> pl.LazyFrame | pl.DataFrame:
+        """Read the data from a memory-mapped IPC file, lazily unless disabled."""
+        if not self.lazy:
+            return pl.read_ipc(path)
+        return pl.scan_ipc(path)
@@ -2,22 +2,49 @@
 
 import io
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
 
 import polars as pl
 
 from tacobi.data_source.encode import EncodedDataType, Encoder
 
+ParquetCompression = Literal["uncompressed", "snappy", "gzip", "brotli", "lz4", "zstd"]
+"""The compression codecs supported for Parquet."""
+
 
 @dataclass
 class PolarsEncoder(Encoder):
-    """An encoder that can encode and decode Polars data."""
+    """An encoder that can encode and decode Polars data as Parquet."""
+
+    compression: ParquetCompression = "zstd"
+    """The compression codec of the Parquet pages."""
+
+    lazy: bool = True
+    """Whether data is decoded as a LazyFrame rather than a DataFrame."""
 
-    def encode(self, data: pl.LazyFrame) -> EncodedDataType:
+    def encode(self, data: pl.LazyFrame | pl.DataFrame) -> EncodedDataType:
         """Encode the data."""
         buffer = io.BytesIO()
-        data.sink_parquet(buffer)
+        data.lazy().sink_parquet(buffer, compression=self.compression)
         return buffer.getvalue()
 
-    def decode(self, data: EncodedDataType) -> pl.LazyFrame:
+    def decode(self, data: EncodedDataType) -> pl.LazyFrame | pl.DataFrame:
         """Decode the data."""
+        if not self.lazy:
+            return pl.read_parquet(io.BytesIO(data))
         return pl.scan_parquet(io.BytesIO(data))
+
+    def encode_to_file(self, data: pl.LazyFrame | pl.DataFrame, path: Path) -> None:
+        """Encode the data into a Parquet file, streaming it when possible."""
+        data.lazy().sink_parquet(path, compression=self.compression)
+
+    def decode_from_file(self, path: Path) -> pl.LazyFrame | pl.DataFrame:
+        """Read the data from a Parquet file, lazily unless disabled.
+
+        When scanned lazily, only the row groups and columns a query needs are read
+        from the file.
+        """
+        if not self.lazy:
+            return pl.read_parquet(path)
+        return pl.scan_parquet(path)
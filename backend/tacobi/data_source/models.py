@@ -1,17 +1,18 @@
 """Models for data sources."""
 
+import asyncio
+import time
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from typing import Generic
 
-import polars as pl
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.base import BaseTrigger
-from pydantic import BaseModel
 
 from tacobi.data_model.models import DataModelType
 from tacobi.data_source.cache import CacheBackend, SQLiteCache
-from tacobi.data_source.encode import Encoder, PolarsEncoder, PydanticEncoder
+from tacobi.data_source.encode import Encoder, encoder_for_type
+from tacobi.execution import DEFAULT_EXECUTORS, ExecutionMode, Executors
 
 
 @dataclass
@@ -27,6 +28,16 @@ class CachedDataSource(Generic[DataModelType]):
     trigger: BaseTrigger
     """ The cron trigger that is used to update the data source. """
 
+    version: int = 0
+    """ Bumped every time the data changes, so readers can tell whether it changed
+    since they last saw it. """
+
+    execution_mode: ExecutionMode = ExecutionMode.LOOP
+    """ Where the function runs. See `ExecutionMode`. """
+
+    executors: Executors = field(default=DEFAULT_EXECUTORS, repr=False)
+    """ The pools the function runs in when it isn't run on the event loop. """
+
     _encoder: Encoder | None = None
     """ The encoder that is used to encode and decode the data. """
 
@@ -37,15 +48,15 @@ class CachedDataSource(Generic[DataModelType]):
     """ The cache backend that is used to store the data. """
 
     def __post_init__(self) -> None:
-        """Based on the type hints for the function, determine the encoder."""
+        """Based on the type hints for the function, determine the encoder.
+
+        Only done if no encoder was provided.
+        """
+        if self._encoder is not None:
+            return
+
         return_type = self.function.__annotations__["return"]
-        if issubclass(return_type, pl.LazyFrame) or return_type == pl.LazyFrame:
-            self._encoder = PolarsEncoder()
-        elif issubclass(return_type, BaseModel):
-            self._encoder = PydanticEncoder(base_model=return_type)
-        else:
-            msg = f"No encoder found for type {return_type}"
-            raise RuntimeError(msg)
+        self._encoder = encoder_for_type(return_type)
 
     def set_cache_backend(self, cache_backend: CacheBackend) -> None:
         """Set the cache backend that is used to store the data."""
@@ -57,11 +68,13 @@ class CachedDataSource(Generic[DataModelType]):
             msg = "Cache backend not set"
             raise RuntimeError(msg)
 
-        self._cached_data = await self.function(self._cached_data)
-
-        await self._cache_backend.set(
-            key=self.name, value=self._encoder.encode(self._cached_data)
+        data = await self.executors.run(
+            self.execution_mode, self.function, self._cached_data
         )
+        self._cached_data = await self._cache_backend.set_data(
+            key=self.name, data=data, encoder=self._encoder
+        )
+        self.version += 1
 
     async def load(self) -> None:
         """Load the data from the cache backend."""
@@ -69,10 +82,13 @@ class CachedDataSource(Generic[DataModelType]):
             msg = "Cache backend not set"
             raise RuntimeError(msg)
 
-        cache_data = await self._cache_backend.get(key=self.name)
+        cache_data = await self._cache_backend.get_data(
+            key=self.name, encoder=self._encoder
+        )
         if cache_data is None:
             return
-        self._cached_data = self._encoder.decode(cache_data)
+        self._cached_data = cache_data
+        self.version += 1
 
     def get_latest_data(self) -> DataModelType | None:
         """Get the latest data from the data source."""
@@ -92,9 +108,15 @@ class DataSourceManager:
     cache_backend: CacheBackend = field(default_factory=SQLiteCache)
     """ The cache backend that is used to store the data. """
 
+    max_concurrent_loads: int = 8
+    """ The maximum number of data sources loaded from the cache at once on start. """
+
     _data_sources: list[CachedDataSource] = field(default_factory=list)
     """ The data sources that are scheduled to be updated. """
 
+    _load_durations: dict[str, float] = field(default_factory=dict)
+    """ How long loading each data source took on start, in seconds. """
+
     _scheduler: AsyncIOScheduler = field(default_factory=AsyncIOScheduler)
     """ The scheduler that is used to schedule the tasks. """
 
@@ -117,6 +139,22 @@ class DataSourceManager:
             replace_existing=True,
         )
 
+    def get_data_source(self, name: str) -> CachedDataSource:
+        """Get a data source by name.
+
+        ### Arguments
+        - name: The name of the data source.
+
+        ### Raises
+        - ValueError: If no data source with the given name exists.
+        """
+        for data_source in self._data_sources:
+            if data_source.name == name:
+                return data_source
+        msg = f"""Data source {name} not found. Available data sources:
+        {[data_source.name for data_source in self._data_sources]}"""
+        raise ValueError(msg)
+
     def add_data_source(self, data_source: CachedDataSource) -> None:
         """Add a data source to the scheduler."""
         data_source.set_cache_backend(self.cache_backend)
@@ -125,10 +163,32 @@ class DataSourceManager:
 
     # Lifecycle
 
+    async def _load_data_sources(self) -> None:
+        """Load all data sources from the cache concurrently.
+
+        At most `max_concurrent_loads` are loaded at once, and how long each took is
+        recorded and reported.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_loads)
+
+        async def load(data_source: CachedDataSource) -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                await data_source.load()
+                duration = time.perf_counter() - start
+            self._load_durations[data_source.name] = duration
+            print(f"Loaded data source {data_source.name} in {duration:.3f}s")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(load(ds) for ds in self._data_sources))
+        print(
+            f"Loaded {len(self._data_sources)} data sources in "
+            f"{time.perf_counter() - start:.3f}s"
+        )
+
     async def start(self) -> None:
-        """Start the scheduler."""
-        for data_source in self._data_sources:
-            await data_source.load()
+        """Load the data sources from the cache and start the scheduler."""
+        await self._load_data_sources()
         self._scheduler.start()
 
     async def stop(self) -> None:
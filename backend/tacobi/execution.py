@@ -0,0 +1,203 @@
+"""Execution of view and data source functions off the event loop."""
+
+import asyncio
+import contextvars
+import importlib
+import inspect
+import io
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+import polars as pl
+
+
+class ExecutionMode(str, Enum):
+    """Where the function of a view or data source runs.
+
+    - `loop`: On the event loop. Best for functions that mostly await I/O.
+    - `thread`: On its own event loop in a thread of a pool. Best for functions
+      spending their time in code releasing the GIL, such as Polars.
+    - `process`: In a process of a pool, for CPU heavy pure Python. The function
+      must be defined at module level, its arguments picklable, and it can't rely
+      on state of the main process such as the latest data of other views.
+      DataFrames are returned as Arrow IPC buffers.
+    """
+
+    LOOP = "loop"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+_PROCESS_FUNCTIONS: dict[str, Callable[..., Any]] = {}
+"""Functions run in process mode by key. Forked workers inherit it, others import
+the function's module to find it."""
+
+
+def register_process_function(func: Callable[..., Any]) -> str:
+    """Register a function so process workers can find it.
+
+    ### Arguments:
+    - func: The function to register.
+
+    ### Returns:
+    The key the function is registered under.
+
+    ### Raises:
+    - ValueError: If the function isn't defined at module level.
+    """
+    key = f"{func.__module__}:{func.__qualname__}"
+    if "<locals>" in func.__qualname__:
+        msg = f"Functions run in process mode must be defined at module level: {key}"
+        raise ValueError(msg)
+    _PROCESS_FUNCTIONS[key] = func
+    return key
+
+
+def _resolve_process_function(key: str) -> Callable[..., Any]:
+    """Find a registered function, importing its module if needed.
+
+    Decorators replace some functions in their module with getters, so wrapped
+    functions are unwrapped.
+    """
+    func = _PROCESS_FUNCTIONS.get(key)
+    if func is not None:
+        return func
+    module_name, qualname = key.split(":")
+    obj: Any = importlib.import_module(module_name)
+    for attribute in qualname.split("."):
+        obj = getattr(obj, attribute)
+    return _PROCESS_FUNCTIONS.get(key) or inspect.unwrap(obj)
+
+
+def _call(func: Callable[..., Any], args: tuple, kwargs: dict[str, Any]) -> Any:  # noqa: ANN401
+    """Call a function, running it on a new event loop if it's a coroutine."""
+    result = func(*args, **kwargs)
+    if inspect.isawaitable(result):
+        return asyncio.run(_await(result))
+    return result
+
+
+async def _await(awaitable: Any) -> Any:  # noqa: ANN401
+    """Await an awaitable, so `asyncio.run` accepts any awaitable."""
+    return await awaitable
+
+
+def _to_ipc(data: Any) -> tuple[str, Any]:  # noqa: ANN401
+    """Encode a result to send it back from a process, frames as Arrow IPC."""
+    if isinstance(data, pl.LazyFrame):
+        data = data.collect()
+        kind = "lazyframe"
+    elif isinstance(data, pl.DataFrame):
+        kind = "dataframe"
+    else:
+        return "object", data
+    buffer = io.BytesIO()
+    data.write_ipc(buffer)
+    return kind, buffer.getvalue()
+
+
+def _from_ipc(encoded: tuple[str, Any]) -> Any:  # noqa: ANN401
+    """Decode a result sent back from a process."""
+    kind, payload = encoded
+    if kind == "object":
+        return payload
+    frame = pl.read_ipc(io.BytesIO(payload))
+    return frame.lazy() if kind == "lazyframe" else frame
+
+
+def _run_in_process(key: str, args: tuple, kwargs: dict[str, Any]) -> tuple[str, Any]:
+    """Run a registered function in a process and encode its result."""
+    return _to_ipc(_call(_resolve_process_function(key), args, kwargs))
+
+
+@dataclass(eq=False)
+class Executors:
+    """The thread and process pools functions run in, created when first used."""
+
+    thread_workers: int | None = None
+    """The number of threads of the pool. None for the default of
+    `ThreadPoolExecutor`."""
+
+    process_workers: int | None = None
+    """The number of processes of the pool. None for the number of CPUs."""
+
+    _thread_pool: ThreadPoolExecutor | None = None
+    """The thread pool, None until first used."""
+
+    _process_pool: ProcessPoolExecutor | None = None
+    """The process pool, None until first used."""
+
+    _registered: dict[Callable[..., Any], str] = field(default_factory=dict)
+    """The keys of the functions registered for process mode."""
+
+    @property
+    def thread_pool(self) -> ThreadPoolExecutor:
+        """The thread pool."""
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.thread_workers, thread_name_prefix="tacobi-worker"
+            )
+        return self._thread_pool
+
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        """The process pool."""
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+        return self._process_pool
+
+    async def run(
+        self,
+        mode: ExecutionMode,
+        func: Callable[..., Any],
+        *args: object,
+        **kwargs: object,
+    ) -> Any:  # noqa: ANN401
+        """Run a function in the given execution mode.
+
+        ### Arguments:
+        - mode: Where to run the function.
+        - func: The function to run, sync or async.
+        - args: The positional arguments of the function.
+        - kwargs: The keyword arguments of the function.
+
+        ### Returns:
+        The result of the function.
+
+        ### Raises:
+        - ValueError: If the function can't run in process mode.
+        """
+        if mode == ExecutionMode.LOOP:
+            result = func(*args, **kwargs)
+            return await result if inspect.isawaitable(result) else result
+
+        loop = asyncio.get_running_loop()
+        if mode == ExecutionMode.THREAD:
+            # Like `asyncio.to_thread`, the function sees the caller's context
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(
+                self.thread_pool, context.run, _call, func, args, kwargs
+            )
+
+        key = self._registered.get(func)
+        if key is None:
+            key = self._registered[func] = register_process_function(func)
+        encoded = await loop.run_in_executor(
+            self.process_pool, _run_in_process, key, args, kwargs
+        )
+        return _from_ipc(encoded)
+
+    def shutdown(self) -> None:
+        """Shut the pools down, waiting for running functions to finish."""
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=True)
+        self._thread_pool = None
+        self._process_pool = None
+
+
+DEFAULT_EXECUTORS = Executors()
+"""The pools used by views and data sources that weren't given their own."""
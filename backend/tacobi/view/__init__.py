@@ -1,6 +1,17 @@
 """Materialized and normal views that can be used to query cached data."""
 
 from tacobi.view.view_manager import ViewManager
-from tacobi.view.view_models import BaseView, MaterializedView, View
+from tacobi.view.view_models import (
+    BaseView,
+    MaterializationMode,
+    MaterializedView,
+    View,
+)
 
-__all__ = ["BaseView", "MaterializedView", "View", "ViewManager"]
+__all__ = [
+    "BaseView",
+    "MaterializationMode",
+    "MaterializedView",
+    "View",
+    "ViewManager",
+]
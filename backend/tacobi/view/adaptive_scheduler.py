@@ -0,0 +1,193 @@
+"""Access-aware scheduling of materialized view recomputes."""
+
+import time
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class ScheduleDecision:
+    """Whether a scheduled recompute of a view ran, and why."""
+
+    view: str
+    """The name (or ID if unnamed) of the view."""
+
+    at: datetime
+    """The time of the decision."""
+
+    recomputed: bool
+    """Whether the view was recomputed, or skipped."""
+
+    reason: str
+    """Why the view was recomputed or skipped."""
+
+
+@dataclass
+class AdaptiveScheduler:
+    """Lowers the refresh frequency of materialized views nobody reads.
+
+    A view is hot when it or a view depending on it was read within `hot_window`,
+    so dependencies of hot views stay as fresh as the views themselves. Hot views
+    are recomputed on every scheduled pass. Idle views are only recomputed once
+    `backoff` times their idle time passed since their last recompute, so the
+    longer nobody reads them the less often they refresh, down to once every
+    `max_interval`. With the default backoff, the interval doubles every refresh.
+
+    Only views that are out of date are ever skipped, so only recomputes that
+    would have run count as saved. Skipped views are caught up in the background
+    as soon as they are read.
+    """
+
+    hot_window: timedelta = timedelta(minutes=5)
+    """How long a view stays hot after it or one of its dependents was read."""
+
+    max_interval: timedelta = timedelta(hours=1)
+    """The floor of the refresh frequency: idle views are still recomputed at
+    least this often."""
+
+    backoff: float = 0.5
+    """The fraction of the time a view has been idle that must pass between its
+    recomputes."""
+
+    history_size: int = 256
+    """The number of recent decisions kept."""
+
+    cpu_seconds_saved: float = 0.0
+    """The estimated recompute time saved by skipping idle views, from the latest
+    recompute duration of each skipped view."""
+
+    decisions: deque[ScheduleDecision] = field(init=False)
+    """The most recent decisions, oldest first."""
+
+    _started_at: float = field(default_factory=time.monotonic)
+    """The monotonic time the scheduler was created at, the last hit of views
+    that were never read."""
+
+    _hits: dict[UUID, int] = field(default_factory=dict)
+    """The number of reads of each view."""
+
+    _last_hit: dict[UUID, float] = field(default_factory=dict)
+    """The monotonic time each view was last read at."""
+
+    _last_recompute: dict[UUID, float] = field(default_factory=dict)
+    """The monotonic time each view was last recomputed at."""
+
+    _durations: dict[UUID, float] = field(default_factory=dict)
+    """How long the latest recompute of each view took, in seconds."""
+
+    _skipped: set[UUID] = field(default_factory=set)
+    """The views skipped since their last recompute."""
+
+    def __post_init__(self) -> None:
+        """Create the history of decisions."""
+        self.decisions = deque(maxlen=self.history_size)
+
+    def record_hit(self, view_id: UUID) -> None:
+        """Record a read of a view's endpoint."""
+        self._hits[view_id] = self._hits.get(view_id, 0) + 1
+        self._last_hit[view_id] = time.monotonic()
+
+    def record_recompute(self, view_id: UUID, seconds: float) -> None:
+        """Record a recompute of a view and how long it took."""
+        self._last_recompute[view_id] = time.monotonic()
+        self._durations[view_id] = seconds
+        self._skipped.discard(view_id)
+
+    def record_up_to_date(self, view_id: UUID) -> None:
+        """Record that a pass found a view up to date, so it's no longer behind."""
+        self._skipped.discard(view_id)
+
+    def skipped_upstream(
+        self, view_id: UUID, downstream: dict[UUID, frozenset[UUID]]
+    ) -> set[UUID]:
+        """Get the skipped views a view reads, itself included.
+
+        ### Arguments:
+        - view_id: The ID of the view.
+        - downstream: The IDs of the views depending on each view, see
+          `ExecutionPlan.downstream`.
+
+        ### Returns:
+        The IDs of the skipped views.
+        """
+        return {
+            skipped_id
+            for skipped_id in self._skipped
+            if skipped_id == view_id or view_id in downstream.get(skipped_id, ())
+        }
+
+    def should_recompute(
+        self, view_id: UUID, name: str, dependents: Iterable[UUID]
+    ) -> bool:
+        """Decide whether a scheduled recompute of an out of date view runs.
+
+        The decision is recorded, and skipped views count as saved.
+
+        ### Arguments:
+        - view_id: The ID of the view.
+        - name: The name of the view, for the decision history.
+        - dependents: The IDs of all views depending on the view.
+
+        ### Returns:
+        Whether to recompute the view.
+        """
+        now = time.monotonic()
+        last_hit = max(
+            (self._last_hit.get(i, self._started_at) for i in (view_id, *dependents)),
+        )
+        idle = now - last_hit
+        since_recompute = now - self._last_recompute.get(view_id, float("-inf"))
+        interval = min(idle * self.backoff, self.max_interval.total_seconds())
+
+        if idle < self.hot_window.total_seconds():
+            recompute = True
+            reason = (
+                "read recently"
+                if self._last_hit.get(view_id) == last_hit
+                else "dependency of a view read recently"
+            )
+        elif since_recompute >= interval:
+            recompute = True
+            reason = f"idle for {idle:.0f}s, refreshed every {interval:.0f}s"
+        else:
+            recompute = False
+            reason = (
+                f"idle for {idle:.0f}s, next refresh in "
+                f"{interval - since_recompute:.0f}s"
+            )
+            self._skipped.add(view_id)
+            self.cpu_seconds_saved += self._durations.get(view_id, 0.0)
+
+        self.decisions.append(
+            ScheduleDecision(
+                view=name, at=datetime.now(UTC), recomputed=recompute, reason=reason
+            )
+        )
+        return recompute
+
+    def stats(self, names: dict[UUID, str]) -> dict:
+        """Get the decisions of the scheduler and what they saved.
+
+        ### Arguments:
+        - names: The names of the views by ID.
+
+        ### Returns:
+        The estimated CPU seconds saved, the number of skipped views, the recent
+        decisions and the reads of each view.
+        """
+        now = time.monotonic()
+        return {
+            "cpu_seconds_saved": self.cpu_seconds_saved,
+            "skipped": [names.get(i, str(i)) for i in self._skipped],
+            "decisions": [asdict(decision) for decision in self.decisions],
+            "views": {
+                names.get(view_id, str(view_id)): {
+                    "hits": hits,
+                    "seconds_since_hit": now - self._last_hit[view_id],
+                }
+                for view_id, hits in self._hits.items()
+            },
+        }
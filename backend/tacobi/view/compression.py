@@ -0,0 +1,120 @@
+"""Pre-compression of response bodies."""
+
+import gzip
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from enum import Enum
+
+from tacobi.view.response_formats import parse_quality_values
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the installed extras
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the installed extras
+    zstandard = None
+
+
+class ContentEncoding(str, Enum):
+    """A content encoding responses can be pre-compressed with."""
+
+    ZSTD = "zstd"
+    BROTLI = "br"
+    GZIP = "gzip"
+
+
+COMPRESSORS: dict[ContentEncoding, Callable[[bytes], bytes]] = {}
+"""The compressor of each available encoding, in order of preference. Brotli and
+Zstandard are only available with the `brotli` and `zstandard` packages."""
+
+if zstandard is not None:
+    COMPRESSORS[ContentEncoding.ZSTD] = lambda body: zstandard.compress(body, level=3)
+if brotli is not None:
+    COMPRESSORS[ContentEncoding.BROTLI] = lambda body: brotli.compress(body, quality=5)
+COMPRESSORS[ContentEncoding.GZIP] = lambda body: gzip.compress(
+    body, compresslevel=6, mtime=0
+)
+
+
+@dataclass(frozen=True)
+class CompressedVariant:
+    """A response body compressed with one encoding."""
+
+    body: bytes
+    """The compressed body."""
+
+    original_size: int
+    """The size of the uncompressed body in bytes."""
+
+    seconds: float
+    """How long compressing the body took."""
+
+    @property
+    def size(self) -> int:
+        """The size of the compressed body in bytes."""
+        return len(self.body)
+
+    @property
+    def ratio(self) -> float:
+        """The size of the compressed body relative to the uncompressed one."""
+        return self.size / self.original_size if self.original_size else 1.0
+
+
+def compress_variants(
+    body: bytes, encodings: Iterable[ContentEncoding]
+) -> dict[ContentEncoding, CompressedVariant]:
+    """Compress a body with each of the given encodings.
+
+    ### Arguments:
+    - body: The body to compress.
+    - encodings: The encodings to compress it with. Unavailable ones are skipped.
+
+    ### Returns:
+    The compressed variants that are smaller than the body.
+    """
+    variants: dict[ContentEncoding, CompressedVariant] = {}
+    for encoding in encodings:
+        compressor = COMPRESSORS.get(encoding)
+        if compressor is None:
+            continue
+        start = time.perf_counter()
+        compressed = compressor(body)
+        seconds = time.perf_counter() - start
+        if len(compressed) < len(body):
+            variants[encoding] = CompressedVariant(
+                body=compressed, original_size=len(body), seconds=seconds
+            )
+    return variants
+
+
+def choose_encoding(
+    accept_encoding: str | None, available: Iterable[ContentEncoding]
+) -> ContentEncoding | None:
+    """Choose the encoding of a response from its `Accept-Encoding` header.
+
+    ### Arguments:
+    - accept_encoding: The `Accept-Encoding` header of the request.
+    - available: The encodings the body is available in.
+
+    ### Returns:
+    The most preferred available encoding the client accepts, None to send the
+    body uncompressed.
+    """
+    if not accept_encoding:
+        return None
+
+    qualities = {
+        coding.lower(): quality
+        for coding, quality in parse_quality_values(accept_encoding)
+    }
+
+    available = set(available)
+    for encoding in COMPRESSORS:
+        quality = qualities.get(encoding.value, qualities.get("*", 0.0))
+        if encoding in available and quality > 0:
+            return encoding
+    return None
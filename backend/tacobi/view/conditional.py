@@ -0,0 +1,31 @@
+"""Conditional requests to view endpoints."""
+
+from datetime import UTC, datetime
+from email.utils import format_datetime
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check whether an `If-None-Match` header matches an entity tag.
+
+    Tags are compared weakly, as recommended for `If-None-Match`.
+
+    ### Arguments:
+    - if_none_match: The `If-None-Match` header of the request.
+    - etag: The entity tag of the current response, quoted.
+
+    ### Returns:
+    Whether the client's copy is current, in which case a 304 can be returned.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag.removeprefix("W/")
+        for tag in if_none_match.split(",")
+    )
+
+
+def format_http_date(value: datetime) -> str:
+    """Format a timezone-aware datetime as an HTTP date, e.g. for `Last-Modified`."""
+    return format_datetime(value.astimezone(UTC), usegmt=True)
@@ -0,0 +1,237 @@
+"""Cost model of materialized view recomputes, from their measured durations."""
+
+import math
+import os
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from tacobi.view.plan import ExecutionPlan
+from tacobi.view.view_models import BaseView, MaterializedView
+
+
+@dataclass
+class DurationStats:
+    """The measured recomputes of a view."""
+
+    ewma: float
+    """The exponentially weighted moving average of the duration, in seconds."""
+
+    cpu_utilization: float
+    """The moving average of the CPU seconds used per second of the recompute.
+    Below 1 for views waiting on I/O, above 1 for views using several cores."""
+
+    samples: deque[float]
+    """The most recent durations, in seconds."""
+
+    count: int = 1
+    """The number of recomputes measured."""
+
+    @property
+    def p95(self) -> float:
+        """The 95th percentile of the recent durations, in seconds."""
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+@dataclass
+class CostModel:
+    """Estimates the cost of recomputing each view from its past recomputes.
+
+    The estimates are used to plan recompute passes: views on the longest
+    remaining path through the dependency graph start first, so the served views
+    at the end of it get fresh data as early as possible, and the number of views
+    recomputed at once is sized from how much CPU they use.
+
+    CPU time is measured for the whole process while a view is recomputed, so
+    views recomputed at the same time inflate each other's utilization, and the
+    CPU used by views running in a process pool isn't counted.
+    """
+
+    alpha: float = 0.3
+    """The weight of the latest duration in the moving averages."""
+
+    window: int = 100
+    """The number of recent durations the percentiles are taken over."""
+
+    cpu_count: int = field(default_factory=lambda: os.cpu_count() or 1)
+    """The number of cores the recomputes share."""
+
+    _stats: dict[UUID, DurationStats] = field(default_factory=dict)
+    """The measured recomputes of each view."""
+
+    def record(self, view_id: UUID, seconds: float, cpu_seconds: float) -> None:
+        """Record the duration of a recompute.
+
+        ### Arguments:
+        - view_id: The ID of the recomputed view.
+        - seconds: The wall-clock duration of the recompute.
+        - cpu_seconds: The CPU time used by the process during the recompute.
+        """
+        utilization = cpu_seconds / seconds if seconds > 0 else 0.0
+        stats = self._stats.get(view_id)
+        if stats is None:
+            self._stats[view_id] = DurationStats(
+                ewma=seconds,
+                cpu_utilization=utilization,
+                samples=deque([seconds], maxlen=self.window),
+            )
+            return
+        stats.ewma += self.alpha * (seconds - stats.ewma)
+        stats.cpu_utilization += self.alpha * (utilization - stats.cpu_utilization)
+        stats.samples.append(seconds)
+        stats.count += 1
+
+    def get(self, view_id: UUID) -> DurationStats | None:
+        """Get the measured recomputes of a view, None if it was never measured."""
+        return self._stats.get(view_id)
+
+    def estimate(self, view: BaseView) -> float:
+        """Estimate how long recomputing a view takes.
+
+        Views that were never measured are assumed to take as long as the average
+        measured view, and plain views are computed on request so they take none.
+
+        ### Arguments:
+        - view: The view to estimate.
+
+        ### Returns:
+        The estimated duration in seconds.
+        """
+        if not isinstance(view, MaterializedView):
+            return 0.0
+        stats = self._stats.get(view.id)
+        if stats is not None:
+            return stats.ewma
+        if not self._stats:
+            return 0.0
+        return sum(s.ewma for s in self._stats.values()) / len(self._stats)
+
+    def priorities(
+        self, plan: ExecutionPlan, subgraph: Iterable[UUID] | None = None
+    ) -> dict[UUID, float]:
+        """Rank views by the estimated duration of the longest path they start.
+
+        That's the view's own duration plus that of its slowest chain of
+        dependents, so the views of the critical path rank highest and long views
+        rank above short ones.
+
+        ### Arguments:
+        - plan: The execution plan of the views.
+        - subgraph: The IDs of the views recomputed. None for all views.
+
+        ### Returns:
+        The priority of each view, in seconds.
+        """
+        views = self._select(plan, subgraph)
+        dependents = self._dependents(views)
+        priorities: dict[UUID, float] = {}
+        for view in reversed(views):
+            priorities[view.id] = self.estimate(view) + max(
+                (priorities[dep_id] for dep_id in dependents[view.id]), default=0.0
+            )
+        return priorities
+
+    def concurrency(self, limit: int | None = None) -> int | None:
+        """Size the number of views recomputed at once from their CPU use.
+
+        Views waiting on I/O can overlap freely while views using the CPU compete
+        for the cores, so the cores are divided by the CPU utilization of the
+        measured views, weighted by their duration.
+
+        ### Arguments:
+        - limit: The configured maximum, None for no limit.
+
+        ### Returns:
+        The number of views to recompute at once, None for no limit.
+        """
+        total = sum(s.ewma for s in self._stats.values())
+        if total <= 0:
+            return limit
+        utilization = sum(s.ewma * s.cpu_utilization for s in self._stats.values())
+        if utilization <= 0:
+            return limit
+        workers = max(1, math.ceil(self.cpu_count * total / utilization))
+        return workers if limit is None else min(workers, limit)
+
+    def describe(self, plan: ExecutionPlan, limit: int | None = None) -> dict:
+        """Describe the measured recompute plan of all views.
+
+        ### Arguments:
+        - plan: The execution plan of the views.
+        - limit: The configured maximum number of views recomputed at once.
+
+        ### Returns:
+        The measured stats and priority of each view in start order, the critical
+        path to the served views with its estimated duration, and the
+        concurrency.
+        """
+        views = plan.order
+        by_id = {view.id: view for view in views}
+        priorities = self.priorities(plan)
+        dependents = self._dependents(views)
+
+        # The estimated time each view has fresh data at, from the start of a pass
+        ready_at: dict[UUID, float] = {}
+        previous: dict[UUID, UUID | None] = {}
+        for view in views:
+            deps = [dep_id for dep_id in view.dependencies if dep_id in ready_at]
+            slowest = max(deps, key=ready_at.__getitem__, default=None)
+            previous[view.id] = slowest
+            start = ready_at[slowest] if slowest is not None else 0.0
+            ready_at[view.id] = start + self.estimate(view)
+
+        served = [
+            view
+            for view in views
+            if not isinstance(view, MaterializedView) or view.route is not None
+        ]
+        critical_path: list[BaseView] = []
+        end = max(served, key=lambda view: ready_at[view.id], default=None)
+        node = end.id if end is not None else None
+        while node is not None:
+            critical_path.append(by_id[node])
+            node = previous[node]
+        critical_path.reverse()
+
+        def describe_view(view: BaseView) -> dict:
+            stats = self._stats.get(view.id)
+            return {
+                "name": view.name or str(view.id),
+                "priority_seconds": priorities[view.id],
+                "estimated_seconds": self.estimate(view),
+                "ewma_seconds": stats.ewma if stats else None,
+                "p95_seconds": stats.p95 if stats else None,
+                "cpu_utilization": stats.cpu_utilization if stats else None,
+                "recomputes": stats.count if stats else 0,
+                "dependents": len(dependents[view.id]),
+            }
+
+        return {
+            "concurrency": self.concurrency(limit),
+            "critical_path": [view.name or str(view.id) for view in critical_path],
+            "critical_path_seconds": ready_at[end.id] if end is not None else 0.0,
+            "views": [
+                describe_view(view)
+                for view in sorted(views, key=lambda v: -priorities[v.id])
+            ],
+        }
+
+    @staticmethod
+    def _select(plan: ExecutionPlan, subgraph: Iterable[UUID] | None) -> list[BaseView]:
+        """Get the views of a subgraph in topological order."""
+        if subgraph is None:
+            return plan.order
+        ids = set(subgraph)
+        return [view for view in plan.order if view.id in ids]
+
+    @staticmethod
+    def _dependents(views: list[BaseView]) -> dict[UUID, list[UUID]]:
+        """Get the IDs of the direct dependents of each view among the views."""
+        dependents: dict[UUID, list[UUID]] = {view.id: [] for view in views}
+        for view in views:
+            for dep_id in view.dependencies:
+                if dep_id in dependents:
+                    dependents[dep_id].append(view.id)
+        return dependents
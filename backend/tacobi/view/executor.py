@@ -0,0 +1,158 @@
+"""Concurrent execution of the view dependency graph."""
+
+import asyncio
+import heapq
+import itertools
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from tacobi.view.plan import ExecutionPlan
+from tacobi.view.view_models import BaseView
+
+
+@dataclass(eq=False)
+class PrioritySlots:
+    """Limits how many views run at once, giving free slots to the highest priority.
+
+    Views of equal priority get the slots in the order they asked for them.
+    """
+
+    limit: int
+    """The number of views that can run at once."""
+
+    _active: int = 0
+    """The number of slots taken."""
+
+    _waiting: list[tuple[float, int, asyncio.Future]] = field(default_factory=list)
+    """The heap of views waiting for a slot, by negated priority then arrival."""
+
+    _arrivals: itertools.count = field(default_factory=itertools.count)
+    """Counter ordering the views of equal priority."""
+
+    @asynccontextmanager
+    async def slot(self, priority: float = 0.0) -> AsyncIterator[None]:
+        """Hold a slot while the context is open.
+
+        ### Arguments:
+        - priority: The priority of the view, higher first.
+
+        ### Returns:
+        A context manager holding the slot.
+        """
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: float) -> None:
+        """Wait for a free slot."""
+        if self._active < self.limit and not self._waiting:
+            self._active += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (-priority, next(self._arrivals), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The slot was handed over just as the wait was cancelled
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Hand the slot over to the highest priority view waiting, or free it."""
+        while self._waiting:
+            *_, future = heapq.heappop(self._waiting)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
+
+
+@dataclass
+class RecomputeExecutor:
+    """Runs every view of a dependency graph, overlapping independent branches.
+
+    Each view starts as soon as all of its own dependencies have finished rather
+    than when the whole previous topological generation is done. When the
+    concurrency limit is reached, the free slots go to the views with the highest
+    priority, and otherwise to the views that were ready first.
+    """
+
+    max_concurrency: int | None = None
+    """The maximum number of views visited at once. None for no limit."""
+
+    async def run(
+        self,
+        plan: ExecutionPlan,
+        visit: Callable[[BaseView, bool], Awaitable[bool]],
+        subgraph: set[UUID] | None = None,
+        *,
+        priorities: Mapping[UUID, float] | None = None,
+        max_concurrency: int | None = None,
+    ) -> set[UUID]:
+        """Visit every view of the graph in dependency order.
+
+        Each view is visited with whether any of its dependencies changed, and its
+        visit returns whether the view itself changed. This lets callers skip the
+        parts of the graph that are up to date.
+
+        If a view fails, the views that depend on it are skipped while unrelated
+        branches keep running. The error is raised once everything has settled.
+
+        ### Arguments:
+        - plan: The execution plan of the views.
+        - visit: The coroutine function called for each view.
+        - subgraph: The IDs of the views to visit. Views outside of it are treated
+          as unchanged. None to visit all views.
+        - priorities: The priority of each view, higher first, see
+          `CostModel.priorities`. None to start views in topological order.
+        - max_concurrency: The maximum number of views visited at once for this
+          run. None for the executor's limit.
+
+        ### Returns:
+        The IDs of the views that changed.
+
+        ### Raises:
+        - ExceptionGroup: If more than one view failed independently.
+        """
+        limit = max_concurrency or self.max_concurrency
+        slots = PrioritySlots(limit) if limit else None
+        priorities = priorities or {}
+
+        async def run_node(view: BaseView, dependencies: list[asyncio.Task]) -> bool:
+            # Re-raises the error of a failed dependency, skipping this view
+            upstream_changed = any(await asyncio.gather(*dependencies))
+            if slots is None:
+                return await visit(view, upstream_changed)
+            async with slots.slot(priorities.get(view.id, 0.0)):
+                return await visit(view, upstream_changed)
+
+        tasks: dict[UUID, asyncio.Task] = {}
+        for generation in plan.generations:
+            # Tasks start in creation order, so the highest priority start first
+            ranked = sorted(generation, key=lambda v: -priorities.get(v.id, 0.0))
+            for view in ranked:
+                if subgraph is not None and view.id not in subgraph:
+                    continue
+                dependencies = [
+                    tasks[dep_id] for dep_id in view.dependencies if dep_id in tasks
+                ]
+                tasks[view.id] = asyncio.create_task(run_node(view, dependencies))
+
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        # Dependents of a failed view fail with the very same exception object
+        errors = list({id(r): r for r in results if isinstance(r, Exception)}.values())
+        if len(errors) == 1:
+            raise errors[0]
+        if errors:
+            msg = f"{len(errors)} views failed to recompute"
+            raise ExceptionGroup(msg, errors)
+
+        return {
+            view_id for view_id, changed in zip(tasks, results, strict=True) if changed
+        }
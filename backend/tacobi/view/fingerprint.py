@@ -0,0 +1,67 @@
+"""Cheap content fingerprints of view outputs."""
+
+import hashlib
+
+import pandas as pd
+import polars as pl
+from pydantic import BaseModel
+
+from tacobi.data_model.models import DataModel
+
+DIGEST_SIZE = 16
+"""The size in bytes of the fingerprint digests."""
+
+
+def fingerprint(data: DataModel | None) -> str | None:
+    """Compute a fingerprint of the content of some data.
+
+    Equal data yields equal fingerprints within a process, so they can be compared
+    to tell whether a recompute actually changed anything. DataFrames are hashed
+    row by row in native code together with their schema, and Pydantic models are
+    hashed from their JSON.
+
+    ### Arguments:
+    - data: The data to fingerprint.
+
+    ### Returns:
+    The hex digest, or None if the data can't be fingerprinted (e.g. a LazyFrame),
+    in which case it should be assumed to have changed.
+    """
+    content = _content_bytes(data)
+    if content is None:
+        return None
+    return hashlib.blake2b(content, digest_size=DIGEST_SIZE).hexdigest()
+
+
+def _content_bytes(data: DataModel | None) -> bytes | None:
+    """Get the bytes to hash for some data, None if it can't be fingerprinted."""
+    if data is None:
+        return b""
+    if isinstance(data, BaseModel):
+        model_name = type(data).__qualname__.encode("utf-8")
+        return model_name + data.model_dump_json().encode("utf-8")
+    if isinstance(data, pl.DataFrame):
+        return _polars_content_bytes(data)
+    if isinstance(data, pd.DataFrame):
+        return _pandas_content_bytes(data)
+    return None
+
+
+def _polars_content_bytes(data: pl.DataFrame) -> bytes | None:
+    """Get the schema and row hashes of a Polars DataFrame."""
+    schema = repr(data.schema).encode("utf-8")
+    if data.width == 0:
+        return schema
+    try:
+        return schema + data.hash_rows(seed=0).to_numpy().tobytes()
+    except pl.exceptions.PolarsError:
+        return None
+
+
+def _pandas_content_bytes(data: pd.DataFrame) -> bytes | None:
+    """Get the dtypes and row hashes of a pandas DataFrame."""
+    schema = repr(data.dtypes.to_dict()).encode("utf-8")
+    try:
+        return schema + pd.util.hash_pandas_object(data).to_numpy().tobytes()
+    except TypeError:
+        return None
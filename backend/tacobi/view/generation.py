@@ -0,0 +1,326 @@
+"""Generations of materialized view data, published atomically."""
+
+import time
+import weakref
+from collections import deque
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from types import MappingProxyType
+from typing import Generic
+from uuid import UUID
+
+import polars as pl
+
+from tacobi.data_model.models import DataModelType
+from tacobi.view.compression import CompressedVariant, ContentEncoding
+from tacobi.view.response_formats import ResponseFormat, to_polars_frame
+from tacobi.view.result_cache import ResultCache
+
+
+@dataclass
+class MaterializedSnapshot(Generic[DataModelType]):
+    """The data of a materialized view at one point, with what's derived from it.
+
+    The content of the data never changes once the snapshot is staged, but frames
+    can be spilled to disk and loaded back to stay within a memory budget, see
+    `MemoryBudget`. The responses derived from the data are filled in as they are
+    compressed or requested.
+    """
+
+    data: DataModelType | None
+    """The data of the view, None while it's spilled. Read it with `read`."""
+
+    latest_update: datetime
+    """The time the content of the data last changed."""
+
+    fingerprint: str | None
+    """The content fingerprint of the data, None if it can't be taken."""
+
+    data_source_versions: Mapping[str, int]
+    """The versions of the data sources the data was computed from."""
+
+    response: bytes | None
+    """The data serialized as the JSON body of the view's endpoint. None for views
+    without a route."""
+
+    query_results: ResultCache
+    """The results of queries over the data, see `ViewQuery`."""
+
+    compressed_responses: dict[ContentEncoding, CompressedVariant] = field(
+        default_factory=dict
+    )
+    """The serialized response compressed with each encoding. Replaced as a whole
+    once compressed, so readers never see it half filled."""
+
+    columnar_responses: dict[ResponseFormat, bytes] = field(default_factory=dict)
+    """The data encoded in columnar formats, filled as they are requested."""
+
+    spill_path: Path | None = field(default=None, init=False)
+    """The IPC file the data was spilled to, None if it never was. Removed once
+    the snapshot is garbage collected."""
+
+    spilled_size: int = field(default=0, init=False)
+    """The estimated size of the data when it was spilled, in bytes."""
+
+    last_read: float = field(default_factory=time.monotonic, init=False)
+    """The monotonic time the data was last read at."""
+
+    refreshed_at: float = field(default_factory=time.monotonic, init=False)
+    """The monotonic time the data was computed at, see `MaterializedView.ttl`."""
+
+    invalidated: bool = field(default=False, init=False)
+    """Whether a dependency of the view changed since the data was computed."""
+
+    @property
+    def resident_size(self) -> int:
+        """The estimated size of the data held in memory, in bytes.
+
+        Only Polars DataFrames are tracked, other data counts as 0. Includes the
+        columnar responses, as they are dropped with the data when it's spilled.
+        """
+        data = self.data
+        size = data.estimated_size() if isinstance(data, pl.DataFrame) else 0
+        return size + sum(len(body) for body in self.columnar_responses.values())
+
+    @property
+    def response_size(self) -> int:
+        """The size of the JSON response and its compressed variants, in bytes.
+
+        They are kept in memory when the data is spilled.
+        """
+        size = len(self.response) if self.response is not None else 0
+        return size + sum(v.size for v in self.compressed_responses.values())
+
+    @property
+    def is_spilled(self) -> bool:
+        """Whether the data is only on disk."""
+        return self.data is None and self.spill_path is not None
+
+    def touch(self) -> None:
+        """Record that the snapshot was read, including through its responses."""
+        self.last_read = time.monotonic()
+
+    def read(self) -> DataModelType | None:
+        """Read the data, from its spill file if it's spilled.
+
+        Data read from the spill file isn't kept in memory, see `load` for that.
+
+        ### Returns:
+        The data.
+        """
+        self.touch()
+        data = self.data
+        if data is not None or self.spill_path is None:
+            return data
+        return pl.read_ipc(self.spill_path)
+
+    def scan(self) -> pl.LazyFrame | None:
+        """Read the data as a lazy frame, scanning its spill file if it's spilled.
+
+        Unlike `read`, a spilled frame isn't loaded in full, so queries only read
+        the rows and columns they need.
+
+        ### Returns:
+        The lazy frame, or None if the data isn't tabular.
+        """
+        self.touch()
+        data = self.data
+        if data is None and self.spill_path is not None:
+            return pl.scan_ipc(self.spill_path)
+        frame = to_polars_frame(data) if data is not None else None
+        return frame.lazy() if frame is not None else None
+
+    def spill(self, path: Path) -> None:
+        """Write the data to an IPC file and drop it from memory.
+
+        Blocking, so it's meant to run in a thread. The file is only written the
+        first time, so spilling data that was loaded back is free.
+
+        ### Arguments:
+        - path: The file to write the data to.
+        """
+        data = self.data
+        if not isinstance(data, pl.DataFrame):
+            return
+        if self.spill_path is None:
+            tmp_path = path.with_name(f"{path.name}.tmp")
+            data.write_ipc(tmp_path)
+            tmp_path.replace(path)
+            self.spill_path = path
+            weakref.finalize(self, path.unlink, missing_ok=True)
+        # Readers fall back to the file once the data is gone
+        self.spilled_size = data.estimated_size()
+        self.data = None
+        self.columnar_responses = {}
+
+    def load(self) -> None:
+        """Load spilled data back into memory. Blocking."""
+        if self.is_spilled:
+            self.data = pl.read_ipc(self.spill_path)
+
+
+@dataclass(frozen=True)
+class Generation:
+    """The snapshots of all materialized views, as published together."""
+
+    id: int = 0
+    """The number of the generation, increasing with every publication."""
+
+    published_at: datetime | None = None
+    """The time the generation was published at, None for the empty generation."""
+
+    snapshots: Mapping[UUID, MaterializedSnapshot] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    """The snapshot of each view with data, by view ID."""
+
+
+@dataclass(eq=False)
+class GenerationStore:
+    """Publishes generations of materialized view data with one reference swap.
+
+    A recompute pass stages the snapshots of the views it recomputes in a new
+    generation built off to the side, and publishes it once the pass is done.
+    Readers take the current generation once and read everything from it, so they
+    never see views from different passes and never wait on a recompute.
+
+    Within a pass, views read the staged snapshots of their dependencies.
+    """
+
+    grace_period: timedelta | None = None
+    """How long superseded generations can still be read, so clients can finish
+    reading several views from the generation they started with. None to drop
+    them right away."""
+
+    current: Generation = field(default_factory=Generation)
+    """The latest published generation."""
+
+    _previous: deque[tuple[float, Generation]] = field(default_factory=deque)
+    """Superseded generations with the time they expire at, oldest first."""
+
+    _staged: ContextVar[dict[UUID, MaterializedSnapshot] | None] = field(
+        default_factory=lambda: ContextVar("staged_snapshots", default=None)
+    )
+    """The snapshots staged by the pass running in the current context."""
+
+    _pinned: ContextVar[Generation | None] = field(
+        default_factory=lambda: ContextVar("pinned_generation", default=None)
+    )
+    """The generation read from in the current context, see `pin`."""
+
+    def snapshot(self, view_id: UUID) -> MaterializedSnapshot | None:
+        """Get the latest snapshot of a view.
+
+        That's the snapshot staged by the pass running in the current context if
+        there is one, and otherwise the one of the pinned or current generation.
+
+        ### Arguments:
+        - view_id: The ID of the view.
+
+        ### Returns:
+        The snapshot, or None if the view has no data.
+        """
+        staged = self._staged.get()
+        if staged is not None and view_id in staged:
+            return staged[view_id]
+        generation = self._pinned.get() or self.current
+        return generation.snapshots.get(view_id)
+
+    def stage(self, view_id: UUID, snapshot: MaterializedSnapshot) -> None:
+        """Stage the new snapshot of a view.
+
+        Outside of a pass, the snapshot is published right away.
+
+        ### Arguments:
+        - view_id: The ID of the view.
+        - snapshot: The new snapshot of the view.
+        """
+        staged = self._staged.get()
+        if staged is None:
+            self.publish({view_id: snapshot})
+        else:
+            staged[view_id] = snapshot
+
+    @contextmanager
+    def build(self) -> Iterator[dict[UUID, MaterializedSnapshot]]:
+        """Stage the snapshots of the views recomputed in this context.
+
+        Tasks and threads started from the context inherit it. The staged
+        snapshots are published by calling `publish` with what's yielded.
+
+        ### Returns:
+        A context manager yielding the staged snapshots by view ID.
+        """
+        staged: dict[UUID, MaterializedSnapshot] = {}
+        token = self._staged.set(staged)
+        try:
+            yield staged
+        finally:
+            self._staged.reset(token)
+
+    @contextmanager
+    def pin(self, generation: Generation | None = None) -> Iterator[Generation]:
+        """Read the views from a single generation in this context.
+
+        ### Arguments:
+        - generation: The generation to read. None for the current one.
+
+        ### Returns:
+        A context manager yielding the pinned generation.
+        """
+        generation = generation or self.current
+        token = self._pinned.set(generation)
+        try:
+            yield generation
+        finally:
+            self._pinned.reset(token)
+
+    def publish(self, snapshots: Mapping[UUID, MaterializedSnapshot]) -> Generation:
+        """Publish a new generation with the given snapshots.
+
+        Views without a new snapshot keep the one of the current generation.
+
+        ### Arguments:
+        - snapshots: The new snapshots by view ID.
+
+        ### Returns:
+        The published generation, the current one if there are no snapshots.
+        """
+        if not snapshots:
+            return self.current
+        previous = self.current
+        self.current = Generation(
+            id=previous.id + 1,
+            published_at=datetime.now(UTC),
+            snapshots=MappingProxyType({**previous.snapshots, **snapshots}),
+        )
+
+        now = time.monotonic()
+        while self._previous and self._previous[0][0] <= now:
+            self._previous.popleft()
+        if self.grace_period is not None and previous.published_at is not None:
+            self._previous.append((now + self.grace_period.total_seconds(), previous))
+        return self.current
+
+    def get(self, generation_id: int) -> Generation | None:
+        """Get a generation by ID.
+
+        ### Arguments:
+        - generation_id: The ID of the generation.
+
+        ### Returns:
+        The generation, or None if it was never published or its grace period is
+        over.
+        """
+        current = self.current
+        if current.id == generation_id:
+            return current
+        now = time.monotonic()
+        for expires_at, generation in list(self._previous):
+            if generation.id == generation_id and expires_at > now:
+                return generation
+        return None
@@ -0,0 +1,82 @@
+"""Memory budget of the data of materialized views."""
+
+import tempfile
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import UUID, uuid4
+
+from tacobi.view.generation import MaterializedSnapshot
+
+
+@dataclass
+class MemoryBudget:
+    """Keeps the frames of materialized views within a memory budget.
+
+    The most recently read frames are kept in memory for as long as they fit in
+    the budget, and the others are spilled to uncompressed Arrow IPC files. Spilled
+    frames are read back from disk when requested, and queries scan the file
+    directly. Frames spilled while cold are loaded back once they are among the
+    most recently read again and fit in the budget.
+
+    Only Polars DataFrames are tracked, with `DataFrame.estimated_size`. The JSON
+    responses of the views aren't spilled, so they are counted against the budget
+    first and the frames share what's left of it.
+    """
+
+    max_bytes: int
+    """The estimated size in bytes of the frames and responses kept in memory."""
+
+    directory: Path | None = None
+    """The directory spilled frames are written to. None for a temporary directory
+    created on the first spill."""
+
+    def spill_path(self, view_id: UUID) -> Path:
+        """Get a new path to spill the data of a view to."""
+        if self.directory is None:
+            self.directory = Path(tempfile.mkdtemp(prefix="tacobi-spill-"))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return self.directory / f"{view_id}-{uuid4().hex}.arrow"
+
+    def enforce(
+        self, snapshots: Mapping[UUID, MaterializedSnapshot]
+    ) -> tuple[list[UUID], list[UUID]]:
+        """Spill and load back frames so the most recently read fit in the budget.
+
+        Blocking, so it's meant to run in a thread.
+
+        ### Arguments:
+        - snapshots: The snapshots of the views, by view ID.
+
+        ### Returns:
+        The IDs of the views that were spilled and of those that were loaded back.
+        """
+        tracked = [
+            (view_id, snapshot)
+            for view_id, snapshot in snapshots.items()
+            if snapshot.resident_size or snapshot.is_spilled
+        ]
+        tracked.sort(key=lambda item: item[1].last_read, reverse=True)
+
+        used = sum(snapshot.response_size for snapshot in snapshots.values())
+        spilled: list[UUID] = []
+        loaded: list[UUID] = []
+        for view_id, snapshot in tracked:
+            size = (
+                snapshot.spilled_size if snapshot.is_spilled else snapshot.resident_size
+            )
+            if used + size <= self.max_bytes:
+                used += size
+                if snapshot.is_spilled:
+                    snapshot.load()
+                    loaded.append(view_id)
+            elif not snapshot.is_spilled:
+                snapshot.spill(self.spill_path(view_id))
+                spilled.append(view_id)
+
+        if spilled or loaded:
+            print(
+                f"Memory budget: {used / 1e6:.1f}/{self.max_bytes / 1e6:.1f} MB in "
+                f"memory, spilled {len(spilled)} and loaded back {len(loaded)} views"
+            )
+        return spilled, loaded
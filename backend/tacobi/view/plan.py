@@ -0,0 +1,114 @@
+"""Compiled execution plan of the view dependency graph."""
+
+from dataclasses import dataclass
+from typing import Self
+from uuid import UUID
+
+import rustworkx as rx
+
+from tacobi.view.view_models import BaseView
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """The dependency graph of a set of views, compiled once for every recompute.
+
+    Dependencies that aren't part of the plan are recorded rather than rejected so
+    views can be registered in any order. `validate` checks they were all resolved.
+    """
+
+    order: list[BaseView]
+    """All views in topological order."""
+
+    generations: list[list[BaseView]]
+    """All views grouped by topological generation. The views of a generation only
+    depend on views of previous generations."""
+
+    downstream: dict[UUID, frozenset[UUID]]
+    """The IDs of all views that transitively depend on each view."""
+
+    upstream: dict[UUID, frozenset[UUID]]
+    """The IDs of all views each view transitively depends on."""
+
+    missing_dependencies: dict[UUID, list[UUID]]
+    """The IDs of the dependencies of each view that aren't part of the plan."""
+
+    @classmethod
+    def compile(cls, views: list[BaseView]) -> Self:
+        """Compile the execution plan of a set of views.
+
+        ### Arguments:
+        - views: The views to compile the plan for.
+
+        ### Returns:
+        The compiled plan.
+
+        ### Raises:
+        - ValueError: If the views have a circular dependency.
+        """
+        # Create a directed graph with an edge from each dependency to its dependent
+        graph = rx.PyDiGraph()
+        node_map = {view.id: graph.add_node(view) for view in views}
+
+        missing_dependencies: dict[UUID, list[UUID]] = {}
+        for view in views:
+            for dep_id in view.dependencies:
+                if dep_id not in node_map:
+                    missing_dependencies.setdefault(view.id, []).append(dep_id)
+                    continue
+                graph.add_edge(node_map[dep_id], node_map[view.id], None)
+
+        try:
+            generations = [
+                [graph[node] for node in generation]
+                for generation in rx.topological_generations(graph)
+            ]
+        except rx.DAGHasCycle as e:
+            msg = "Circular dependency detected in views"
+            raise ValueError(msg) from e
+
+        order = [view for generation in generations for view in generation]
+
+        # Fold the direct dependents in reverse order to get transitive ones
+        downstream: dict[UUID, frozenset[UUID]] = {}
+        for view in reversed(order):
+            dependents = [
+                graph[node] for node in graph.successor_indices(node_map[view.id])
+            ]
+            downstream[view.id] = frozenset(
+                dependent.id for dependent in dependents
+            ).union(*(downstream[dependent.id] for dependent in dependents))
+
+        # And the direct dependencies in order to get transitive ones
+        upstream: dict[UUID, frozenset[UUID]] = {}
+        for view in order:
+            dependencies = [
+                graph[node] for node in graph.predecessor_indices(node_map[view.id])
+            ]
+            upstream[view.id] = frozenset(
+                dependency.id for dependency in dependencies
+            ).union(*(upstream[dependency.id] for dependency in dependencies))
+
+        return cls(
+            order=order,
+            generations=generations,
+            downstream=downstream,
+            upstream=upstream,
+            missing_dependencies=missing_dependencies,
+        )
+
+    def validate(self) -> None:
+        """Check that every dependency of every view is part of the plan.
+
+        ### Raises:
+        - ValueError: If a dependency is missing.
+        """
+        if not self.missing_dependencies:
+            return
+        names = {view.id: view.name for view in self.order}
+        missing = ", ".join(
+            f"{names[view_id]} -> {dep_ids}"
+            for view_id, dep_ids in self.missing_dependencies.items()
+        )
+        msg = f"Dependencies not found: {missing}"
+        raise ValueError(msg)
@@ -0,0 +1,242 @@
+"""Restricted queries over the data of views, run server-side."""
+
+import operator
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+from typing import Self
+
+import polars as pl
+from pydantic import BaseModel
+
+
+class FilterOperator(str, Enum):
+    """A comparison a filter can make between a column and a value."""
+
+    EQ = "eq"
+    NE = "ne"
+    LT = "lt"
+    LTE = "lte"
+    GT = "gt"
+    GTE = "gte"
+    IN = "in"
+
+
+COMPARISONS: dict[FilterOperator, Callable[[pl.Expr, object], pl.Expr]] = {
+    FilterOperator.EQ: operator.eq,
+    FilterOperator.NE: operator.ne,
+    FilterOperator.LT: operator.lt,
+    FilterOperator.LTE: operator.le,
+    FilterOperator.GT: operator.gt,
+    FilterOperator.GTE: operator.ge,
+}
+"""The comparison of each operator taking a single value."""
+
+IN_SEPARATOR = "|"
+"""The separator of the values of `in` filters."""
+
+QUERY_ERRORS = (
+    pl.exceptions.ComputeError,
+    pl.exceptions.InvalidOperationError,
+    pl.exceptions.SchemaError,
+)
+"""The Polars errors of queries that can't run on the data, e.g. comparing a date
+column to a value that isn't one."""
+
+
+@dataclass(frozen=True)
+class Filter:
+    """A filter keeping the rows whose column compares to a value."""
+
+    column: str
+    """The column to compare."""
+
+    operator: FilterOperator
+    """The comparison to make."""
+
+    value: str | float | tuple[str | float, ...]
+    """The value to compare to, a tuple of values for `in` filters."""
+
+    def expression(self, dtype: pl.DataType) -> pl.Expr:
+        """Get the Polars expression of the filter.
+
+        ### Arguments:
+        - dtype: The type of the column in the frame filtered.
+
+        ### Returns:
+        The expression.
+        """
+        column = pl.col(self.column)
+        if self.operator == FilterOperator.IN:
+            return column.is_in(_exact_values(self.value, dtype).implode())
+        return COMPARISONS[self.operator](column, self.value)
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """A column to sort by."""
+
+    column: str
+    """The column to sort by."""
+
+    descending: bool = False
+    """Whether to sort in descending order."""
+
+
+@dataclass(frozen=True)
+class ViewQuery:
+    """A query selecting, filtering and sorting the rows of a view's data.
+
+    Queries are parsed from query parameters and checked against the columns of
+    the view's model, so they can only reference columns the view returns and
+    compare them to values of the right type. They are hashable so their results
+    can be cached.
+
+    The query language is:
+    - `columns=name,age` to only return some columns, in that order.
+    - `filter=age:gte:18` to filter rows, repeatable. The operators are `eq`, `ne`,
+      `lt`, `lte`, `gt`, `gte` and `in`, which takes values separated by `|`.
+    - `sort=-age,name` to sort rows, descending for columns prefixed with `-`.
+    """
+
+    columns: tuple[str, ...] | None = None
+    """The columns to return, None for all."""
+
+    filters: tuple[Filter, ...] = ()
+    """The filters rows have to match."""
+
+    sort: tuple[SortKey, ...] = ()
+    """The columns to sort by, in order."""
+
+    @classmethod
+    def parse(
+        cls,
+        model: type[BaseModel],
+        columns: str | None = None,
+        filters: list[str] | None = None,
+        sort: str | None = None,
+    ) -> Self | None:
+        """Parse and check a query from its query parameters.
+
+        ### Arguments:
+        - model: The model of the rows of the view.
+        - columns: The `columns` parameter.
+        - filters: The `filter` parameters.
+        - sort: The `sort` parameter.
+
+        ### Returns:
+        The query, or None if no parameters were given.
+
+        ### Raises:
+        - ValueError: If the query references unknown columns or operators, or a
+          value doesn't match the type of its column.
+        """
+        if columns is None and not filters and sort is None:
+            return None
+
+        fields = model.model_fields
+        # Columns selected twice are returned once, where they first appear
+        selected = (
+            tuple(
+                dict.fromkeys(
+                    _check_column(fields, c.strip()) for c in columns.split(",")
+                )
+            )
+            if columns is not None
+            else None
+        )
+        parsed_filters = tuple(_parse_filter(fields, f) for f in filters or [])
+        sort_keys = tuple(
+            SortKey(
+                column=_check_column(fields, key.strip().removeprefix("-")),
+                descending=key.strip().startswith("-"),
+            )
+            for key in (sort.split(",") if sort is not None else [])
+        )
+        return cls(columns=selected, filters=parsed_filters, sort=sort_keys)
+
+    def apply(self, frame: pl.LazyFrame) -> pl.LazyFrame:
+        """Add the query to a lazy Polars plan.
+
+        Filters come first, so they are pushed down before anything else.
+
+        ### Arguments:
+        - frame: The plan of the view's data, with the columns of its model.
+
+        ### Returns:
+        The plan of the query's result.
+        """
+        if self.filters:
+            schema = frame.collect_schema()
+            frame = frame.filter(
+                *(f.expression(schema[f.column]) for f in self.filters)
+            )
+        if self.sort:
+            frame = frame.sort(
+                [key.column for key in self.sort],
+                descending=[key.descending for key in self.sort],
+            )
+        if self.columns is not None:
+            frame = frame.select(self.columns)
+        return frame
+
+
+def _exact_values(values: tuple[str | float, ...], dtype: pl.DataType) -> pl.Series:
+    """Cast the values of an `in` filter to the type of its column.
+
+    Values are parsed with the type of the model's field, e.g. as floats for
+    integer columns. Values the column can't hold exactly, like 2.5 for an
+    integer column, can't match any row so they are dropped.
+    """
+    series = pl.Series(values)
+    if series.dtype == dtype:
+        return series
+    cast = series.cast(dtype, strict=False)
+    exact = cast.cast(series.dtype, strict=False) == series
+    return cast.filter(exact.fill_null(value=False))
+
+
+def _check_column(fields: dict, column: str) -> str:
+    """Check that a column is part of a model.
+
+    ### Raises:
+    - ValueError: If the column is unknown.
+    """
+    if column not in fields:
+        msg = f"Unknown column {column!r}. Available columns: {', '.join(fields)}"
+        raise ValueError(msg)
+    return column
+
+
+def _parse_filter(fields: dict, raw_filter: str) -> Filter:
+    """Parse a filter of the form `column:operator:value`.
+
+    ### Raises:
+    - ValueError: If the filter is malformed, or its column, operator or value is
+      invalid.
+    """
+    try:
+        column, raw_operator, raw_value = raw_filter.split(":", 2)
+    except ValueError as e:
+        msg = f"Invalid filter {raw_filter!r}, expected column:operator:value"
+        raise ValueError(msg) from e
+
+    column = _check_column(fields, column)
+    try:
+        filter_operator = FilterOperator(raw_operator)
+    except ValueError as e:
+        operators = ", ".join(o.value for o in FilterOperator)
+        msg = f"Unknown filter operator {raw_operator!r}. Available: {operators}"
+        raise ValueError(msg) from e
+
+    value_type = fields[column].annotation
+    try:
+        value = (
+            tuple(value_type(v) for v in raw_value.split(IN_SEPARATOR))
+            if filter_operator == FilterOperator.IN
+            else value_type(raw_value)
+        )
+    except ValueError as e:
+        msg = f"Invalid value {raw_value!r} for column {column!r}"
+        raise ValueError(msg) from e
+    return Filter(column=column, operator=filter_operator, value=value)
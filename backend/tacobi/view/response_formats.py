@@ -0,0 +1,231 @@
+"""Formats view endpoints can respond in, chosen through content negotiation."""
+
+import io
+from collections.abc import Iterator
+from enum import Enum
+
+import pandas as pd
+import polars as pl
+from fastapi import HTTPException, status
+
+from tacobi.data_model.models import DataModelType
+
+
+class ResponseFormat(str, Enum):
+    """A format the data of a view can be returned in.
+
+    JSON returns the response envelope with the data as a list of rows. The
+    columnar formats return the data alone, written straight from the frame, and
+    are only available for views returning DataFrames. NDJSON writes one row per
+    line and is streamed in chunks.
+    """
+
+    JSON = "json"
+    ARROW = "arrow"
+    PARQUET = "parquet"
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+    @property
+    def media_type(self) -> str:
+        """The media type of responses in this format."""
+        return MEDIA_TYPES[self][0]
+
+    @property
+    def is_columnar(self) -> bool:
+        """Whether the format is written straight from a frame."""
+        return self != ResponseFormat.JSON
+
+    @property
+    def is_streamed(self) -> bool:
+        """Whether responses in this format are streamed in chunks."""
+        return self == ResponseFormat.NDJSON
+
+
+MEDIA_TYPES: dict[ResponseFormat, tuple[str, ...]] = {
+    ResponseFormat.JSON: ("application/json",),
+    ResponseFormat.ARROW: (
+        "application/vnd.apache.arrow.stream",
+        "application/x-arrow",
+    ),
+    ResponseFormat.PARQUET: ("application/vnd.apache.parquet", "application/x-parquet"),
+    ResponseFormat.CSV: ("text/csv",),
+    ResponseFormat.NDJSON: ("application/x-ndjson", "application/jsonl"),
+}
+"""The media types accepted for each format. The first one is used in responses."""
+
+_FORMATS_BY_MEDIA_TYPE = {
+    media_type: response_format
+    for response_format, media_types in MEDIA_TYPES.items()
+    for media_type in media_types
+}
+
+_WILDCARDS = {"*/*", "application/*"}
+
+
+def negotiate_format(
+    requested: ResponseFormat | None, accept: str | None
+) -> ResponseFormat:
+    """Choose the format of a response.
+
+    ### Arguments:
+    - requested: The format requested explicitly, e.g. through a `format=` query
+      parameter. Takes precedence over the `Accept` header.
+    - accept: The `Accept` header of the request.
+
+    ### Returns:
+    The format of the highest quality media type accepted, JSON if none of the
+    accepted media types are supported.
+    """
+    if requested is not None:
+        return requested
+
+    for media_type in _accepted_media_types(accept or ""):
+        if media_type in _FORMATS_BY_MEDIA_TYPE:
+            return _FORMATS_BY_MEDIA_TYPE[media_type]
+        if media_type in _WILDCARDS:
+            return ResponseFormat.JSON
+    return ResponseFormat.JSON
+
+
+def _accepted_media_types(accept: str) -> list[str]:
+    """Get the media types of an `Accept` header, from highest to lowest quality.
+
+    Media types of equal quality keep the order of the header, and those with a
+    quality of 0 are left out.
+    """
+    candidates = [
+        (-quality, index, media_type.lower())
+        for index, (media_type, quality) in enumerate(parse_quality_values(accept))
+        if quality > 0
+    ]
+    return [media_type for _, _, media_type in sorted(candidates)]
+
+
+def parse_quality_values(header: str) -> list[tuple[str, float]]:
+    """Parse a header listing values with optional qualities, such as `Accept`.
+
+    ### Arguments:
+    - header: The header, e.g. `text/csv;q=0.5, application/json`.
+
+    ### Returns:
+    Each value with its quality, 1 if not given and 0 if invalid, in header order.
+    """
+    values: list[tuple[str, float]] = []
+    for item in header.split(","):
+        value, *params = (part.strip() for part in item.split(";"))
+        if not value:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, raw_quality = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(raw_quality)
+                except ValueError:
+                    quality = 0.0
+        values.append((value, quality))
+    return values
+
+
+def to_polars_frame(data: DataModelType) -> pl.DataFrame | None:
+    """Get the data of a view as a Polars DataFrame.
+
+    ### Arguments:
+    - data: The data of a view.
+
+    ### Returns:
+    The data as a DataFrame, or None if it isn't tabular (e.g. a BaseModel).
+    """
+    if isinstance(data, pl.DataFrame):
+        return data
+    if isinstance(data, pl.LazyFrame):
+        return data.collect()
+    if isinstance(data, pd.DataFrame):
+        return pl.from_pandas(data)
+    return None
+
+
+def encode_frame(frame: pl.DataFrame, response_format: ResponseFormat) -> bytes:
+    """Write a frame in a columnar format.
+
+    ### Arguments:
+    - frame: The frame to write.
+    - response_format: The columnar format to write the frame in.
+
+    ### Returns:
+    The encoded frame.
+
+    ### Raises:
+    - ValueError: If the format isn't columnar.
+    """
+    match response_format:
+        case ResponseFormat.ARROW:
+            buffer = io.BytesIO()
+            frame.write_ipc_stream(buffer)
+            return buffer.getvalue()
+        case ResponseFormat.PARQUET:
+            buffer = io.BytesIO()
+            frame.write_parquet(buffer)
+            return buffer.getvalue()
+        case ResponseFormat.CSV:
+            return frame.write_csv().encode("utf-8")
+        case ResponseFormat.NDJSON:
+            return frame.write_ndjson().encode("utf-8")
+        case _:
+            msg = f"Format {response_format.value} is not a columnar format"
+            raise ValueError(msg)
+
+
+def iter_ndjson(frame: pl.DataFrame, chunk_rows: int) -> Iterator[bytes]:
+    """Serialize a frame as NDJSON, one chunk of rows at a time.
+
+    ### Arguments:
+    - frame: The frame to serialize.
+    - chunk_rows: The number of rows per chunk.
+
+    ### Returns:
+    An iterator over the serialized chunks.
+    """
+    for offset in range(0, frame.height, chunk_rows):
+        yield frame.slice(offset, chunk_rows).write_ndjson().encode("utf-8")
+
+
+def require_frame(data: DataModelType | None, feature: str) -> pl.DataFrame:
+    """Get the data of a view as a frame for a feature that only works on frames.
+
+    ### Arguments:
+    - data: The data of the view, or None if there is no data yet.
+    - feature: The feature needing the frame, used in error messages.
+
+    ### Returns:
+    The data as a DataFrame.
+
+    ### Raises:
+    - HTTPException: 503 if there is no data yet, 406 if the data isn't tabular.
+    """
+    if data is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The view has no data yet",
+        )
+    frame = to_polars_frame(data)
+    if frame is None:
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail=f"{feature} is only available for DataFrames",
+        )
+    return frame
+
+
+def columnar_openapi_responses() -> dict[int | str, dict]:
+    """Document the columnar formats in the OpenAPI schema of a route."""
+    return {
+        200: {
+            "content": {
+                response_format.media_type: {}
+                for response_format in ResponseFormat
+                if response_format.is_columnar
+            }
+        }
+    }
@@ -0,0 +1,102 @@
+"""Small in-memory caches of view results."""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class ResultCache(Generic[K, V]):
+    """A thread-safe cache evicting expired and least recently used entries.
+
+    Endpoints run in a thread pool, so the cache can be read and written from
+    several threads at once.
+    """
+
+    max_entries: int = 128
+    """The maximum number of entries kept."""
+
+    ttl: timedelta | None = None
+    """How long entries are kept after being set. None to keep them until they are
+    evicted or the cache is cleared."""
+
+    hits: int = 0
+    """The number of lookups that found an entry."""
+
+    misses: int = 0
+    """The number of lookups that didn't find an entry."""
+
+    generation: int = 0
+    """Bumped every time the cache is cleared. See `set`."""
+
+    _entries: OrderedDict[K, tuple[float, V]] = field(default_factory=OrderedDict)
+    """The entries with their expiry time, from least to most recently used."""
+
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    """Lock guarding the entries and counters."""
+
+    def __len__(self) -> int:
+        """Get the number of entries."""
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        """Get the entry of a key, marking it as recently used.
+
+        ### Arguments:
+        - key: The key to get the entry of.
+
+        ### Returns:
+        The entry, or None if there is none or it expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: K, value: V, generation: int | None = None) -> None:
+        """Set the entry of a key, evicting the least recently used if full.
+
+        ### Arguments:
+        - key: The key to set the entry of.
+        - value: The entry.
+        - generation: The generation of the cache when the value was computed. If
+          the cache was cleared since, the value is outdated and isn't set.
+        """
+        if self.max_entries <= 0:
+            return
+        expires_at = (
+            time.monotonic() + self.ttl.total_seconds()
+            if self.ttl is not None
+            else float("inf")
+        )
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def stats(self) -> dict[str, int]:
+        """Get the number of entries, hits and misses of the cache."""
+        return {"entries": len(self), "hits": self.hits, "misses": self.misses}
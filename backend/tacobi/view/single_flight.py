@@ -0,0 +1,58 @@
+"""Coalescing of identical concurrent calls."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlight:
+    """Runs at most one call per key at a time, sharing its outcome with callers.
+
+    Callers arriving while a call with the same key is in flight wait for it
+    instead of making their own, and get its result or exception. The call runs
+    in its own task, so a caller being cancelled doesn't cancel it for the others.
+    """
+
+    calls: int = 0
+    """The number of calls that were made."""
+
+    coalesced: int = 0
+    """The number of callers that waited for a call made by another caller."""
+
+    _in_flight: dict[Hashable, asyncio.Task] = field(default_factory=dict)
+    """The calls in flight by key."""
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Call a function, or wait for the call in flight with the same key.
+
+        ### Arguments:
+        - key: The key identifying identical calls.
+        - func: The function to call.
+
+        ### Returns:
+        The result of the call.
+
+        ### Raises:
+        Any exception raised by the call.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, int]:
+        """Get the number of calls made and coalesced, and those in flight."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
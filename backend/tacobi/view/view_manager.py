@@ -1,32 +1,210 @@
 """The main app class for TacoBI."""
 
+import asyncio
+import functools
 import inspect
-from collections.abc import Awaitable, Callable
+import time
+from collections.abc import Awaitable, Callable, Coroutine
 from dataclasses import dataclass, field
-from datetime import UTC, datetime
-from typing import Any, TypeVar
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Annotated, Any, TypeVar
+from uuid import UUID
 
-import rustworkx as rx
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.base import BaseTrigger
-from fastapi import FastAPI
+from fastapi import (
+    Depends,
+    FastAPI,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic.fields import FieldInfo
 
 from tacobi.data_model.models import DataModelType
+from tacobi.data_source.cache import CacheBackend
+from tacobi.view.adaptive_scheduler import AdaptiveScheduler
+from tacobi.view.compression import COMPRESSORS, ContentEncoding, choose_encoding
+from tacobi.view.conditional import etag_matches
+from tacobi.view.cost_model import CostModel
+from tacobi.view.executor import RecomputeExecutor
+from tacobi.view.generation import Generation, GenerationStore, MaterializedSnapshot
+from tacobi.view.memory_budget import MemoryBudget
+from tacobi.view.plan import ExecutionPlan
+from tacobi.view.query import QUERY_ERRORS, ViewQuery
+from tacobi.view.response_formats import (
+    ResponseFormat,
+    columnar_openapi_responses,
+    encode_frame,
+    iter_ndjson,
+    negotiate_format,
+    require_frame,
+)
+from tacobi.view.single_flight import SingleFlight
 from tacobi.view.view_models import BaseView, MaterializedView, View
+from tacobi.view.view_models.view import CachedViewResult
 
 T = TypeVar("T", bound=Callable[[DataModelType], Awaitable[DataModelType]])
 
+REQUEST_PARAMETER = "_tacobi_request"
+"""The name of the parameter view endpoints receive the request through."""
+
+FORMAT_PARAMETER = "_tacobi_format"
+"""The name of the parameter view endpoints receive the `format=` query parameter
+through."""
+
+LIMIT_PARAMETER = "_tacobi_limit"
+"""The name of the parameter view endpoints receive the `limit=` query parameter
+through."""
+
+OFFSET_PARAMETER = "_tacobi_offset"
+"""The name of the parameter view endpoints receive the `offset=` query parameter
+through."""
+
+
+FormatQuery = Annotated[
+    ResponseFormat | None,
+    Query(
+        alias="format",
+        description="The format of the response. Overrides the Accept header.",
+    ),
+]
+"""The `format=` query parameter of view endpoints."""
+
+LimitQuery = Annotated[
+    int | None,
+    Query(alias="limit", ge=1, description="The maximum number of rows to return."),
+]
+"""The `limit=` query parameter of view endpoints."""
+
+OffsetQuery = Annotated[
+    int,
+    Query(alias="offset", ge=0, description="The number of rows to skip."),
+]
+"""The `offset=` query parameter of view endpoints."""
+
+ColumnsQuery = Annotated[
+    str | None,
+    Query(
+        alias="columns",
+        description="The columns to return, separated by commas.",
+    ),
+]
+"""The `columns=` query parameter of materialized view endpoints."""
+
+FilterQuery = Annotated[
+    list[str] | None,
+    Query(
+        alias="filter",
+        description=(
+            "Filters of the form column:operator:value, where the operator is one "
+            "of eq, ne, lt, lte, gt, gte or in (with values separated by |)."
+        ),
+    ),
+]
+"""The `filter=` query parameter of materialized view endpoints."""
+
+GenerationQuery = Annotated[
+    int | None,
+    Query(
+        alias="generation",
+        ge=0,
+        description="The generation to read, as returned in the X-Generation "
+        "header, to read several views consistently. Superseded generations are "
+        "only available during the grace period.",
+    ),
+]
+"""The `generation=` query parameter of materialized view endpoints."""
+
+GENERATION_HEADER = "X-Generation"
+"""The header responses carry the ID of the generation they were read from in."""
+
+SortQuery = Annotated[
+    str | None,
+    Query(
+        alias="sort",
+        description="The columns to sort by, separated by commas. Prefix with - "
+        "to sort in descending order.",
+    ),
+]
+"""The `sort=` query parameter of materialized view endpoints."""
+
+
+def _request_names(parameter: inspect.Parameter) -> set[str]:
+    """Get the names a parameter of an endpoint is read from the request by."""
+    names = {parameter.name}
+    metadata = getattr(parameter.annotation, "__metadata__", ())
+    for info in (parameter.default, *metadata):
+        if isinstance(info, FieldInfo) and info.alias is not None:
+            names.add(info.alias)
+    return names
+
 
 @dataclass
 class ViewManager:
     """The main app class for TacoBI."""
 
     recompute_trigger: BaseTrigger | None
-    """ The trigger that will be used to recompute the materialized views. """
+    """ The trigger that will be used to recompute the materialized views that don't
+    have their own trigger. """
 
     fastapi_app: FastAPI
     """ The FastAPI app that will be used to serve the views. """
 
+    max_concurrency: int | None = None
+    """ The maximum number of materialized views recomputed at once. None for no
+    limit. """
+
+    stream_chunk_rows: int = 10_000
+    """ The number of rows serialized at once when streaming a view as NDJSON. """
+
+    compression_encodings: tuple[ContentEncoding, ...] = tuple(COMPRESSORS)
+    """ The encodings the serialized responses of materialized views are
+    pre-compressed with after every recompute. Empty to disable compression. """
+
+    min_compression_size: int = 1024
+    """ The size in bytes below which responses aren't compressed. """
+
+    compress_in_background: bool = False
+    """ Whether to compress responses in the background rather than as part of the
+    recompute pass. Responses are sent uncompressed until it's done. """
+
+    snapshot_cache: CacheBackend | None = None
+    """ The cache backend the latest data of materialized views is persisted to
+    after every recompute, e.g. the data source manager's. On start, views are
+    restored from it and served while they are refreshed in the background. None
+    to always recompute all views before serving. """
+
+    generation_grace_period: timedelta | None = None
+    """ How long a generation of materialized view data can still be read once a
+    newer one is published, see `GenerationStore`. None to only serve the latest
+    generation. """
+
+    memory_budget: int | None = None
+    """ The estimated size in bytes of the materialized view frames and responses
+    kept in memory. The least recently read frames beyond it are spilled to disk,
+    see `MemoryBudget`. None for no limit. """
+
+    spill_directory: Path | None = None
+    """ The directory frames are spilled to. None for a temporary directory. """
+
+    adaptive_scheduler: AdaptiveScheduler | None = None
+    """ Lowers the refresh frequency of views nobody reads on scheduled passes,
+    see `AdaptiveScheduler`. None to recompute every due view on every pass. """
+
+    cost_model: CostModel = field(default_factory=CostModel)
+    """ Estimates the duration of each view's recompute from the previous ones, to
+    start the critical path first and size the concurrency of recompute passes,
+    see `CostModel`. """
+
+    plan_route: str | None = None
+    """ The admin route the measured recompute plan is served on, see
+    `get_recompute_plan`. None to not serve it. """
+
     _recompute_scheduler: AsyncIOScheduler = field(default_factory=AsyncIOScheduler)
     """ The scheduler that will be used to recompute the materialized views. """
 
@@ -36,19 +214,118 @@ class ViewManager:
     _materialized_views: list[MaterializedView] = field(default_factory=list)
     """ The materialized views that are used in the app. """
 
+    _executor: RecomputeExecutor = field(init=False)
+    """ The executor that runs the recomputation of the dependency graph. """
+
+    _plan: ExecutionPlan | None = None
+    """ The execution plan of the views, compiled whenever a view is added. """
+
+    _started: bool = False
+    """ Whether the manager was started. """
+
+    _recompute_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    """ Lock ensuring recompute passes triggered by different jobs don't overlap. """
+
+    _refresh_task: asyncio.Task | None = None
+    """ The background recompute of views restored from snapshots on start. """
+
+    _single_flight: SingleFlight = field(default_factory=SingleFlight)
+    """ Coalesces identical view calls and recomputes running at the same time. """
+
+    _background_tasks: set[asyncio.Task] = field(default_factory=set)
+    """ Background compressions and refreshes, referenced until they are done. """
+
+    _views_by_id: dict[UUID, BaseView] = field(default_factory=dict)
+    """ All views by ID. """
+
+    _refreshing: set[UUID] = field(default_factory=set)
+    """ The IDs of the lazy views being refreshed in the background. """
+
+    _lazy_upstream: dict[UUID, list[MaterializedView]] = field(default_factory=dict)
+    """ The lazy views each view reads, itself included, in dependency order.
+    Filled as views are requested and cleared whenever the plan is compiled. """
+
+    _generations: GenerationStore = field(init=False)
+    """ The published generations of materialized view data. """
+
+    _memory_budget: MemoryBudget | None = field(init=False)
+    """ Spills frames beyond the memory budget, None if there is no budget. """
+
+    def __post_init__(self) -> None:
+        """Create the recompute executor, generation store and memory budget."""
+        self._executor = RecomputeExecutor(max_concurrency=self.max_concurrency)
+        self._generations = GenerationStore(grace_period=self.generation_grace_period)
+        self._memory_budget = (
+            MemoryBudget(max_bytes=self.memory_budget, directory=self.spill_directory)
+            if self.memory_budget is not None
+            else None
+        )
+        if self.plan_route is not None:
+            self.fastapi_app.get(self.plan_route)(self.get_recompute_plan)
+
     # View Management
 
     def add_view(self, view: View) -> None:
-        """Add a view to the app."""
+        """Add a view to the app.
+
+        ### Raises:
+        - ValueError: If the view introduces a circular dependency, or if one of
+          its dependencies is missing once the manager is started.
+        """
+        self._compile_plan([*self._views, view], self._materialized_views)
         self._views.append(view)
+        self._views_by_id[view.id] = view
         if view.route:
             self._attach_view_to_fastapi(view)
 
     def add_materialized_view(self, view: MaterializedView) -> None:
-        """Add a materialized view to the app."""
+        """Add a materialized view to the app.
+
+        ### Raises:
+        - ValueError: If the view introduces a circular dependency, or if one of
+          its dependencies is missing once the manager is started.
+        """
+        self._compile_plan(self._views, [*self._materialized_views, view])
         self._materialized_views.append(view)
+        self._views_by_id[view.id] = view
+
+        # Carry over data the view already had into the shared store
+        snapshot = view.snapshot
+        view.store = self._generations
+        if snapshot is not None:
+            self._generations.publish({view.id: snapshot})
         if view.route:
             self._attach_materialized_view_to_fastapi(view)
+        if self._started and view.trigger is not None:
+            self._schedule_view(view)
+
+    def _compile_plan(
+        self, views: list[View], materialized_views: list[MaterializedView]
+    ) -> None:
+        """Compile and store the execution plan of the given views.
+
+        Views can be added in any order until the manager is started, so missing
+        dependencies are only rejected from then on.
+
+        ### Raises:
+        - ValueError: If there is a circular dependency or a missing dependency.
+        """
+        plan = ExecutionPlan.compile([*views, *materialized_views])
+        if self._started:
+            plan.validate()
+        self._plan = plan
+        self._lazy_upstream.clear()
+
+    def _get_plan(self) -> ExecutionPlan:
+        """Get the execution plan, checking that all dependencies were added.
+
+        ### Raises:
+        - ValueError: If there is a circular dependency or a missing dependency.
+        """
+        if self._plan is None:
+            self._compile_plan(self._views, self._materialized_views)
+        self._plan.validate()
+        return self._plan
 
     def _get_sorted_views(self) -> list[BaseView]:
         """Get all views sorted by dependency order.
@@ -56,61 +333,483 @@ class ViewManager:
         ### Returns:
         List of views in order of calculation.
         """
-        # Combine all views
-        all_views = self._views + self._materialized_views
+        return self._get_plan().order
 
-        # Create a directed graph
-        graph = rx.PyDiGraph()
+    async def _recompute_materialized_views(
+        self,
+        due: set[UUID] | None = None,
+        *,
+        adaptive: bool = False,
+    ) -> None:
+        """Recompute the materialized views that are out of date.
+
+        A due view is recomputed when it's stale (see `MaterializedView.is_stale`),
+        and any view is recomputed when the data of one of its dependencies
+        changed. A recompute that yields the same content as before doesn't
+        propagate to its dependents.
+
+        Independent branches of the dependency graph are recomputed concurrently
+        and each view starts as soon as its own dependencies are done. Views on the
+        longest path to the end of the pass start first and the concurrency is
+        sized from the CPU use of past recomputes, see `CostModel`. Passes run
+        one at a time, and the views they recompute are published together as a
+        new generation once they are done.
 
-        # Add nodes and store mapping of UUID to node index
-        node_map = {view.id: graph.add_node(view) for view in all_views}
+        Lazy views are only recomputed when due, and are otherwise invalidated
+        when a dependency changed so their next read refreshes them.
+
+        ### Arguments:
+        - due: The IDs of the views that are due for a recompute. None for all
+          eager views.
+        - adaptive: Whether the adaptive scheduler can skip idle views that are
+          out of date, see `AdaptiveScheduler`.
+        """
+        plan = self._get_plan()
+        if due is None:
+            due = {view.id for view in self._materialized_views if not view.is_lazy}
 
-        # Add edges for dependencies
-        for view in all_views:
-            if view.dependencies:
-                for dep_view in view.dependencies:
-                    graph.add_edge(node_map[dep_view], node_map[view.id], None)
+        # Only the due views and what's downstream of them can change
+        subgraph = due.union(*(plan.downstream[view_id] for view_id in due))
 
+        visit = functools.partial(self._visit_view, due, adaptive)
+
+        async with self._recompute_lock:
+            print(f"Running recomputation of {len(due)} due materialized views")
+            priorities = self.cost_model.priorities(plan, subgraph)
+            concurrency = self.cost_model.concurrency(self.max_concurrency)
+            with self._generations.build() as staged:
+                try:
+                    changed = await self._executor.run(
+                        plan,
+                        visit,
+                        subgraph,
+                        priorities=priorities,
+                        max_concurrency=concurrency,
+                    )
+                finally:
+                    # Views recomputed before a failure are published regardless
+                    generation = self._generations.publish(staged)
+            await self.enforce_memory_budget()
+
+        recomputed = [v for v in self._materialized_views if v.id in changed]
+        print(
+            f"{len(recomputed)} materialized views changed, "
+            f"serving generation {generation.id}"
+        )
+
+        # Cached results of views downstream of a change are outdated
+        for view in self._views:
+            if view.cache is not None and view.id in changed:
+                view.cache.clear()
+
+        if self.snapshot_cache is not None:
+            await asyncio.gather(*(self._save_snapshot(view) for view in recomputed))
+
+    async def _visit_view(
+        self,
+        due: set[UUID],
+        adaptive: bool,  # noqa: FBT001
+        view: BaseView,
+        upstream_changed: bool,  # noqa: FBT001
+    ) -> bool:
+        """Recompute a view during a pass if it's out of date.
+
+        ### Arguments:
+        - due: The IDs of the views that are due for a recompute.
+        - adaptive: Whether the adaptive scheduler can skip the view.
+        - view: The view to visit.
+        - upstream_changed: Whether the data of one of its dependencies changed.
+
+        ### Returns:
+        Whether the data of the view changed.
+        """
+        # Plain views are computed on request, so they only relay changes
+        if not isinstance(view, MaterializedView):
+            return upstream_changed
+        if view.is_lazy and view.id not in due:
+            if upstream_changed:
+                view.invalidate()
+            return False
+        scheduler = self.adaptive_scheduler
+        if not upstream_changed and not (view.id in due and view.is_stale):
+            if scheduler is not None and not view.is_stale:
+                scheduler.record_up_to_date(view.id)
+            return False
+
+        # Only views that are out of date can be skipped
+        if (
+            adaptive
+            and scheduler is not None
+            and not scheduler.should_recompute(
+                view.id, view.name or str(view.id), self._get_plan().downstream[view.id]
+            )
+        ):
+            # Recomputed once it's read or its refresh interval elapsed
+            view.invalidate()
+            return False
+
+        print(f"Recomputing {view.name}...")
+        start, cpu_start = time.perf_counter(), time.process_time()
+        changed = await view.recompute_latest_data()
+        seconds = time.perf_counter() - start
+        self.cost_model.record(view.id, seconds, time.process_time() - cpu_start)
+        if scheduler is not None:
+            scheduler.record_recompute(view.id, seconds)
+        if changed:
+            await self._compress_response(view)
+        return changed
+
+    async def _compress_response(self, view: MaterializedView) -> None:
+        """Pre-compress the serialized response of a materialized view.
+
+        ### Arguments:
+        - view: The materialized view to compress the response of.
+        """
+        if not view.route or not self.compression_encodings:
+            return
+        compression = asyncio.to_thread(
+            view.compress_response,
+            self.compression_encodings,
+            self.min_compression_size,
+        )
+        if not self.compress_in_background:
+            await compression
+            return
+        self._start_background(compression, f"Compression of {view.name}")
+
+    def get_cache_stats(self) -> dict[str, dict[str, int]]:
+        """Get the number of entries, hits and misses of each view's result cache.
+
+        ### Returns:
+        The stats of each view with a cache, keyed by name (or ID if unnamed).
+        """
+        return {
+            view.name or str(view.id): view.cache.stats()
+            for view in self._views
+            if view.cache is not None
+        }
+
+    async def _materialize(self, view: BaseView) -> None:
+        """Make sure the lazy materialized views a request reads have data.
+
+        Lazy views without data are computed and waited for. Expired ones are
+        refreshed in the background and served stale in the meantime.
+
+        ### Arguments:
+        - view: The view being read. Its dependencies are materialized first.
+        """
+        lazy_views = self._lazy_upstream.get(view.id)
+        if lazy_views is None:
+            plan = self._get_plan()
+            closure = plan.upstream[view.id] | {view.id}
+            lazy_views = [
+                v
+                for v in plan.order
+                if v.id in closure and isinstance(v, MaterializedView) and v.is_lazy
+            ]
+            self._lazy_upstream[view.id] = lazy_views
+
+        for lazy_view in lazy_views:
+            if lazy_view.snapshot is None:
+                await self._refresh(lazy_view)
+            elif lazy_view.is_expired and lazy_view.id not in self._refreshing:
+                self._refreshing.add(lazy_view.id)
+                self._start_background(
+                    self._refresh_in_background(lazy_view),
+                    f"Refresh of {lazy_view.name}",
+                )
+
+    def _record_hit(self, view: BaseView) -> None:
+        """Record a read of a view for the adaptive scheduler.
+
+        Views the read depends on that were skipped are caught up in the
+        background.
+
+        ### Arguments:
+        - view: The view that was read.
+        """
+        scheduler = self.adaptive_scheduler
+        if scheduler is None:
+            return
+        scheduler.record_hit(view.id)
+        behind = scheduler.skipped_upstream(view.id, self._get_plan().downstream)
+        if not behind:
+            return
+        self._start_background(
+            self.recompute([v for v in self._materialized_views if v.id in behind]),
+            f"Catch-up of views read by {view.name}",
+        )
+
+    def get_schedule_stats(self) -> dict:
+        """Get the decisions of the adaptive scheduler and the CPU time it saved.
+
+        ### Returns:
+        The stats of `AdaptiveScheduler.stats`, empty without a scheduler.
+        """
+        if self.adaptive_scheduler is None:
+            return {}
+        names = {
+            view_id: view.name or str(view_id)
+            for view_id, view in self._views_by_id.items()
+        }
+        return self.adaptive_scheduler.stats(names)
+
+    def get_recompute_plan(self) -> dict:
+        """Get the recompute plan measured from past recomputes.
+
+        ### Returns:
+        The plan of `CostModel.describe`.
+        """
+        return self.cost_model.describe(self._get_plan(), self.max_concurrency)
+
+    async def _refresh(self, view: MaterializedView) -> None:
+        """Recompute a lazy view, sharing the pass with concurrent refreshes."""
+        await self._single_flight.do(
+            ("refresh", view.id),
+            lambda: self._recompute_materialized_views({view.id}),
+        )
+
+    async def _refresh_in_background(self, view: MaterializedView) -> None:
+        """Refresh an expired lazy view, allowing another refresh once it's done."""
         try:
-            # Get topological sort
-            sorted_indices = rx.topological_sort(graph)
-            return [graph[node_idx] for node_idx in sorted_indices]
-        except rx.DAGHasCycle as e:
-            msg = "Circular dependency detected in views"
-            raise ValueError(msg) from e
-
-    async def _recompute_materialized_views(self) -> None:
-        """Recompute all materialized views in dependency order."""
+            await self._refresh(view)
+        finally:
+            self._refreshing.discard(view.id)
+
+    def _start_background(self, coroutine: Coroutine, description: str) -> None:
+        """Run a coroutine in a background task, logging it if it fails.
+
+        The task is referenced until it's done so it isn't garbage collected.
+
+        ### Arguments:
+        - coroutine: The coroutine to run.
+        - description: What the coroutine does, used in the log of failures.
+        """
+        task = asyncio.create_task(coroutine)
+        self._background_tasks.add(task)
+
+        def done(task: asyncio.Task) -> None:
+            self._background_tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                print(f"{description} failed: {task.exception()!r}")
+
+        task.add_done_callback(done)
+
+    async def _refresh_restored_views(self) -> None:
+        """Refresh the views restored from snapshots, retrying failed passes.
+
+        Failures are logged and retried with an exponential backoff until a pass
+        succeeds, so the restored data doesn't silently stop being refreshed.
+        """
+        delay = 1.0
+        while True:
+            try:
+                await self._recompute_materialized_views()
+            except Exception as e:  # noqa: BLE001
+                print(
+                    f"Failed to refresh restored views, retrying in {delay:.0f}s: {e!r}"
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60.0)
+            else:
+                return
+
+    async def enforce_memory_budget(self) -> None:
+        """Spill the least recently read frames that don't fit in the memory budget.
+
+        Called after every recompute pass. Frames read since are loaded back if
+        they fit.
+        """
+        if self._memory_budget is None:
+            return
+        await asyncio.to_thread(
+            self._memory_budget.enforce, self._generations.current.snapshots
+        )
+
+    def get_memory_stats(self) -> dict[str, dict[str, int | bool]]:
+        """Get the estimated size in memory of each materialized view's data.
+
+        ### Returns:
+        The resident size in bytes of each view with data, the size of its JSON
+        responses and whether it's spilled to disk, keyed by name (or ID if
+        unnamed).
+        """
+        snapshots = self._generations.current.snapshots
+        return {
+            view.name or str(view.id): {
+                "resident_bytes": snapshot.resident_size,
+                "response_bytes": snapshot.response_size,
+                "spilled": snapshot.is_spilled,
+            }
+            for view in self._materialized_views
+            if (snapshot := snapshots.get(view.id)) is not None
+        }
+
+    # Snapshots
+
+    @staticmethod
+    def _snapshot_keys(view: MaterializedView) -> tuple[str, str]:
+        """Get the cache keys of the data and update time of a view's snapshot."""
+        key = f"materialized_view:{view.name}"
+        return key, f"{key}:latest_update"
+
+    async def _save_snapshot(self, view: MaterializedView) -> None:
+        """Persist the latest data of a materialized view to the snapshot cache.
+
+        Failures are logged rather than raised as the view itself is up to date.
+
+        ### Arguments:
+        - view: The materialized view to persist.
+        """
+        if view.name is None or view.latest_update is None:
+            return
+        data_key, update_key = self._snapshot_keys(view)
+        try:
+            await self.snapshot_cache.set_data(
+                key=data_key, data=view.latest_data, encoder=view.snapshot_encoder
+            )
+            await self.snapshot_cache.set(
+                update_key, view.latest_update.isoformat().encode("utf-8")
+            )
+        except Exception as e:  # noqa: BLE001
+            print(f"Failed to persist snapshot of {view.name}: {e}")
+
+    async def _load_snapshot(self, view: MaterializedView) -> bool:
+        """Restore a materialized view from the snapshot cache.
+
+        ### Arguments:
+        - view: The materialized view to restore.
+
+        ### Returns:
+        Whether a snapshot was found and restored.
+        """
+        if view.name is None:
+            return False
+        data_key, update_key = self._snapshot_keys(view)
+        try:
+            latest_update = await self.snapshot_cache.get(update_key)
+            if latest_update is None:
+                return False
+            data = await self.snapshot_cache.get_data(
+                key=data_key, encoder=view.snapshot_encoder
+            )
+            if data is None:
+                return False
+            view.restore(data, datetime.fromisoformat(latest_update.decode("utf-8")))
+        except Exception as e:  # noqa: BLE001
+            print(f"Failed to restore snapshot of {view.name}: {e}")
+            return False
+        await self._compress_response(view)
+        return True
+
+    async def _load_snapshots(self) -> bool:
+        """Restore all materialized views from the snapshot cache concurrently.
+
+        ### Returns:
+        Whether every eager materialized view was restored. Lazy views are
+        computed on request, so they are served without a snapshot.
+        """
+        with self._generations.build() as staged:
+            restored = await asyncio.gather(
+                *(self._load_snapshot(view) for view in self._materialized_views)
+            )
+        self._generations.publish(staged)
+        await self.enforce_memory_budget()
         print(
-            f"Running recomputation of {len(self._materialized_views)} materialized views"
+            f"Restored {sum(restored)}/{len(restored)} materialized views from snapshots"
+        )
+        return all(
+            ok
+            for view, ok in zip(self._materialized_views, restored, strict=True)
+            if not view.is_lazy
         )
 
-        materialized_views = [
-            v for v in self._get_sorted_views() if isinstance(v, MaterializedView)
-        ]
+    async def recompute(self, views: list[MaterializedView] | None = None) -> None:
+        """Recompute materialized views on demand.
 
-        print(f"Recomputing {len(materialized_views)} materialized views:")
+        Identical requests made while one is running wait for it rather than
+        queueing another recompute.
 
-        for i, view in enumerate(materialized_views):
-            print(f"{i + 1}. Recomputing {view.name}...")
-            await view.recompute_latest_data()
+        ### Arguments:
+        - views: The views to recompute if stale, along with what changes
+          downstream of them. None for all views.
+        """
+        due = frozenset(
+            view.id
+            for view in (views if views is not None else self._materialized_views)
+        )
+        await self._single_flight.do(
+            ("recompute", due), lambda: self._recompute_materialized_views(set(due))
+        )
 
     # Lifecycle
 
+    def _schedule_view(self, view: MaterializedView) -> None:
+        """Schedule a materialized view with its own trigger to be recomputed.
+
+        ### Arguments:
+        - view: The materialized view to schedule.
+        """
+        self._recompute_scheduler.add_job(
+            self._recompute_scheduled,
+            args=[{view.id}],
+            trigger=view.trigger,
+            id=f"recompute_{view.id}",
+            replace_existing=True,
+        )
+
+    async def _recompute_scheduled(self, due: set[UUID]) -> None:
+        """Recompute views on their trigger, skipping idle ones if adaptive.
+
+        ### Arguments:
+        - due: The IDs of the views whose trigger fired.
+        """
+        await self._recompute_materialized_views(due, adaptive=True)
+
+    async def _recompute_default_views(self) -> None:
+        """Recompute the eager materialized views that don't have their own trigger."""
+        await self._recompute_scheduled(
+            {
+                view.id
+                for view in self._materialized_views
+                if view.trigger is None and not view.is_lazy
+            }
+        )
+
     async def start(self) -> None:
-        """Start the recomputation of materialized views."""
-        # Always recompute all materialized views on startup
-        await self._recompute_materialized_views()
+        """Start the recomputation of materialized views.
 
-        if self.recompute_trigger is None:
+        Views with their own trigger are recomputed on it, and all other views on
+        the manager's `recompute_trigger`.
+
+        ### Raises:
+        - ValueError: If there is a circular dependency or a missing dependency.
+        """
+        self._get_plan()
+        self._started = True
+
+        # Serve restored snapshots right away and refresh them in the background.
+        # Unless all eager views were restored, recompute everything before serving.
+        if self.snapshot_cache is not None and await self._load_snapshots():
+            self._refresh_task = asyncio.create_task(self._refresh_restored_views())
+        else:
+            await self._recompute_materialized_views()
+
+        if self.recompute_trigger is not None:
+            self._recompute_scheduler.add_job(
+                self._recompute_default_views,
+                trigger=self.recompute_trigger,
+                id="recompute_default",
+            )
+        for view in self._materialized_views:
+            if view.trigger is not None:
+                self._schedule_view(view)
+
+        if not self._recompute_scheduler.get_jobs():
             msg = "No recompute trigger set. Data is already computed but won't be updated."
             print(msg)
             return
 
-        self._recompute_scheduler.add_job(
-            self._recompute_materialized_views,
-            trigger=self.recompute_trigger,
-        )
         print("Starting scheduler")
         self._recompute_scheduler.start()
         print(
@@ -119,6 +818,8 @@ class ViewManager:
 
     def stop(self) -> None:
         """Stop the recomputation of materialized views."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
         self._recompute_scheduler.shutdown()
 
     # REST API
@@ -133,14 +834,89 @@ class ViewManager:
         - view: The materialized view to attach to the FastAPI route.
         """
 
-        def view_function() -> view.fastapi_response_model:
-            return view.fastapi_response_model(
-                data=view.latest_data_as_base_model, last_updated=view.latest_update
+        def view_function(  # noqa: PLR0913, PLR0917
+            request: Request,
+            response_format: FormatQuery = None,
+            limit: LimitQuery = None,
+            offset: OffsetQuery = 0,
+            columns: ColumnsQuery = None,
+            filters: FilterQuery = None,
+            sort: SortQuery = None,
+            generation: GenerationQuery = None,
+        ) -> Response:
+            chosen = negotiate_format(response_format, request.headers.get("accept"))
+            query = self._parse_query(view, columns, filters, sort)
+
+            # Everything is read from one generation, even if a newer one is
+            # published in the meantime
+            published = self._get_generation(generation)
+            snapshot = published.snapshots.get(view.id)
+            if snapshot is not None:
+                # Whole responses don't read the data, but keep it warm too
+                snapshot.touch()
+            whole = (
+                query is None
+                and limit is None
+                and offset == 0
+                and not chosen.is_streamed
             )
 
-        self.fastapi_app.get(view.route, response_model=view.fastapi_response_model)(
-            view_function
-        )
+            # Whole JSON responses are pre-compressed on recompute
+            variants = snapshot.compressed_responses if snapshot is not None else {}
+            content_encoding = (
+                choose_encoding(request.headers.get("accept-encoding"), variants)
+                if whole and chosen == ResponseFormat.JSON
+                else None
+            )
+            headers = view.cache_headers(snapshot, chosen, content_encoding)
+            headers[GENERATION_HEADER] = str(published.id)
+
+            # The client's copy is current, so nothing has to be serialized
+            etag = headers.get("ETag")
+            if etag and etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+                )
+
+            # Whole responses are encoded once per recompute
+            if whole:
+                body = (
+                    variants[content_encoding].body
+                    if content_encoding is not None
+                    else view.response_body(snapshot, chosen)
+                )
+                return Response(
+                    content=body, media_type=chosen.media_type, headers=headers
+                )
+            if query is not None:
+                response = self._query_response(
+                    view, snapshot, query, chosen, request, limit, offset
+                )
+                response.headers.update(headers)
+                return response
+            response = self._build_response(
+                view,
+                snapshot.read() if snapshot is not None else None,
+                snapshot.latest_update if snapshot is not None else None,
+                chosen,
+                request,
+                limit,
+                offset,
+            )
+            response.headers.update(headers)
+            return response
+
+        async def materialize() -> None:
+            self._record_hit(view)
+            await self._materialize(view)
+
+        # Runs on the event loop before the endpoint runs in a thread
+        self.fastapi_app.get(
+            view.route,
+            response_model=view.fastapi_response_model,
+            responses=columnar_openapi_responses(),
+            dependencies=[Depends(materialize)],
+        )(view_function)
 
     def _attach_view_to_fastapi(self, view: View) -> None:
         """Attach a view to a FastAPI route.
@@ -152,15 +928,306 @@ class ViewManager:
         async def view_function(
             *args: tuple, **kwargs: dict[str, Any]
         ) -> view.fastapi_response_model:
-            data = await view.function(*args, **kwargs)
-            base_model = view.convert_to_base_model(data) if data is not None else None
-            return view.fastapi_response_model(
-                data=base_model, last_updated=datetime.now(UTC)
+            self._record_hit(view)
+            await self._materialize(view)
+            request: Request = kwargs.pop(REQUEST_PARAMETER)
+            chosen = negotiate_format(
+                kwargs.pop(FORMAT_PARAMETER, None), request.headers.get("accept")
             )
+            limit = kwargs.pop(LIMIT_PARAMETER, None)
+            offset = kwargs.pop(OFFSET_PARAMETER, 0)
+
+            cache = view.cache
+            key = view.cache_key(*args, **kwargs)
+            result = cache.get(key) if cache is not None and key is not None else None
+            if result is None:
+                # Results computed while the cache is cleared aren't kept
+                cache_generation = cache.generation if cache is not None else None
+
+                async def call() -> tuple[Any, int]:
+                    # Materialized views are all read from the same generation
+                    with self._generations.pin() as published:
+                        return await view.call_function(*args, **kwargs), published.id
+
+                # Identical calls in flight share a single call of the function,
+                # and the generation it read
+                data, generation = (
+                    await self._single_flight.do(("view", view.id, key), call)
+                    if key is not None
+                    else await call()
+                )
+                result = CachedViewResult(
+                    data=data,
+                    computed_at=datetime.now(UTC),
+                    generation=generation,
+                    responses={},
+                )
+                if cache is not None and key is not None:
+                    cache.set(key, result, cache_generation)
 
-        # Copy the signature so FastAPI can introspect it properly
-        view_function.__signature__ = inspect.signature(view.function)
+            response_key = (chosen, limit, offset)
+            response = result.responses.get(response_key)
+            if response is None:
+                # Encoding large frames is CPU heavy, so keep it off the event loop
+                response = await asyncio.to_thread(
+                    self._build_response,
+                    view,
+                    result.data,
+                    result.computed_at,
+                    chosen,
+                    request,
+                    limit,
+                    offset,
+                )
+                response.headers[GENERATION_HEADER] = str(result.generation)
+                if cache is not None and key is not None and not chosen.is_streamed:
+                    result.responses[response_key] = response
+            return response
 
-        self.fastapi_app.get(view.route, response_model=view.fastapi_response_model)(
-            view_function
+        # Copy the signature so FastAPI can introspect it properly, adding the
+        # parameters used to negotiate the response format and paginate
+        signature = inspect.signature(view.function)
+        parameters = list(signature.parameters.values())
+        taken = set().union(*(_request_names(parameter) for parameter in parameters))
+        extra_parameters = [
+            inspect.Parameter(
+                REQUEST_PARAMETER, inspect.Parameter.KEYWORD_ONLY, annotation=Request
+            ),
+        ]
+        # Views keep their own parameters of the same name, and the format is then
+        # only negotiated from the Accept header, or the whole result returned
+        reserved_parameters = [
+            inspect.Parameter(
+                FORMAT_PARAMETER,
+                inspect.Parameter.KEYWORD_ONLY,
+                default=None,
+                annotation=FormatQuery,
+            ),
+            inspect.Parameter(
+                LIMIT_PARAMETER,
+                inspect.Parameter.KEYWORD_ONLY,
+                default=None,
+                annotation=LimitQuery,
+            ),
+            inspect.Parameter(
+                OFFSET_PARAMETER,
+                inspect.Parameter.KEYWORD_ONLY,
+                default=0,
+                annotation=OffsetQuery,
+            ),
+        ]
+        extra_parameters += [
+            parameter
+            for parameter in reserved_parameters
+            if taken.isdisjoint(_request_names(parameter))
+        ]
+        # Keyword-only parameters have to come before any **kwargs
+        insert_at = next(
+            (
+                index
+                for index, parameter in enumerate(parameters)
+                if parameter.kind == inspect.Parameter.VAR_KEYWORD
+            ),
+            len(parameters),
         )
+        parameters[insert_at:insert_at] = extra_parameters
+        view_function.__signature__ = signature.replace(parameters=parameters)
+
+        self.fastapi_app.get(
+            view.route,
+            response_model=view.fastapi_response_model,
+            responses=columnar_openapi_responses(),
+        )(view_function)
+
+    def _get_generation(self, generation_id: int | None) -> Generation:
+        """Get the generation a request to a materialized view endpoint reads.
+
+        ### Arguments:
+        - generation_id: The `generation=` query parameter, None for the current
+          generation.
+
+        ### Returns:
+        The generation.
+
+        ### Raises:
+        - HTTPException: 410 if the generation is no longer available.
+        """
+        if generation_id is None:
+            return self._generations.current
+        generation = self._generations.get(generation_id)
+        if generation is None:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail=f"Generation {generation_id} is no longer available",
+            )
+        return generation
+
+    @staticmethod
+    def _parse_query(
+        view: MaterializedView,
+        columns: str | None,
+        filters: list[str] | None,
+        sort: str | None,
+    ) -> ViewQuery | None:
+        """Parse the query of a request to a materialized view endpoint.
+
+        ### Returns:
+        The query, or None if the request has none.
+
+        ### Raises:
+        - HTTPException: 406 if the view doesn't return DataFrames, 400 if the
+          query is invalid.
+        """
+        if columns is None and not filters and sort is None:
+            return None
+        if view.dataframe_model is None:
+            raise HTTPException(
+                status_code=status.HTTP_406_NOT_ACCEPTABLE,
+                detail="Queries are only available for DataFrames",
+            )
+        base_model, _ = view.base_model
+        try:
+            return ViewQuery.parse(base_model, columns, filters, sort)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            ) from e
+
+    def _query_response(  # noqa: PLR0913, PLR0917
+        self,
+        view: MaterializedView,
+        snapshot: MaterializedSnapshot | None,
+        query: ViewQuery,
+        response_format: ResponseFormat,
+        request: Request,
+        limit: int | None,
+        offset: int,
+    ) -> Response:
+        """Run a query over a snapshot of a materialized view.
+
+        The query runs as a lazy Polars plan, so only the rows and columns of the
+        result are materialized and serialized. Results are cached with the
+        snapshot, except for streamed ones.
+
+        ### Arguments:
+        - view: The materialized view to query.
+        - snapshot: The snapshot to query, None if the view has no data yet.
+        - query: The query to run.
+        - response_format: The format of the response.
+        - request: The request being answered.
+        - limit: The maximum number of rows to return, None for all.
+        - offset: The number of rows to skip.
+
+        ### Returns:
+        The response. The next page, if any, is returned in the `Link` header.
+
+        ### Raises:
+        - HTTPException: 503 if there is no data yet, 400 if the query can't run on
+          the data.
+        """
+        media_type = response_format.media_type
+        key = (query, response_format, limit, offset)
+        # Spilled frames are scanned from disk rather than loaded back
+        frame = snapshot.scan() if snapshot is not None else None
+        if frame is None:
+            # Raises the error for missing or non-tabular data
+            require_frame(snapshot.data if snapshot is not None else None, "Queries")
+        results = snapshot.query_results
+        cached = None if response_format.is_streamed else results.get(key)
+        if cached is not None:
+            body, headers = cached
+            return Response(content=body, media_type=media_type, headers=headers)
+
+        # Only the model's columns are exposed, as in unqueried responses. Fetch
+        # one more row than the limit to know if there is a next page.
+        plan = query.apply(frame.select(view.model_columns))
+        try:
+            page = plan.slice(
+                offset, limit + 1 if limit is not None else None
+            ).collect()
+        except QUERY_ERRORS as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid query: {e}"
+            ) from e
+        headers = {}
+        if limit is not None and page.height > limit:
+            page = page.head(limit)
+            next_url = request.url.include_query_params(
+                offset=offset + limit, limit=limit
+            )
+            headers["Link"] = f'<{next_url}>; rel="next"'
+
+        if response_format.is_streamed:
+            return StreamingResponse(
+                iter_ndjson(page, self.stream_chunk_rows),
+                media_type=media_type,
+                headers=headers,
+            )
+        if response_format.is_columnar:
+            body = encode_frame(page, response_format)
+        else:
+            body = view.serialize_rows_response(page, snapshot.latest_update)
+        results.set(key, (body, headers))
+        return Response(content=body, media_type=media_type, headers=headers)
+
+    def _build_response(  # noqa: PLR0913, PLR0917
+        self,
+        view: BaseView,
+        data: DataModelType | None,
+        last_updated: datetime | None,
+        response_format: ResponseFormat,
+        request: Request,
+        limit: int | None,
+        offset: int,
+    ) -> Response:
+        """Build the response of a view endpoint.
+
+        Pages are sliced from the frame without copying it. The total number of
+        rows is returned in the `X-Total-Count` header and the next page, if any,
+        in the `Link` header. NDJSON is streamed `stream_chunk_rows` at a time.
+
+        ### Arguments:
+        - view: The view the data is from.
+        - data: The data of the view.
+        - last_updated: The time the data was last updated at.
+        - response_format: The format of the response.
+        - request: The request being answered.
+        - limit: The maximum number of rows to return, None for all.
+        - offset: The number of rows to skip.
+
+        ### Returns:
+        The response.
+
+        ### Raises:
+        - HTTPException: If the data has to be a frame but isn't, or is missing.
+        """
+        media_type = response_format.media_type
+        paginated = limit is not None or offset > 0
+        if not paginated and not response_format.is_streamed:
+            if response_format.is_columnar:
+                body = view.encode_columnar_response(data, response_format)
+            else:
+                body = view.serialize_response(data, last_updated)
+            return Response(content=body, media_type=media_type)
+
+        feature = "Pagination" if paginated else f"Format {response_format.value}"
+        frame = require_frame(data, feature)
+        page = frame.slice(offset, limit)
+        headers = {"X-Total-Count": str(frame.height)}
+        if limit is not None and offset + limit < frame.height:
+            next_url = request.url.include_query_params(
+                offset=offset + limit, limit=limit
+            )
+            headers["Link"] = f'<{next_url}>; rel="next"'
+
+        if response_format.is_streamed:
+            return StreamingResponse(
+                view.stream_ndjson(page, self.stream_chunk_rows),
+                media_type=media_type,
+                headers=headers,
+            )
+        if response_format.is_columnar:
+            body = encode_frame(view.prepare_frame(page), response_format)
+        else:
+            body = view.serialize_response(page, last_updated)
+        return Response(content=body, media_type=media_type, headers=headers)
@@ -1,7 +1,10 @@
 """Materialized and normal views that can be used to query cached data."""
 
 from tacobi.view.view_models.base import BaseView
-from tacobi.view.view_models.materialized import MaterializedView
+from tacobi.view.view_models.materialized import (
+    MaterializationMode,
+    MaterializedView,
+)
 from tacobi.view.view_models.view import View
 
-__all__ = ["BaseView", "MaterializedView", "View"]
+__all__ = ["BaseView", "MaterializationMode", "MaterializedView", "View"]
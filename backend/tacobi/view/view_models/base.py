@@ -1,16 +1,27 @@
 """Base view class."""
 
-from collections.abc import Awaitable, Callable
+import inspect
+from collections.abc import Awaitable, Callable, Iterator
 from dataclasses import dataclass, field
+from datetime import datetime
 from functools import cached_property
 from typing import Generic
 from uuid import UUID, uuid4
 
+import polars as pl
 from pandera.polars import DataFrameModel
 from pandera.typing.polars import DataFrame
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 from tacobi.data_model.models import DataModelType
+from tacobi.execution import DEFAULT_EXECUTORS, ExecutionMode, Executors
+from tacobi.view.response_formats import (
+    ResponseFormat,
+    encode_frame,
+    iter_ndjson,
+    require_frame,
+    to_polars_frame,
+)
 from tacobi.view.type_utils import (
     extract_container_type,
     extract_model_from_typehints,
@@ -21,6 +32,9 @@ from tacobi.view.view_models.endpoint_model import (
     create_column_base_model_from_dataframe_model,
 )
 
+_LAST_UPDATED_ADAPTER = TypeAdapter(datetime | None)
+"""Serializes the `last_updated` field of responses like the response model."""
+
 
 @dataclass
 class BaseView(Generic[DataModelType]):
@@ -41,6 +55,12 @@ class BaseView(Generic[DataModelType]):
     id: UUID = field(default_factory=uuid4)
     """The unique identifier for the view."""
 
+    execution_mode: ExecutionMode = ExecutionMode.LOOP
+    """Where the function of the view runs. See `ExecutionMode`."""
+
+    executors: Executors = field(default=DEFAULT_EXECUTORS, repr=False)
+    """The pools the function runs in when it isn't run on the event loop."""
+
     def __str__(self) -> str:
         """Get the string representation of the view."""
         return f"View(name={self.name}, id={self.id})"
@@ -49,6 +69,12 @@ class BaseView(Generic[DataModelType]):
         """Hash the view."""
         return hash(self.id)
 
+    async def call_function(self, *args: object, **kwargs: object) -> DataModelType:
+        """Call the function of the view in its execution mode."""
+        return await self.executors.run(
+            self.execution_mode, self.function, *args, **kwargs
+        )
+
     # =====================================================
     # Pydantic BaseModel conversion
     # =====================================================
@@ -58,6 +84,20 @@ class BaseView(Generic[DataModelType]):
         """The return type of the view."""
         return extract_return_type(self.function)
 
+    @cached_property
+    def dataframe_model(self) -> type[DataFrameModel] | None:
+        """The DataFrameModel of the view, None if it returns a BaseModel."""
+        # If it's a BaseModel, there is no DataFrameModel
+        if inspect.isclass(self.return_type) and issubclass(
+            self.return_type, BaseModel
+        ):
+            return None
+
+        container_type = extract_container_type(self.return_type, DataFrame)
+        return extract_model_from_typehints(
+            self.function, container_type, DataFrameModel
+        )
+
     @cached_property
     def base_model(self) -> tuple[type[BaseModel], bool]:
         """The base model of the view and whether it's a list (aka a DataFrameModel).
@@ -66,16 +106,17 @@ class BaseView(Generic[DataModelType]):
         A tuple of the base model and a boolean indicating whether it's a list.
         """
         # If it's already a BaseModel, we can return it directly
-        if issubclass(self.return_type, BaseModel):
+        if self.dataframe_model is None:
             return self.return_type, False
 
         # Otherwise, it's a DataFrameModel, so we need to wrap it in a list
-        container_type = extract_container_type(self.return_type, DataFrame)
-        model = extract_model_from_typehints(
-            self.function, container_type, DataFrameModel
-        )
+        return create_column_base_model_from_dataframe_model(self.dataframe_model), True
 
-        return create_column_base_model_from_dataframe_model(model), True
+    @cached_property
+    def model_columns(self) -> list[str]:
+        """The columns of the view's data returned by its endpoint."""
+        base_model, _ = self.base_model
+        return list(base_model.model_fields)
 
     @cached_property
     def fastapi_response_model(self) -> type[ViewEndpointResponseModel]:
@@ -113,3 +154,107 @@ class BaseView(Generic[DataModelType]):
             records = data.to_dict("records")
 
         return [base_model_class(**row) for row in records]
+
+    def serialize_response(
+        self, data: DataModelType | None, last_updated: datetime | None
+    ) -> bytes:
+        """Serialize data into the JSON body returned by the view's endpoint.
+
+        ### Arguments:
+        - data: The data to serialize, or None if there is no data yet.
+        - last_updated: The time the data was last updated at.
+
+        DataFrames are validated against the view's DataFrameModel once and
+        written as JSON column-wise by Polars, instead of going through a BaseModel
+        per row. The body matches the view's `fastapi_response_model` either way.
+
+        ### Returns:
+        The JSON encoded response body.
+        """
+        frame = to_polars_frame(data) if self.dataframe_model is not None else None
+        if frame is not None:
+            return self.serialize_rows_response(self.prepare_frame(frame), last_updated)
+
+        base_model = self.convert_to_base_model(data) if data is not None else None
+        response = self.fastapi_response_model(
+            data=base_model, last_updated=last_updated
+        )
+        return response.model_dump_json().encode("utf-8")
+
+    def prepare_frame(self, frame: pl.DataFrame) -> pl.DataFrame:
+        """Validate a frame and keep the columns of the view's BaseModel.
+
+        ### Arguments:
+        - frame: The frame to prepare.
+
+        ### Returns:
+        The frame as it's returned by the view's endpoint.
+
+        ### Raises:
+        - pandera.errors.SchemaError: If the frame doesn't match the DataFrameModel.
+        """
+        if self.dataframe_model is None:
+            return frame
+        frame = self.dataframe_model.validate(frame)
+        return frame.select(self.model_columns)
+
+    def encode_columnar_response(
+        self, data: DataModelType | None, response_format: ResponseFormat
+    ) -> bytes:
+        """Encode data in a columnar format, with the columns of the JSON response.
+
+        ### Arguments:
+        - data: The data to encode, or None if there is no data yet.
+        - response_format: The columnar format to encode the data in.
+
+        ### Returns:
+        The encoded data.
+
+        ### Raises:
+        - HTTPException: 503 if there is no data yet, 406 if the data isn't tabular.
+        """
+        frame = require_frame(data, f"Format {response_format.value}")
+        return encode_frame(self.prepare_frame(frame), response_format)
+
+    @staticmethod
+    def serialize_rows_response(
+        frame: pl.DataFrame, last_updated: datetime | None
+    ) -> bytes:
+        """Serialize a frame into the JSON body of an endpoint as is.
+
+        The frame isn't validated, e.g. because it's the result of a query over
+        data that already was, so it may only have some of the model's columns.
+
+        ### Arguments:
+        - frame: The frame to serialize.
+        - last_updated: The time the data was last updated at.
+
+        ### Returns:
+        The JSON encoded response body.
+        """
+        return b"".join(
+            (
+                b'{"last_updated":',
+                _LAST_UPDATED_ADAPTER.dump_json(last_updated),
+                b',"data":',
+                frame.write_json().encode("utf-8"),
+                b"}",
+            )
+        )
+
+    def stream_ndjson(self, frame: pl.DataFrame, chunk_rows: int) -> Iterator[bytes]:
+        """Serialize a frame as NDJSON, one chunk of rows at a time.
+
+        Only one chunk is serialized at once, so memory use is bounded by the chunk
+        size rather than the size of the frame.
+
+        ### Arguments:
+        - frame: The frame to serialize.
+        - chunk_rows: The number of rows per chunk.
+
+        ### Returns:
+        An iterator over the serialized chunks.
+        """
+        for offset in range(0, frame.height, chunk_rows):
+            chunk = self.prepare_frame(frame.slice(offset, chunk_rows))
+            yield from iter_ndjson(chunk, chunk_rows)
@@ -1,16 +1,45 @@
 """Materialized views."""
 
-from collections.abc import Awaitable, Callable
-from dataclasses import dataclass
-from datetime import UTC, datetime
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field, replace
+from datetime import UTC, datetime, timedelta
+from enum import Enum
+from functools import cached_property
 from typing import Generic
 
+from apscheduler.triggers.base import BaseTrigger
 from pydantic import BaseModel
 
 from tacobi.data_model.models import DataModelType
+from tacobi.data_source import CachedDataSource
+from tacobi.data_source.encode import Encoder, encoder_for_type
+from tacobi.view.compression import (
+    CompressedVariant,
+    ContentEncoding,
+    compress_variants,
+)
+from tacobi.view.conditional import format_http_date
+from tacobi.view.fingerprint import fingerprint
+from tacobi.view.generation import GenerationStore, MaterializedSnapshot
+from tacobi.view.response_formats import ResponseFormat
+from tacobi.view.result_cache import ResultCache
 from tacobi.view.view_models.base import BaseView
 
 
+class MaterializationMode(str, Enum):
+    """When a materialized view is computed.
+
+    - `eager`: On every recompute pass it's due for, whether it's read or not.
+    - `lazy`: On first read, after which it's served stale until its TTL expires
+      or a dependency changes. The next read then refreshes it in the background
+      while still being served the stale data.
+    """
+
+    EAGER = "eager"
+    LAZY = "lazy"
+
+
 @dataclass
 class MaterializedView(BaseView, Generic[DataModelType]):
     """A materialized view."""
@@ -18,16 +47,105 @@ class MaterializedView(BaseView, Generic[DataModelType]):
     function: Callable[[], Awaitable[DataModelType]]
     """The function to call to update the view."""
 
-    latest_update: datetime | None = None
-    """The latest update of the view."""
+    data_sources: list[CachedDataSource] | None = None
+    """The data sources read by the view.
+
+    The view is only recomputed when one of them changed or when a dependency was
+    recomputed. None if undeclared, in which case it's recomputed on every pass.
+    """
+
+    trigger: BaseTrigger | None = None
+    """The trigger used to recompute the view. None to recompute it on the view
+    manager's `recompute_trigger`."""
+
+    materialization: MaterializationMode = MaterializationMode.EAGER
+    """When the view is computed. See `MaterializationMode`."""
+
+    ttl: timedelta | None = None
+    """How long the data of a lazy view is served before it's refreshed. None to
+    only refresh it when a dependency changed."""
+
+    cache_max_age: timedelta | None = None
+    """How long clients may reuse a response without revalidating it, sent as the
+    `Cache-Control` max-age. None to have them revalidate every time."""
+
+    query_cache_size: int = 32
+    """The number of query results kept per recompute, see `ViewQuery`."""
+
+    encoder: Encoder | None = None
+    """The encoder used to persist snapshots of the latest data. If not provided,
+    it's determined from the return type of the function."""
 
-    latest_data: DataModelType | None = None
-    """The latest data from the view."""
+    store: GenerationStore = field(default_factory=GenerationStore, repr=False)
+    """The store the snapshots of the view's data are published to, shared by all
+    materialized views of a view manager."""
 
     def __str__(self) -> str:
         """Get the string representation of the view."""
         return f"MaterializedView(name={self.name}, id={self.id})"
 
+    @property
+    def snapshot(self) -> MaterializedSnapshot | None:
+        """The latest snapshot of the view, None if it has no data yet.
+
+        Within a recompute pass, that's the snapshot staged by the pass.
+        """
+        return self.store.snapshot(self.id)
+
+    @property
+    def is_lazy(self) -> bool:
+        """Whether the view is computed on demand rather than on every pass."""
+        return self.materialization == MaterializationMode.LAZY
+
+    @property
+    def is_expired(self) -> bool:
+        """Whether the data is missing, outlived its TTL or a dependency changed."""
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.invalidated:
+            return True
+        return (
+            self.ttl is not None
+            and time.monotonic() - snapshot.refreshed_at >= self.ttl.total_seconds()
+        )
+
+    def invalidate(self) -> None:
+        """Mark the data as outdated, so a lazy view is refreshed on its next read."""
+        snapshot = self.snapshot
+        if snapshot is not None:
+            snapshot.invalidated = True
+
+    @property
+    def latest_update(self) -> datetime | None:
+        """The time the content of the latest data last changed."""
+        snapshot = self.snapshot
+        return snapshot.latest_update if snapshot is not None else None
+
+    @property
+    def latest_data(self) -> DataModelType | None:
+        """The latest data from the view."""
+        snapshot = self.snapshot
+        return snapshot.read() if snapshot is not None else None
+
+    @property
+    def latest_response(self) -> bytes | None:
+        """The latest data serialized as the JSON body of the view's endpoint.
+
+        Only produced for views with a route, once per recompute, so that requests
+        don't have to convert and serialize the data again.
+        """
+        snapshot = self.snapshot
+        return snapshot.response if snapshot is not None else None
+
+    @property
+    def latest_compressed_responses(self) -> dict[ContentEncoding, CompressedVariant]:
+        """The latest serialized response compressed with each encoding.
+
+        Each variant comes with its size and compression time. Empty until
+        `compress_response` is called.
+        """
+        snapshot = self.snapshot
+        return snapshot.compressed_responses if snapshot is not None else {}
+
     @property
     def latest_data_as_base_model(self) -> BaseModel | list[BaseModel] | None:
         """Get the latest data from the view as a BaseModel.
@@ -41,10 +159,223 @@ class MaterializedView(BaseView, Generic[DataModelType]):
             else None
         )
 
-    async def recompute_latest_data(self) -> None:
-        """Recompute the latest data from the view."""
-        self.latest_data = await self.function()
-        self.latest_update = datetime.now(UTC)
+    @property
+    def is_stale(self) -> bool:
+        """Whether the view needs recomputing regardless of its dependencies.
+
+        That is when it was never computed, when its data sources are undeclared, or
+        when one of them changed since the last recompute. Views invalidated by a
+        skipped recompute are stale too, and so are lazy views once expired.
+        """
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.invalidated or self.data_sources is None:
+            return True
+        if self.is_lazy and self.is_expired:
+            return True
+        return any(
+            snapshot.data_source_versions.get(data_source.name) != data_source.version
+            for data_source in self.data_sources
+        )
+
+    @cached_property
+    def snapshot_encoder(self) -> Encoder:
+        """The encoder used to persist snapshots of the latest data.
+
+        ### Raises:
+        - RuntimeError: If no encoder was provided and none supports the return type.
+        """
+        return self.encoder or encoder_for_type(self.return_type)
+
+    def _new_snapshot(
+        self,
+        data: DataModelType,
+        latest_update: datetime,
+        versions: dict[str, int],
+        data_fingerprint: str | None,
+    ) -> MaterializedSnapshot:
+        """Create a snapshot of new data, serializing it if the view has a route."""
+        return MaterializedSnapshot(
+            data=data,
+            latest_update=latest_update,
+            fingerprint=data_fingerprint,
+            data_source_versions=versions,
+            response=(
+                self.serialize_response(data, latest_update) if self.route else None
+            ),
+            query_results=ResultCache(max_entries=self.query_cache_size),
+        )
+
+    def restore(self, data: DataModelType, latest_update: datetime) -> None:
+        """Restore the latest data from a persisted snapshot.
+
+        The data sources the snapshot was computed from are unknown, so the view
+        stays stale until it's recomputed.
+
+        ### Arguments:
+        - data: The data of the snapshot.
+        - latest_update: The time the snapshot's data was last updated at.
+        """
+        self.store.stage(
+            self.id, self._new_snapshot(data, latest_update, {}, fingerprint(data))
+        )
+
+    async def recompute_latest_data(self) -> bool:
+        """Recompute the latest data from the view.
+
+        The new snapshot is staged in the generation being built, see
+        `GenerationStore`. If the new data has the same content as before,
+        `latest_update` and the serialized responses are carried over.
+
+        ### Returns:
+        Whether the content of the data changed.
+        """
+        # Read the versions first so changes made during the recompute aren't missed
+        versions = {ds.name: ds.version for ds in self.data_sources or []}
+        data = await self.call_function()
+        previous = self.snapshot
+        new_fingerprint = fingerprint(data)
+        if (
+            previous is not None
+            and new_fingerprint is not None
+            and new_fingerprint == previous.fingerprint
+        ):
+            self.store.stage(
+                self.id, replace(previous, data=data, data_source_versions=versions)
+            )
+            return False
+
+        self.store.stage(
+            self.id,
+            self._new_snapshot(data, datetime.now(UTC), versions, new_fingerprint),
+        )
+        return True
+
+    @property
+    def query_results(self) -> ResultCache:
+        """The cache of query results over the latest data."""
+        snapshot = self.snapshot
+        if snapshot is None:
+            return ResultCache(max_entries=0)
+        return snapshot.query_results
+
+    def compress_response(
+        self, encodings: Iterable[ContentEncoding], min_size: int = 0
+    ) -> None:
+        """Compress the latest serialized response with each of the given encodings.
+
+        Blocking, so it's meant to run in a thread. The variants are attached to
+        the snapshot they were compressed from.
+
+        ### Arguments:
+        - encodings: The encodings to compress the response with.
+        - min_size: The size in bytes below which responses aren't compressed.
+        """
+        snapshot = self.snapshot
+        body = snapshot.response if snapshot is not None else None
+        if body is None or len(body) < min_size:
+            return
+        variants = compress_variants(body, encodings)
+        snapshot.compressed_responses = variants
+
+        summary = ", ".join(
+            f"{encoding.value} {variant.ratio:.0%} in {variant.seconds * 1000:.0f}ms"
+            for encoding, variant in variants.items()
+        )
+        print(f"Compressed {self.name} ({len(body)} bytes): {summary}")
+
+    @staticmethod
+    def etag(
+        snapshot: MaterializedSnapshot | None,
+        response_format: ResponseFormat,
+        content_encoding: ContentEncoding | None = None,
+    ) -> str | None:
+        """Get the entity tag of a snapshot's data in the given format.
+
+        It's the content fingerprint if there is one, and the time of the latest
+        update otherwise, so it changes exactly when the data does.
+
+        ### Arguments:
+        - snapshot: The snapshot to get the tag of, None if the view has no data.
+        - response_format: The format of the response.
+        - content_encoding: The encoding the response is compressed with, if any.
+
+        ### Returns:
+        The quoted entity tag, or None if there is no data yet.
+        """
+        if snapshot is None:
+            return None
+        version = snapshot.fingerprint or f"{snapshot.latest_update.timestamp():.6f}"
+        suffix = f"-{content_encoding.value}" if content_encoding else ""
+        return f'"{version}-{response_format.value}{suffix}"'
+
+    def cache_headers(
+        self,
+        snapshot: MaterializedSnapshot | None,
+        response_format: ResponseFormat,
+        content_encoding: ContentEncoding | None = None,
+    ) -> dict[str, str]:
+        """Get the HTTP caching headers of responses in the given format.
+
+        ### Arguments:
+        - snapshot: The snapshot the response is from, None if the view has no
+          data.
+        - response_format: The format of the response.
+        - content_encoding: The encoding the response is compressed with, if any.
+
+        ### Returns:
+        The `Cache-Control`, `Vary`, `Content-Encoding` if compressed and, once
+        there is data, `ETag` and `Last-Modified` headers.
+        """
+        max_age = self.cache_max_age
+        headers = {
+            "Cache-Control": (
+                f"max-age={int(max_age.total_seconds())}"
+                if max_age is not None
+                else "no-cache"
+            ),
+            "Vary": "Accept, Accept-Encoding",
+        }
+        if content_encoding is not None:
+            headers["Content-Encoding"] = content_encoding.value
+        etag = self.etag(snapshot, response_format, content_encoding)
+        if etag is not None:
+            headers["ETag"] = etag
+            headers["Last-Modified"] = format_http_date(snapshot.latest_update)
+        return headers
+
+    def response_body(
+        self,
+        snapshot: MaterializedSnapshot | None,
+        response_format: ResponseFormat,
+    ) -> bytes:
+        """Get the body of a response with a snapshot's data in the given format.
+
+        Bodies are encoded at most once per snapshot.
+
+        ### Arguments:
+        - snapshot: The snapshot to get the body of, None if the view has no data.
+        - response_format: The format of the response.
+
+        ### Returns:
+        The response body.
+
+        ### Raises:
+        - HTTPException: If the data can't be returned in a columnar format.
+        """
+        if response_format == ResponseFormat.JSON:
+            if snapshot is None:
+                return self.serialize_response(None, None)
+            if snapshot.response is not None:
+                return snapshot.response
+            return self.serialize_response(snapshot.read(), snapshot.latest_update)
+        if snapshot is None:
+            return self.encode_columnar_response(None, response_format)
+
+        body = snapshot.columnar_responses.get(response_format)
+        if body is None:
+            body = self.encode_columnar_response(snapshot.read(), response_format)
+            snapshot.columnar_responses[response_format] = body
+        return body
 
     def __hash__(self) -> int:
         """Hash the view."""
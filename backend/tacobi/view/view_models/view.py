@@ -1,12 +1,62 @@
 """Views."""
 
+import inspect
+from collections.abc import Hashable
 from dataclasses import dataclass
-from typing import Generic
+from datetime import datetime
+from typing import Any, Generic
 
 from tacobi.data_model.models import DataModelType
+from tacobi.view.result_cache import ResultCache
 from tacobi.view.view_models.base import BaseView
 
 
+@dataclass
+class CachedViewResult(Generic[DataModelType]):
+    """The result of a view for some parameters, kept in the view's cache."""
+
+    data: DataModelType
+    """The data returned by the view's function."""
+
+    computed_at: datetime
+    """The time the data was computed at."""
+
+    generation: int
+    """The generation of materialized view data the data was computed from."""
+
+    responses: dict[Hashable, Any]
+    """The responses built from the data, keyed on how they were built."""
+
+
 @dataclass
 class View(BaseView, Generic[DataModelType]):
     """A standard view."""
+
+    cache: ResultCache[Hashable, CachedViewResult] | None = None
+    """The cache of the view's results keyed on their parameters, cleared whenever
+    one of its dependencies is recomputed. None to call the function every time."""
+
+    def cache_key(self, *args: object, **kwargs: object) -> Hashable | None:
+        """Get the key of the results of a call to the view's function.
+
+        Parameters are normalized, so calls passing the same values positionally,
+        by keyword or through defaults share their key.
+
+        ### Arguments:
+        - args: The positional arguments of the call.
+        - kwargs: The keyword arguments of the call.
+
+        ### Returns:
+        The key, or None if an argument can't be hashed.
+        """
+        bound = inspect.signature(self.function).bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = tuple(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in sorted(bound.arguments.items())
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
@@ -0,0 +1,127 @@
+"""Tests for running view and data source functions off the event loop."""
+
+import os
+import threading
+from pathlib import Path
+
+import polars as pl
+import pytest
+from apscheduler.triggers.interval import IntervalTrigger
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from tacobi.bi_app import TacoBIApp
+from tacobi.data_source import DataSourceManager, SQLiteCache
+from tacobi.execution import ExecutionMode, Executors
+from tacobi.view import ViewManager
+
+
+class WorkerModel(BaseModel):
+    """Where a function ran."""
+
+    pid: int
+    thread: str
+
+
+async def worker_frame(rows: int) -> pl.DataFrame:
+    """Build a frame in the worker, recording its process ID."""
+    return pl.DataFrame({"value": range(rows), "pid": [os.getpid()] * rows})
+
+
+async def worker_lazy_frame(rows: int) -> pl.LazyFrame:
+    """Build a lazy frame in the worker."""
+    return pl.LazyFrame({"value": range(rows)})
+
+
+def worker_model() -> WorkerModel:
+    """Record where the function ran, without a coroutine."""
+    return WorkerModel(pid=os.getpid(), thread=threading.current_thread().name)
+
+
+@pytest.mark.asyncio
+async def test_run_in_thread() -> None:
+    """Test that thread mode runs coroutine functions in the thread pool."""
+    executors = Executors(thread_workers=2)
+
+    async def where() -> str:
+        return threading.current_thread().name
+
+    thread = await executors.run(ExecutionMode.THREAD, where)
+    assert thread.startswith("tacobi-worker")
+    assert executors.thread_pool._max_workers == 2  # noqa: PLR2004
+    assert await executors.run(ExecutionMode.LOOP, where) == "MainThread"
+    executors.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_in_process() -> None:
+    """Test that process mode returns frames through Arrow IPC buffers."""
+    executors = Executors(process_workers=1)
+
+    frame = await executors.run(ExecutionMode.PROCESS, worker_frame, 3)
+    assert isinstance(frame, pl.DataFrame)
+    assert frame["value"].to_list() == [0, 1, 2]
+    assert frame["pid"][0] != os.getpid()
+
+    lazy_frame = await executors.run(ExecutionMode.PROCESS, worker_lazy_frame, rows=2)
+    assert isinstance(lazy_frame, pl.LazyFrame)
+    assert lazy_frame.collect()["value"].to_list() == [0, 1]
+
+    model = await executors.run(ExecutionMode.PROCESS, worker_model)
+    assert model.pid != os.getpid()
+    executors.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_local_function_in_process() -> None:
+    """Test that functions process workers can't import are rejected."""
+    executors = Executors()
+
+    async def local() -> int:
+        return 1
+
+    with pytest.raises(ValueError, match="must be defined at module level"):
+        await executors.run(ExecutionMode.PROCESS, local)
+
+
+@pytest.mark.asyncio
+async def test_execution_mode_declarations(
+    fastapi_app: FastAPI, tmp_path: Path
+) -> None:
+    """Test declaring the execution mode of views and data sources."""
+    app = TacoBIApp(
+        view_manager=ViewManager(
+            recompute_trigger=IntervalTrigger(hours=1), fastapi_app=fastapi_app
+        ),
+        data_source_manager=DataSourceManager(
+            cache_backend=SQLiteCache(db_path=tmp_path / "cache.db")
+        ),
+        executors=Executors(thread_workers=1),
+    )
+
+    @app.data_source(
+        name="source",
+        trigger=IntervalTrigger(hours=1),
+        execution_mode=ExecutionMode.THREAD,
+    )
+    async def source(_current: WorkerModel | None) -> WorkerModel:
+        return worker_model()
+
+    @app.materialized_view(execution_mode=ExecutionMode.THREAD)
+    async def materialized() -> WorkerModel:
+        return worker_model()
+
+    @app.view(execution_mode=ExecutionMode.THREAD)
+    async def view() -> WorkerModel:
+        return worker_model()
+
+    assert view is not None
+
+    await app.data_source_manager.get_data_source("source").update()
+    await app.view_manager._recompute_materialized_views()
+    view_result = await app.view_manager._views[0].call_function()
+
+    for result in (source(), materialized(), view_result):
+        assert result.thread.startswith("tacobi-worker")
+    assert app.executors._thread_pool is not None
+    app.executors.shutdown()
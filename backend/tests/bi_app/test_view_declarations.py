@@ -1,12 +1,19 @@
 """Tests for view declarations using decorators."""
 
+from datetime import timedelta
+from pathlib import Path
+
+import polars as pl
 import pytest
 from apscheduler.triggers.interval import IntervalTrigger
 from fastapi import FastAPI
+from fastapi.testclient import TestClient
 from pydantic import BaseModel
 
 from tacobi.bi_app import TacoBIApp
-from tacobi.view import ViewManager
+from tacobi.data_source import DataSourceManager, SQLiteCache
+from tacobi.data_source.encode import IPCEncoder, PolarsEncoder
+from tacobi.view import MaterializationMode, ViewManager
 
 
 class MockDataModel(BaseModel):
@@ -71,3 +78,188 @@ async def test_materialized_view_declarations(view_manager: ViewManager) -> None
 
     # Clean up
     await app.stop()
+
+
+@pytest.mark.asyncio
+async def test_materialized_view_data_sources(
+    view_manager: ViewManager, tmp_path: Path
+) -> None:
+    """Test that views declaring data sources only recompute when they change."""
+    app = TacoBIApp(
+        view_manager=view_manager,
+        data_source_manager=DataSourceManager(
+            cache_backend=SQLiteCache(db_path=tmp_path / "cache.db")
+        ),
+    )
+    calls: list[str] = []
+
+    @app.data_source(name="counter", trigger=IntervalTrigger(hours=1))
+    async def counter(current: MockDataModel | None) -> MockDataModel:
+        return MockDataModel(value=current.value + 1 if current else 1)
+
+    @app.materialized_view(data_sources=[counter])
+    async def base_view() -> MockDataModel:
+        calls.append("base_view")
+        data = counter()
+        return MockDataModel(value=data.value if data else 0)
+
+    @app.materialized_view(dependencies=[base_view], data_sources=[])
+    async def derived_view() -> DerivedDataModel:
+        calls.append("derived_view")
+        base_data = base_view()
+        return DerivedDataModel(
+            original_value=base_data.value,
+            doubled_value=base_data.value * 2,
+        )
+
+    # Everything is computed the first time
+    await view_manager._recompute_materialized_views()
+    assert calls == ["base_view", "derived_view"]
+
+    # Nothing changed, so nothing is recomputed
+    await view_manager._recompute_materialized_views()
+    assert calls == ["base_view", "derived_view"]
+
+    # The data source changed, so the view and everything downstream recompute
+    await app.data_source_manager.get_data_source("counter").update()
+    await view_manager._recompute_materialized_views()
+    assert calls == ["base_view", "derived_view"] * 2
+    assert derived_view().doubled_value == 2  # noqa: PLR2004
+
+
+def test_materialized_view_unknown_data_source(view_manager: ViewManager) -> None:
+    """Test that declaring an unknown data source fails at registration."""
+    app = TacoBIApp(view_manager=view_manager)
+
+    with pytest.raises(ValueError, match="Data source unknown not found"):
+
+        @app.materialized_view(data_sources=["unknown"])
+        async def base_view() -> MockDataModel:
+            return MockDataModel(value=1)
+
+
+def test_materialized_view_max_staleness(view_manager: ViewManager) -> None:
+    """Test declaring a materialized view with its own refresh interval."""
+    app = TacoBIApp(view_manager=view_manager)
+
+    @app.materialized_view(max_staleness=timedelta(seconds=5))
+    async def base_view() -> MockDataModel:
+        return MockDataModel(value=1)
+
+    view = view_manager._materialized_views[0]
+    assert isinstance(view.trigger, IntervalTrigger)
+    assert view.trigger.interval == timedelta(seconds=5)
+    assert view.cache_max_age is None
+
+    with pytest.raises(ValueError, match="Only one of"):
+
+        @app.materialized_view(
+            trigger=IntervalTrigger(seconds=5), max_staleness=timedelta(seconds=5)
+        )
+        async def other_view() -> MockDataModel:
+            return MockDataModel(value=1)
+
+
+def test_materialized_view_cache_max_age(view_manager: ViewManager) -> None:
+    """Test declaring how long clients may cache a materialized view."""
+    app = TacoBIApp(view_manager=view_manager)
+
+    @app.materialized_view(route="/view", cache_max_age=timedelta(minutes=1))
+    async def cached_view() -> MockDataModel:
+        return MockDataModel(value=1)
+
+    view = view_manager._materialized_views[0]
+    assert view.cache_max_age == timedelta(minutes=1)
+
+
+def test_data_source_encoder(view_manager: ViewManager, tmp_path: Path) -> None:
+    """Test selecting the encoder of a data source."""
+    app = TacoBIApp(
+        view_manager=view_manager,
+        data_source_manager=DataSourceManager(
+            cache_backend=SQLiteCache(db_path=tmp_path / "cache.db")
+        ),
+    )
+
+    @app.data_source(name="ipc", trigger=IntervalTrigger(hours=1), encoder=IPCEncoder())
+    async def ipc(current: pl.LazyFrame | None) -> pl.LazyFrame:
+        return current
+
+    @app.data_source(name="default", trigger=IntervalTrigger(hours=1))
+    async def default(current: pl.LazyFrame | None) -> pl.LazyFrame:
+        return current
+
+    data_source_manager = app.data_source_manager
+    assert isinstance(data_source_manager.get_data_source("ipc")._encoder, IPCEncoder)
+    assert isinstance(
+        data_source_manager.get_data_source("default")._encoder, PolarsEncoder
+    )
+
+
+@pytest.mark.asyncio
+async def test_view_result_cache(
+    view_manager: ViewManager, fastapi_app: FastAPI
+) -> None:
+    """Test caching the results of a view until a dependency is recomputed."""
+    app = TacoBIApp(view_manager=view_manager)
+    state = {"value": 1}
+    calls: list[int] = []
+
+    @app.materialized_view()
+    async def base_view() -> MockDataModel:
+        return MockDataModel(value=state["value"])
+
+    @app.view(route="/scaled", dependencies=[base_view], cache=True)
+    async def scaled(factor: int = 1) -> MockDataModel:
+        calls.append(factor)
+        return MockDataModel(value=base_view().value * factor)
+
+    await view_manager._recompute_materialized_views()
+    client = TestClient(fastapi_app)
+
+    assert client.get("/scaled?factor=2").json()["data"] == {"value": 2}
+    assert client.get("/scaled?factor=2").json()["data"] == {"value": 2}
+    assert client.get("/scaled").json()["data"] == {"value": 1}
+    assert client.get("/scaled?factor=1").json()["data"] == {"value": 1}
+    assert calls == [2, 1]
+    assert view_manager.get_cache_stats() == {
+        "scaled": {"entries": 2, "hits": 2, "misses": 2}
+    }
+
+    # A recompute with the same content keeps the cache
+    await view_manager._recompute_materialized_views()
+    client.get("/scaled?factor=2")
+    assert calls == [2, 1]
+
+    # A change of the dependency clears it
+    state["value"] = 5
+    await view_manager._recompute_materialized_views()
+    assert client.get("/scaled?factor=2").json()["data"] == {"value": 10}
+    assert calls == [2, 1, 2]
+
+
+def test_lazy_materialized_view_declarations(view_manager: ViewManager) -> None:
+    """Test that lazy views take a TTL rather than a trigger."""
+    app = TacoBIApp(view_manager=view_manager)
+
+    @app.materialized_view(materialization=MaterializationMode.LAZY, ttl=timedelta(1))
+    async def lazy_view() -> MockDataModel:
+        return MockDataModel(value=1)
+
+    view = view_manager._materialized_views[0]
+    assert view.is_lazy
+    assert view.ttl == timedelta(1)
+
+    with pytest.raises(ValueError, match="use ttl instead"):
+
+        @app.materialized_view(
+            materialization=MaterializationMode.LAZY, max_staleness=timedelta(1)
+        )
+        async def stale_view() -> MockDataModel:
+            return MockDataModel(value=1)
+
+    with pytest.raises(ValueError, match="only available for lazy"):
+
+        @app.materialized_view(ttl=timedelta(1))
+        async def eager_view() -> MockDataModel:
+            return MockDataModel(value=1)
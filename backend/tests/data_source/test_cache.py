@@ -1,11 +1,15 @@
 """Tests for the cache backends."""
 
+import asyncio
+import threading
 from collections.abc import Generator
 from pathlib import Path
 
+import polars as pl
 import pytest
 
-from tacobi.data_source.cache import SQLiteCache
+from tacobi.data_source.cache import FileCache, SQLiteCache
+from tacobi.data_source.encode import EncodedDataType, PolarsEncoder
 
 
 @pytest.fixture
@@ -94,3 +98,125 @@ async def test_cache_clear(cache: SQLiteCache) -> None:
 
     assert await cache.get("key1") is None
     assert await cache.get("key2") is None
+
+
+@pytest.mark.asyncio
+async def test_cache_wal_mode(cache: SQLiteCache) -> None:
+    """Test that the database uses write-ahead logging."""
+    assert cache._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+@pytest.mark.asyncio
+async def test_cache_concurrent_reads_during_write(cache: SQLiteCache) -> None:
+    """Test reading while a large value is being written.
+
+    - Sets a small value
+    - Writes a large value while reading the small one concurrently
+    - Verifies every read and the write succeeded
+    """
+    await cache.set("small", b"small_data")
+    large = b"x" * 32 * 1024 * 1024
+
+    results = await asyncio.gather(
+        cache.set("large", large), *(cache.get("small") for _ in range(20))
+    )
+
+    assert results[1:] == [b"small_data"] * 20
+    assert await cache.get("large") == large
+
+
+@pytest.mark.asyncio
+async def test_cache_failed_write_is_rolled_back(cache: SQLiteCache) -> None:
+    """Test that a write failing partway through keeps the previous value.
+
+    - Sets a value
+    - Fails to overwrite it after the row was updated
+    - Verifies the next write doesn't commit the failed one
+    """
+    await cache.set("key", b"old_data")
+
+    # Has a length for the insert, but no buffer for the blob writes
+    with pytest.raises(TypeError):
+        await cache.set("key", [0] * 8)  # type: ignore[arg-type]
+    await cache.set("other", b"other_data")
+
+    assert await cache.get("key") == b"old_data"
+    assert await cache.get("other") == b"other_data"
+
+
+@pytest.mark.asyncio
+async def test_cache_encodes_off_the_event_loop(cache: SQLiteCache) -> None:
+    """Test that data is encoded and decoded on another thread.
+
+    - Sets and gets a frame through an encoder recording its threads
+    - Verifies neither ran on the event loop's thread
+    """
+    threads: list[threading.Thread] = []
+
+    class RecordingEncoder(PolarsEncoder):
+        def encode(self, data: pl.LazyFrame | pl.DataFrame) -> EncodedDataType:
+            threads.append(threading.current_thread())
+            return super().encode(data)
+
+        def decode(self, data: EncodedDataType) -> pl.LazyFrame | pl.DataFrame:
+            threads.append(threading.current_thread())
+            return super().decode(data)
+
+    encoder = RecordingEncoder()
+    frame = pl.DataFrame({"a": [1, 2, 3]})
+    await cache.set_data("frame", frame, encoder)
+    loaded = await cache.get_data("frame", encoder)
+
+    assert loaded.lazy().collect().equals(frame)
+    assert len(threads) == 2  # noqa: PLR2004
+    assert threading.current_thread() not in threads
+
+
+@pytest.mark.asyncio
+async def test_cache_closed(cache: SQLiteCache) -> None:
+    """Test that operations on a closed cache fail."""
+    await cache.cleanup()
+
+    with pytest.raises(RuntimeError, match="not initialized"):
+        await cache.get("key")
+
+
+@pytest.fixture
+def file_cache(tmp_path: Path) -> FileCache:
+    """Create a test file cache instance."""
+    return FileCache(directory=tmp_path / "cache")
+
+
+@pytest.mark.asyncio
+async def test_file_cache_set_get(file_cache: FileCache) -> None:
+    """Test file cache set, get, update and clear operations."""
+    assert await file_cache.get("some/key") is None
+
+    await file_cache.set("some/key", b"initial_data")
+    await file_cache.set("some/key", b"updated_data")
+    assert await file_cache.get("some/key") == b"updated_data"
+
+    await file_cache.clear()
+    assert await file_cache.get("some/key") is None
+
+
+@pytest.mark.asyncio
+async def test_file_cache_set_data_returns_lazy_scan(file_cache: FileCache) -> None:
+    """Test that Polars data is written as Parquet and read back lazily.
+
+    - Sets a LazyFrame through the file cache
+    - Verifies the returned frame scans the Parquet file
+    - Verifies no temporary files are left behind
+    """
+    encoder = PolarsEncoder()
+    lazyframe = pl.LazyFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+    stored = await file_cache.set_data("frame", lazyframe, encoder)
+    assert "Parquet SCAN" in stored.explain()
+    assert stored.collect().equals(lazyframe.collect())
+
+    loaded = await file_cache.get_data("frame", encoder)
+    assert loaded.select("b").collect().equals(lazyframe.select("b").collect())
+    assert [path.name for path in file_cache.directory.iterdir()] == ["frame"]
+
+    assert await file_cache.get_data("missing", encoder) is None
@@ -1,14 +1,16 @@
 """Tests for the CachedDataSource and DataSourceManager classes."""
 
 import asyncio
+import time
 from datetime import UTC, datetime
+from pathlib import Path
 
 import polars as pl
 import pytest
 from apscheduler.triggers.interval import IntervalTrigger
 from pydantic import BaseModel
 
-from tacobi.data_source.cache import CacheBackend, SQLiteCache
+from tacobi.data_source.cache import CacheBackend, FileCache, SQLiteCache
 from tacobi.data_source.encode import PolarsEncoder, PydanticEncoder
 from tacobi.data_source.models import CachedDataSource, DataSourceManager
 
@@ -100,6 +102,7 @@ async def test_cached_data_source_update(cache: CacheBackend) -> None:
 
     await data_source.update()
     assert data_source._cached_data is not None
+    assert data_source.version == 1
 
     # Verify data was stored in cache
     cached_data = await cache.get("test_update")
@@ -147,6 +150,25 @@ async def test_cached_data_source_get_latest_data(cache: CacheBackend) -> None:
     assert isinstance(latest_data, pl.LazyFrame)
 
 
+@pytest.mark.asyncio
+async def test_cached_data_source_file_cache(tmp_path: Path) -> None:
+    """Test that data sources backed by files hold a lazy scan of their file."""
+    cache = FileCache(directory=tmp_path)
+    data_source = CachedDataSource(
+        name="test_file",
+        function=polars_source_function,
+        trigger=IntervalTrigger(seconds=1),
+    )
+    data_source.set_cache_backend(cache)
+
+    await data_source.update()
+    assert "Parquet SCAN" in data_source.get_latest_data().explain()
+
+    data_source._cached_data = None
+    await data_source.load()
+    assert data_source.get_latest_data().collect()["value"].to_list() == [1, 2, 3]
+
+
 # Scheduler
 
 
@@ -225,3 +247,58 @@ async def test_data_source_manager_multiple_data_sources(
 
     assert isinstance(polars_data, pl.LazyFrame)
     assert isinstance(pydantic_data, TestPydanticModel)
+
+
+class SlowCache(CacheBackend):
+    """Cache backend taking a while to get data, to test concurrent loads."""
+
+    def __init__(self, encoded: bytes) -> None:
+        """Create a cache returning the given data for every key."""
+        self.encoded = encoded
+        self.running = 0
+        self.max_running = 0
+
+    async def get(self, key: str) -> bytes | None:  # noqa: ARG002
+        """Get the data after a delay, recording how many gets overlap."""
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(0.05)
+        finally:
+            self.running -= 1
+        return self.encoded
+
+    async def set(self, key: str, value: bytes) -> None:
+        """Ignore the data."""
+
+    async def clear(self) -> None:
+        """Do nothing."""
+
+    async def cleanup(self) -> None:
+        """Do nothing."""
+
+
+@pytest.mark.asyncio
+async def test_data_source_manager_loads_concurrently() -> None:
+    """Test that data sources are loaded concurrently and timed on start."""
+    encoded = PolarsEncoder().encode(pl.LazyFrame({"value": [1, 2, 3]}))
+    cache = SlowCache(encoded)
+    data_source_manager = DataSourceManager(cache_backend=cache, max_concurrent_loads=4)
+    for i in range(8):
+        data_source_manager.add_data_source(
+            CachedDataSource(
+                name=f"source_{i}",
+                function=polars_source_function,
+                trigger=IntervalTrigger(hours=1),
+            )
+        )
+
+    start = time.perf_counter()
+    await data_source_manager._load_data_sources()
+
+    # Loads overlap up to the limit, the time is only bounded generously
+    assert cache.max_running == 4  # noqa: PLR2004
+    assert time.perf_counter() - start < 5  # noqa: PLR2004
+    assert set(data_source_manager._load_durations) == {f"source_{i}" for i in range(8)}
+    for data_source in data_source_manager._data_sources:
+        assert data_source.get_latest_data().collect()["value"].to_list() == [1, 2, 3]
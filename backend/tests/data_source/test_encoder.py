@@ -1,10 +1,21 @@
 """Tests for the encoder classes."""
 
+from pathlib import Path
+
 import polars as pl
 import pytest
+from pandera.polars import DataFrameModel
+from pandera.typing.polars import DataFrame
 from pydantic import BaseModel, ValidationError
 
-from tacobi.data_source.encode import PolarsEncoder, PydanticEncoder
+from tacobi.data_source.encode import (
+    Encoder,
+    IPCEncoder,
+    PolarsEncoder,
+    PydanticEncoder,
+    encoder_for_type,
+)
+from tacobi.data_source.encode.ipc import IPCCompression
 
 
 class TestData(BaseModel):
@@ -86,3 +97,70 @@ def test_polars_encoder_invalid_data() -> None:
     assert isinstance(lazyframe, pl.LazyFrame)
     with pytest.raises(pl.exceptions.ComputeError):
         str(lazyframe.head())
+
+
+@pytest.mark.parametrize("compression", ["uncompressed", "lz4", "zstd"])
+def test_ipc_encoder(compression: IPCCompression) -> None:
+    """Test IPCEncoder encoding and decoding.
+
+    - Encodes and decodes a LazyFrame with each compression
+    - Checks if the encoded and decoded data are the same
+    """
+    encoder = IPCEncoder(compression=compression)
+    test_df = pl.LazyFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+    encoded = encoder.encode(test_df)
+    assert isinstance(encoded, bytes)
+
+    decoded = encoder.decode(encoded)
+    assert isinstance(decoded, pl.LazyFrame)
+    assert decoded.collect().equals(test_df.collect())
+
+
+@pytest.mark.parametrize("encoder", [PolarsEncoder(), IPCEncoder()])
+def test_polars_encoders_files(encoder: Encoder, tmp_path: Path) -> None:
+    """Test encoding Polars data to files and scanning them back.
+
+    - Encodes a LazyFrame to a file
+    - Decodes it lazily from the file
+    - Checks if the encoded and decoded data are the same
+    """
+    test_df = pl.LazyFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    path = tmp_path / "data"
+
+    encoder.encode_to_file(test_df, path)
+    decoded = encoder.decode_from_file(path)
+
+    assert isinstance(decoded, pl.LazyFrame)
+    assert decoded.collect().equals(test_df.collect())
+
+
+def test_pydantic_encoder_files(tmp_path: Path) -> None:
+    """Test the default file methods of encoders."""
+    encoder = PydanticEncoder(base_model=TestData)
+    path = tmp_path / "data"
+
+    encoder.encode_to_file(TestData(name="test", value=42), path)
+    assert encoder.decode_from_file(path) == TestData(name="test", value=42)
+
+
+class TestFrame(DataFrameModel):
+    """Test DataFrame model for encoder selection tests."""
+
+    value: int
+
+
+def test_encoder_for_type() -> None:
+    """Test that encoders are selected from data types."""
+    assert isinstance(encoder_for_type(pl.LazyFrame), PolarsEncoder)
+    assert encoder_for_type(TestData) == PydanticEncoder(base_model=TestData)
+
+    # DataFrames are read back eagerly
+    for data_type in (pl.DataFrame, DataFrame[TestFrame]):
+        encoder = encoder_for_type(data_type)
+        assert encoder == IPCEncoder(lazy=False)
+        decoded = encoder.decode(encoder.encode(pl.DataFrame({"value": [1]})))
+        assert isinstance(decoded, pl.DataFrame)
+
+    with pytest.raises(RuntimeError, match="No encoder found"):
+        encoder_for_type(int)
@@ -0,0 +1,170 @@
+"""Tests for the access-aware scheduling of materialized view recomputes."""
+
+import asyncio
+import time
+from datetime import timedelta
+from uuid import uuid4
+
+import polars as pl
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pandera.polars import DataFrameModel
+from pandera.typing.polars import DataFrame
+
+from tacobi.view import MaterializedView, ViewManager
+from tacobi.view.adaptive_scheduler import AdaptiveScheduler
+
+
+class ValueFrame(DataFrameModel):
+    """Frame of values for testing."""
+
+    value: int
+
+
+def test_idle_views_refresh_less_often(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that idle views back off down to the floor, and hot ones don't."""
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    scheduler = AdaptiveScheduler(
+        hot_window=timedelta(seconds=10), max_interval=timedelta(seconds=100)
+    )
+    hot, idle, dependency = uuid4(), uuid4(), uuid4()
+    for view_id in (hot, idle, dependency):
+        scheduler.record_recompute(view_id, 2.0)
+
+    # Dependencies of views read recently are hot too
+    now += 30
+    scheduler.record_hit(hot)
+    assert scheduler.should_recompute(hot, "hot", [])
+    assert scheduler.should_recompute(dependency, "dependency", [hot])
+
+    # Idle for 30s and recomputed 30s ago
+    assert scheduler.should_recompute(idle, "idle", [])
+    scheduler.record_recompute(idle, 2.0)
+
+    # Idle for 40s but recomputed 10s ago, so not before it's idle for 60s
+    now += 10
+    assert not scheduler.should_recompute(idle, "idle", [])
+    assert scheduler.cpu_seconds_saved == 2.0  # noqa: PLR2004
+    assert scheduler.skipped_upstream(hot, {idle: frozenset({hot})}) == {idle}
+
+    # Idle views are still recomputed every max_interval
+    now += 1000
+    scheduler.record_recompute(idle, 2.0)
+    now += 100
+    assert scheduler.should_recompute(idle, "idle", [])
+
+    stats = scheduler.stats({hot: "hot"})
+    assert stats["views"]["hot"]["hits"] == 1
+    assert [d["recomputed"] for d in stats["decisions"]] == [
+        True,
+        True,
+        True,
+        False,
+        True,
+    ]
+    assert stats["decisions"][1]["reason"] == "dependency of a view read recently"
+
+
+@pytest.mark.asyncio
+async def test_view_manager_skips_idle_views(
+    fastapi_app: FastAPI, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that idle downstream views are skipped and caught up once read."""
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    scheduler = AdaptiveScheduler(
+        hot_window=timedelta(seconds=10), max_interval=timedelta(hours=1)
+    )
+    view_manager = ViewManager(
+        recompute_trigger=None,
+        fastapi_app=fastapi_app,
+        adaptive_scheduler=scheduler,
+    )
+    version = 0
+    calls: list[str] = []
+
+    async def base() -> DataFrame[ValueFrame]:
+        calls.append("base")
+        return pl.DataFrame({"value": [version]}).pipe(DataFrame[ValueFrame])
+
+    base_view = MaterializedView(name="base", function=base, route="/base")
+
+    async def report() -> DataFrame[ValueFrame]:
+        calls.append("report")
+        return base_view.latest_data
+
+    report_view = MaterializedView(
+        name="report",
+        function=report,
+        route="/report",
+        dependencies=[base_view.id],
+    )
+    view_manager.add_materialized_view(base_view)
+    view_manager.add_materialized_view(report_view)
+    await view_manager._recompute_materialized_views()
+    assert calls == ["base", "report"]
+
+    # Only the base view is read, the report is idle and backs off
+    client = TestClient(fastapi_app)
+    now += 60
+    client.get("/base")
+    version = 1
+    await view_manager._recompute_scheduled({base_view.id})
+    assert report_view.latest_data["value"].to_list() == [1]
+
+    now += 5
+    version = 2
+    calls.clear()
+    await view_manager._recompute_scheduled({base_view.id})
+    assert calls == ["base"]
+    assert report_view.latest_data["value"].to_list() == [1]
+    assert report_view.is_stale
+    assert view_manager.get_schedule_stats()["skipped"] == ["report"]
+
+    # Reading the report catches it up in the background
+    view_manager._record_hit(report_view)
+    await asyncio.gather(*view_manager._background_tasks)
+    assert calls == ["base", "report"]
+    assert report_view.latest_data["value"].to_list() == [2]
+    assert view_manager.get_schedule_stats()["skipped"] == []
+
+
+@pytest.mark.asyncio
+async def test_up_to_date_views_are_never_skipped(
+    fastapi_app: FastAPI, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that reads of an idle view that is up to date don't start passes."""
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    scheduler = AdaptiveScheduler(hot_window=timedelta(seconds=1))
+    view_manager = ViewManager(
+        recompute_trigger=None,
+        fastapi_app=fastapi_app,
+        adaptive_scheduler=scheduler,
+    )
+    calls = 0
+
+    async def values() -> DataFrame[ValueFrame]:
+        nonlocal calls
+        calls += 1
+        return pl.DataFrame({"value": [1]}).pipe(DataFrame[ValueFrame])
+
+    view = MaterializedView(name="values", function=values, data_sources=[])
+    view_manager.add_materialized_view(view)
+    await view_manager._recompute_materialized_views()
+
+    # Recomputed while idle, then due again shortly after without changes
+    now += 10
+    view.invalidate()
+    await view_manager._recompute_scheduled({view.id})
+    now += 2
+    await view_manager._recompute_scheduled({view.id})
+    assert calls == 2  # noqa: PLR2004
+    assert scheduler.cpu_seconds_saved == 0
+
+    for _ in range(5):
+        view_manager._record_hit(view)
+        assert not view_manager._background_tasks
+    assert view_manager.get_schedule_stats()["skipped"] == []
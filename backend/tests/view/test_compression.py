@@ -0,0 +1,75 @@
+"""Tests for the pre-compression of response bodies."""
+
+import gzip
+
+import pytest
+
+from tacobi.view.compression import (
+    COMPRESSORS,
+    ContentEncoding,
+    choose_encoding,
+    compress_variants,
+)
+
+
+def test_compress_variants() -> None:
+    """Test compressing a body and recording the size and time of each variant."""
+    body = b'{"value": 42}' * 1000
+    variants = compress_variants(body, [ContentEncoding.GZIP])
+
+    variant = variants[ContentEncoding.GZIP]
+    assert gzip.decompress(variant.body) == body
+    assert variant.original_size == len(body)
+    assert variant.size < len(body)
+    assert 0 < variant.ratio < 1
+    assert variant.seconds >= 0
+
+
+@pytest.mark.parametrize(
+    ("encoding", "module"),
+    [(ContentEncoding.BROTLI, "brotli"), (ContentEncoding.ZSTD, "zstandard")],
+)
+def test_compress_variants_optional_encodings(
+    encoding: ContentEncoding, module: str
+) -> None:
+    """Test the encodings only available with the `compression` extra."""
+    decompress = pytest.importorskip(module).decompress
+    body = b'{"value": 42}' * 1000
+    variants = compress_variants(body, [ContentEncoding.GZIP, encoding])
+
+    assert decompress(variants[encoding].body) == body
+    assert variants[encoding].size < variants[ContentEncoding.GZIP].size
+    assert choose_encoding(f"gzip, {encoding.value}", variants) == encoding
+    assert choose_encoding(f"gzip, {encoding.value};q=0", variants) == (
+        ContentEncoding.GZIP
+    )
+
+
+def test_compress_variants_skips_larger_bodies() -> None:
+    """Test that variants that aren't smaller than the body are dropped."""
+    assert compress_variants(b"{}", [ContentEncoding.GZIP]) == {}
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        (None, None),
+        ("identity", None),
+        ("gzip", ContentEncoding.GZIP),
+        ("gzip;q=0", None),
+        ("*", ContentEncoding.GZIP),
+        ("deflate, gzip;q=0.5", ContentEncoding.GZIP),
+    ],
+)
+def test_choose_encoding(
+    accept_encoding: str | None, expected: ContentEncoding | None
+) -> None:
+    """Test choosing an encoding from the Accept-Encoding header."""
+    assert choose_encoding(accept_encoding, [ContentEncoding.GZIP]) == expected
+
+
+def test_choose_encoding_prefers_available() -> None:
+    """Test that only encodings the body is available in are chosen."""
+    assert choose_encoding("gzip", []) is None
+    preferred = next(iter(COMPRESSORS))
+    assert choose_encoding("gzip, br, zstd", COMPRESSORS) == preferred
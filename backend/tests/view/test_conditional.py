@@ -0,0 +1,31 @@
+"""Tests for conditional requests to view endpoints."""
+
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+
+from tacobi.view.conditional import etag_matches, format_http_date
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "expected"),
+    [
+        (None, False),
+        ("", False),
+        ("*", True),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"xyz", "abc"', True),
+        ('"xyz"', False),
+    ],
+)
+def test_etag_matches(if_none_match: str | None, *, expected: bool) -> None:
+    """Test matching If-None-Match headers against an entity tag."""
+    assert etag_matches(if_none_match, '"abc"') == expected
+
+
+def test_format_http_date() -> None:
+    """Test formatting datetimes as HTTP dates in GMT."""
+    value = datetime(2024, 1, 2, 4, 4, 5, tzinfo=timezone(timedelta(hours=1)))
+    assert format_http_date(value) == "Tue, 02 Jan 2024 03:04:05 GMT"
+    assert format_http_date(value.astimezone(UTC)) == format_http_date(value)
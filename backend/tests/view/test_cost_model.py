@@ -0,0 +1,118 @@
+"""Tests for the cost model of materialized view recomputes."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from tacobi.view import MaterializedView, ViewManager
+from tacobi.view.cost_model import CostModel
+from tacobi.view.plan import ExecutionPlan
+
+
+class MockDataModel(BaseModel):
+    """Mock data model for testing."""
+
+    value: int
+
+
+def make_view(
+    name: str,
+    started: list[str],
+    dependencies: list[MaterializedView] | None = None,
+    route: str | None = None,
+) -> MaterializedView:
+    """Create a materialized view that records when it started."""
+
+    async def _function() -> MockDataModel:
+        started.append(name)
+        await asyncio.sleep(0)
+        return MockDataModel(value=1)
+
+    return MaterializedView(
+        name=name,
+        function=_function,
+        route=route,
+        dependencies=[dep.id for dep in dependencies or []],
+    )
+
+
+def test_duration_stats() -> None:
+    """Test the moving average, percentile and CPU utilization of recomputes."""
+    cost_model = CostModel(alpha=0.5, window=20)
+    view = make_view("view", [])
+    assert cost_model.get(view.id) is None
+    assert cost_model.estimate(view) == 0.0
+
+    for seconds in [1.0, *[2.0] * 18, 10.0, 3.0]:
+        cost_model.record(view.id, seconds, seconds / 2)
+    stats = cost_model.get(view.id)
+    assert stats.count == 21  # noqa: PLR2004
+    assert stats.ewma == pytest.approx(4.5)
+    assert stats.p95 == 3.0  # noqa: PLR2004
+    assert stats.cpu_utilization == pytest.approx(0.5)
+
+    # Views that were never measured are estimated from the others
+    assert cost_model.estimate(make_view("other", [])) == stats.ewma
+
+
+def test_critical_path_and_concurrency() -> None:
+    """Test that views on the longest path to served views rank highest."""
+    cost_model = CostModel(alpha=1.0, cpu_count=4)
+    slow = make_view("slow", [])
+    fast = make_view("fast", [])
+    report = make_view("report", [], [fast], route="/report")
+    dashboard = make_view("dashboard", [], [slow, fast], route="/dashboard")
+    plan = ExecutionPlan.compile([slow, fast, report, dashboard])
+    for view, seconds in [(slow, 5.0), (fast, 1.0), (report, 3.0), (dashboard, 2.0)]:
+        cost_model.record(view.id, seconds, 0.0)
+
+    priorities = cost_model.priorities(plan)
+    assert priorities[slow.id] == 7.0  # noqa: PLR2004
+    assert priorities[fast.id] == 4.0  # noqa: PLR2004
+
+    described = cost_model.describe(plan)
+    assert described["critical_path"] == ["slow", "dashboard"]
+    assert described["critical_path_seconds"] == 7.0  # noqa: PLR2004
+    assert [v["name"] for v in described["views"]][:2] == ["slow", "fast"]
+
+    # Views waiting on I/O don't need a limit, views using the CPU do
+    assert cost_model.concurrency() is None
+    assert cost_model.concurrency(8) == 8  # noqa: PLR2004
+    for view in (slow, fast, report, dashboard):
+        cost_model.record(view.id, 1.0, 2.0)
+    assert cost_model.concurrency() == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_long_views_start_first(fastapi_app: FastAPI) -> None:
+    """Test that the views with the longest path start first, and the plan route."""
+    started: list[str] = []
+    view_manager = ViewManager(
+        recompute_trigger=None,
+        fastapi_app=fastapi_app,
+        max_concurrency=1,
+        plan_route="/admin/plan",
+    )
+    short = make_view("short", started)
+    long = make_view("long", started)
+    leaf = make_view("leaf", started, [long], route="/leaf")
+    for view in (short, long, leaf):
+        view_manager.add_materialized_view(view)
+
+    await view_manager._recompute_materialized_views()
+    assert started == ["short", "long", "leaf"]
+
+    view_manager.cost_model.record(short.id, 1.0, 0.0)
+    view_manager.cost_model.record(long.id, 2.0, 0.0)
+    view_manager.cost_model.record(leaf.id, 1.0, 0.0)
+    started.clear()
+    await view_manager._recompute_materialized_views()
+    assert started == ["long", "short", "leaf"]
+
+    plan = TestClient(fastapi_app).get("/admin/plan").json()
+    assert plan["concurrency"] == 1
+    assert plan["critical_path"] == ["long", "leaf"]
+    assert [view["recomputes"] for view in plan["views"]] == [3, 3, 3]
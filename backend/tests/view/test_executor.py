@@ -0,0 +1,133 @@
+"""Tests for the RecomputeExecutor class."""
+
+import asyncio
+
+import pytest
+from apscheduler.triggers.interval import IntervalTrigger
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from tacobi.view import MaterializedView, ViewManager
+
+
+class MockDataModel(BaseModel):
+    """Mock data model for testing."""
+
+    value: int
+
+
+def make_view(
+    name: str,
+    finished: list[str],
+    delay: float = 0.0,
+    dependencies: list[MaterializedView] | None = None,
+    *,
+    fail: bool = False,
+) -> MaterializedView:
+    """Create a materialized view that sleeps and records when it finished."""
+
+    async def _function() -> MockDataModel:
+        await asyncio.sleep(delay)
+        if fail:
+            msg = f"{name} failed"
+            raise RuntimeError(msg)
+        finished.append(name)
+        return MockDataModel(value=1)
+
+    return MaterializedView(
+        name=name,
+        function=_function,
+        dependencies=[dep.id for dep in dependencies or []],
+    )
+
+
+def make_view_manager(max_concurrency: int | None = None) -> ViewManager:
+    """Create a ViewManager with the given concurrency limit."""
+    return ViewManager(
+        recompute_trigger=IntervalTrigger(seconds=1),
+        fastapi_app=FastAPI(),
+        max_concurrency=max_concurrency,
+    )
+
+
+@pytest.mark.asyncio
+async def test_independent_views_run_concurrently() -> None:
+    """Test that independent views overlap instead of running one by one."""
+    # Each view only finishes once all four are running at the same time
+    barrier = asyncio.Barrier(4)
+
+    async def _function() -> MockDataModel:
+        async with asyncio.timeout(5):
+            await barrier.wait()
+        return MockDataModel(value=1)
+
+    view_manager = make_view_manager()
+    views = [MaterializedView(name=f"view{i}", function=_function) for i in range(4)]
+    for view in views:
+        view_manager.add_materialized_view(view)
+
+    await view_manager._recompute_materialized_views()
+
+    assert all(view.latest_data is not None for view in views)
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency() -> None:
+    """Test that the concurrency limit is respected."""
+    running = 0
+    max_running = 0
+
+    async def _function() -> MockDataModel:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return MockDataModel(value=1)
+
+    view_manager = make_view_manager(max_concurrency=1)
+    views = [MaterializedView(name=f"view{i}", function=_function) for i in range(3)]
+    for view in views:
+        view_manager.add_materialized_view(view)
+
+    await view_manager._recompute_materialized_views()
+
+    assert all(view.latest_data is not None for view in views)
+    assert max_running == 1
+
+
+@pytest.mark.asyncio
+async def test_dependents_start_when_own_dependencies_finish() -> None:
+    """Test that a view doesn't wait for unrelated views of the previous layer."""
+    finished: list[str] = []
+    slow = make_view("slow", finished, 0.3)
+    fast = make_view("fast", finished)
+    after_fast = make_view("after_fast", finished, dependencies=[fast])
+    after_both = make_view("after_both", finished, dependencies=[slow, fast])
+
+    view_manager = make_view_manager()
+    for view in [after_both, after_fast, slow, fast]:
+        view_manager.add_materialized_view(view)
+
+    await view_manager._recompute_materialized_views()
+
+    assert finished == ["fast", "after_fast", "slow", "after_both"]
+
+
+@pytest.mark.asyncio
+async def test_failure_skips_dependents_only() -> None:
+    """Test that a failing view skips its dependents but not unrelated views."""
+    finished: list[str] = []
+    broken = make_view("broken", finished, fail=True)
+    dependent = make_view("dependent", finished, dependencies=[broken])
+    unrelated = make_view("unrelated", finished, 0.1)
+
+    view_manager = make_view_manager()
+    for view in [broken, dependent, unrelated]:
+        view_manager.add_materialized_view(view)
+
+    with pytest.raises(RuntimeError, match="broken failed"):
+        await view_manager._recompute_materialized_views()
+
+    assert finished == ["unrelated"]
+    assert dependent.latest_data is None
@@ -0,0 +1,43 @@
+"""Tests for content fingerprints."""
+
+import pandas as pd
+import polars as pl
+from pydantic import BaseModel
+
+from tacobi.view.fingerprint import fingerprint
+
+
+class MockDataModel(BaseModel):
+    """Mock data model for testing."""
+
+    value: int
+
+
+def test_fingerprint_polars() -> None:
+    """Test that Polars fingerprints follow the content, order and schema."""
+    df = pl.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+    assert fingerprint(df) == fingerprint(df.clone())
+    assert fingerprint(df) != fingerprint(df.reverse())
+    assert fingerprint(df) != fingerprint(df.with_columns(pl.col("a") + 1))
+    assert fingerprint(df) != fingerprint(df.cast({"a": pl.Float64}))
+    assert fingerprint(pl.DataFrame()) is not None
+
+
+def test_fingerprint_pandas() -> None:
+    """Test that pandas fingerprints follow the content."""
+    df = pd.DataFrame({"a": [1, 2, 3]})
+
+    assert fingerprint(df) == fingerprint(df.copy())
+    assert fingerprint(df) != fingerprint(df + 1)
+
+
+def test_fingerprint_pydantic() -> None:
+    """Test that Pydantic fingerprints follow the content."""
+    assert fingerprint(MockDataModel(value=1)) == fingerprint(MockDataModel(value=1))
+    assert fingerprint(MockDataModel(value=1)) != fingerprint(MockDataModel(value=2))
+
+
+def test_fingerprint_lazy_frame() -> None:
+    """Test that lazy data can't be fingerprinted."""
+    assert fingerprint(pl.LazyFrame({"a": [1]})) is None
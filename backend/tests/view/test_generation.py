@@ -0,0 +1,103 @@
+"""Tests for the atomic publication of materialized view data."""
+
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from tacobi.view.generation import GenerationStore, MaterializedSnapshot
+from tacobi.view.result_cache import ResultCache
+
+
+def make_snapshot(data: int) -> MaterializedSnapshot:
+    """Create a snapshot of some data."""
+    return MaterializedSnapshot(
+        data=data,
+        latest_update=datetime.now(UTC),
+        fingerprint=str(data),
+        data_source_versions={},
+        response=None,
+        query_results=ResultCache(),
+    )
+
+
+def test_publish_swaps_generations() -> None:
+    """Test that views without a new snapshot keep theirs in new generations."""
+    store = GenerationStore()
+    first, second = uuid4(), uuid4()
+    assert store.current.id == 0
+    assert store.snapshot(first) is None
+
+    store.publish({first: make_snapshot(1), second: make_snapshot(2)})
+    generation = store.publish({first: make_snapshot(3)})
+    assert generation is store.current
+    assert generation.id == 2  # noqa: PLR2004
+    assert store.snapshot(first).data == 3  # noqa: PLR2004
+    assert store.snapshot(second).data == 2  # noqa: PLR2004
+
+    # Publishing nothing doesn't create a generation
+    assert store.publish({}) is generation
+
+
+@pytest.mark.asyncio
+async def test_staged_snapshots_are_only_visible_to_the_pass() -> None:
+    """Test that staged snapshots are read within the pass and published at once."""
+    store = GenerationStore()
+    first, second = uuid4(), uuid4()
+    store.publish({first: make_snapshot(1), second: make_snapshot(1)})
+    seen_by_pass: list[int] = []
+
+    async def recompute() -> None:
+        store.stage(first, make_snapshot(2))
+        await asyncio.sleep(0)
+        seen_by_pass.append(store.snapshot(first).data)
+        store.stage(second, make_snapshot(2))
+
+    with store.build() as staged:
+        task = asyncio.create_task(recompute())
+    await asyncio.sleep(0)
+
+    # Readers outside the pass still see the whole previous generation
+    assert [store.snapshot(first).data, store.snapshot(second).data] == [1, 1]
+    await task
+    assert seen_by_pass == [2]
+    assert [store.snapshot(first).data, store.snapshot(second).data] == [1, 1]
+
+    store.publish(staged)
+    assert [store.snapshot(first).data, store.snapshot(second).data] == [2, 2]
+
+
+def test_pin_reads_one_generation() -> None:
+    """Test that pinned readers don't see generations published since."""
+    store = GenerationStore()
+    view_id = uuid4()
+    store.publish({view_id: make_snapshot(1)})
+
+    with store.pin() as pinned:
+        store.publish({view_id: make_snapshot(2)})
+        assert store.snapshot(view_id).data == 1
+        assert pinned.id == 1
+    assert store.snapshot(view_id).data == 2  # noqa: PLR2004
+
+
+def test_grace_period(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that superseded generations are kept for the grace period."""
+    store = GenerationStore(grace_period=timedelta(seconds=10))
+    view_id = uuid4()
+    store.publish({view_id: make_snapshot(1)})
+    store.publish({view_id: make_snapshot(2)})
+    assert store.get(1).snapshots[view_id].data == 1
+    assert store.get(2) is store.current
+    assert store.get(3) is None
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert store.get(1) is None
+
+    # Without a grace period, only the current generation is available
+    store = GenerationStore()
+    store.publish({view_id: make_snapshot(1)})
+    store.publish({view_id: make_snapshot(2)})
+    assert store.get(1) is None
@@ -0,0 +1,172 @@
+"""Tests for the memory budget of materialized views."""
+
+import asyncio
+import gc
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from uuid import uuid4
+
+import polars as pl
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pandera.polars import DataFrameModel
+from pandera.typing.polars import DataFrame
+
+from tacobi.view import MaterializedView, ViewManager
+from tacobi.view.compression import CompressedVariant, ContentEncoding
+from tacobi.view.generation import MaterializedSnapshot
+from tacobi.view.memory_budget import MemoryBudget
+from tacobi.view.result_cache import ResultCache
+
+
+class ValueFrame(DataFrameModel):
+    """Frame of values for testing."""
+
+    value: int
+
+
+def make_snapshot(rows: int, response: bytes | None = None) -> MaterializedSnapshot:
+    """Create a snapshot of a frame."""
+    return MaterializedSnapshot(
+        data=pl.DataFrame({"value": range(rows)}),
+        latest_update=datetime.now(UTC),
+        fingerprint=None,
+        data_source_versions={},
+        response=response,
+        query_results=ResultCache(),
+    )
+
+
+def test_spill_and_read_back(tmp_path: Path) -> None:
+    """Test that spilled frames are read back from disk, in full or lazily."""
+    snapshot = make_snapshot(1000)
+    size = snapshot.resident_size
+    assert size > 0
+
+    path = tmp_path / "spilled.arrow"
+    snapshot.spill(path)
+    assert snapshot.is_spilled
+    assert snapshot.resident_size == 0
+    assert snapshot.spilled_size == size
+    assert snapshot.read()["value"].sum() == sum(range(1000))
+    assert "SCAN" in snapshot.scan().explain().upper()
+
+    # Reading doesn't keep the frame in memory, loading does
+    assert snapshot.is_spilled
+    snapshot.load()
+    assert snapshot.resident_size == size
+
+    # The file is removed once the snapshot is gone
+    del snapshot
+    gc.collect()
+    assert not path.exists()
+
+
+def test_enforce_spills_least_recently_read(tmp_path: Path) -> None:
+    """Test that the least recently read frames are spilled first."""
+    snapshots = {uuid4(): make_snapshot(1000) for _ in range(3)}
+    size = next(iter(snapshots.values())).resident_size
+    budget = MemoryBudget(max_bytes=size * 2, directory=tmp_path)
+
+    cold, warm, hot = snapshots
+    snapshots[warm].read()
+    time.sleep(0.001)
+    snapshots[hot].read()
+    spilled, loaded = budget.enforce(snapshots)
+    assert (spilled, loaded) == ([cold], [])
+    assert [s.is_spilled for s in snapshots.values()] == [True, False, False]
+
+    # The cold view is read again, so it's loaded back in place of the warm one
+    time.sleep(0.001)
+    snapshots[cold].read()
+    spilled, loaded = budget.enforce(snapshots)
+    assert (spilled, loaded) == ([warm], [cold])
+
+
+def test_enforce_counts_responses(tmp_path: Path) -> None:
+    """Test that responses, which aren't spilled, count against the budget."""
+    frame_size = make_snapshot(1000).resident_size
+    snapshots = {
+        uuid4(): make_snapshot(1000, response=b"x" * frame_size),
+        uuid4(): make_snapshot(1000),
+    }
+    snapshot = next(iter(snapshots.values()))
+    snapshot.compressed_responses = {
+        ContentEncoding.GZIP: CompressedVariant(b"x" * 10, frame_size, 0.0)
+    }
+    assert snapshot.response_size == frame_size + 10
+    budget = MemoryBudget(max_bytes=frame_size * 2 + 10, directory=tmp_path)
+
+    spilled, _ = budget.enforce(snapshots)
+    assert len(spilled) == 1
+    assert snapshot.response is not None
+
+
+@pytest.mark.asyncio
+async def test_view_manager_memory_budget(fastapi_app: FastAPI, tmp_path: Path) -> None:
+    """Test that spilled views are still served and queried."""
+    view_manager = ViewManager(
+        recompute_trigger=None,
+        fastapi_app=fastapi_app,
+        memory_budget=0,
+        spill_directory=tmp_path,
+    )
+
+    async def values() -> DataFrame[ValueFrame]:
+        return pl.DataFrame({"value": [1, 2, 3]}).pipe(DataFrame[ValueFrame])
+
+    view = MaterializedView(name="values", function=values, route="/values")
+    view_manager.add_materialized_view(view)
+    await view_manager._recompute_materialized_views()
+    response_bytes = len(view.snapshot.response)
+    assert view_manager.get_memory_stats() == {
+        "values": {
+            "resident_bytes": 0,
+            "response_bytes": response_bytes,
+            "spilled": True,
+        }
+    }
+    assert view.snapshot.spill_path.parent == tmp_path
+
+    client = TestClient(fastapi_app)
+    assert [row["value"] for row in client.get("/values").json()["data"]] == [1, 2, 3]
+    response = client.get("/values?filter=value:gte:2&format=csv")
+    assert response.text == "value\n2\n3\n"
+    assert view.latest_data["value"].to_list() == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_whole_responses_keep_views_warm(
+    fastapi_app: FastAPI, tmp_path: Path
+) -> None:
+    """Test that views only served their whole JSON response aren't spilled."""
+    view_manager = ViewManager(
+        recompute_trigger=None,
+        fastapi_app=fastapi_app,
+        memory_budget=10**9,
+        spill_directory=tmp_path,
+    )
+
+    async def values() -> DataFrame[ValueFrame]:
+        return pl.DataFrame({"value": range(1000)}).pipe(DataFrame[ValueFrame])
+
+    served = MaterializedView(name="served", function=values, route="/served")
+    queried = MaterializedView(name="queried", function=values)
+    view_manager.add_materialized_view(served)
+    view_manager.add_materialized_view(queried)
+    await view_manager._recompute_materialized_views()
+
+    # Only one of the frames fits next to the responses
+    stats = view_manager.get_memory_stats().values()
+    view_manager._memory_budget.max_bytes = (
+        sum(view["response_bytes"] for view in stats) + served.snapshot.resident_size
+    )
+    queried.snapshot.read()
+    await asyncio.sleep(0.001)
+    assert TestClient(fastapi_app).get("/served").status_code == 200  # noqa: PLR2004
+    await view_manager.enforce_memory_budget()
+
+    assert not served.snapshot.is_spilled
+    assert queried.snapshot.is_spilled
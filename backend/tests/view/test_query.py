@@ -0,0 +1,89 @@
+"""Tests for queries over the data of views."""
+
+import polars as pl
+import pytest
+from pydantic import BaseModel
+
+from tacobi.view.query import Filter, FilterOperator, SortKey, ViewQuery
+
+
+class Person(BaseModel):
+    """Mock row model for testing."""
+
+    name: str
+    age: float
+
+
+@pytest.fixture
+def frame() -> pl.DataFrame:
+    """Fixture providing a frame to query."""
+    return pl.DataFrame({"name": ["Ada", "Bob", "Cy", "Di"], "age": [36, 12, 52, 12]})
+
+
+def test_parse_query() -> None:
+    """Test parsing queries from their query parameters."""
+    assert ViewQuery.parse(Person) is None
+
+    query = ViewQuery.parse(
+        Person,
+        columns="name, age",
+        filters=["age:gte:18", "name:in:Ada|Cy"],
+        sort="-age,name",
+    )
+    assert query == ViewQuery(
+        columns=("name", "age"),
+        filters=(
+            Filter("age", FilterOperator.GTE, 18.0),
+            Filter("name", FilterOperator.IN, ("Ada", "Cy")),
+        ),
+        sort=(SortKey("age", descending=True), SortKey("name")),
+    )
+    assert hash(query) == hash(
+        ViewQuery.parse(
+            Person, "name,age", ["age:gte:18", "name:in:Ada|Cy"], "-age,name"
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    ("columns", "filters", "sort", "match"),
+    [
+        ("name,email", None, None, "Unknown column 'email'"),
+        (None, ["age:gte"], None, "Invalid filter"),
+        (None, ["age:like:1"], None, "Unknown filter operator"),
+        (None, ["age:gt:old"], None, "Invalid value 'old'"),
+        (None, None, "-email", "Unknown column 'email'"),
+    ],
+)
+def test_parse_invalid_query(
+    columns: str | None, filters: list[str] | None, sort: str | None, match: str
+) -> None:
+    """Test that queries are checked against the model."""
+    with pytest.raises(ValueError, match=match):
+        ViewQuery.parse(Person, columns, filters, sort)
+
+
+def test_apply_query(frame: pl.DataFrame) -> None:
+    """Test running queries as lazy Polars plans."""
+    query = ViewQuery.parse(
+        Person, columns="name", filters=["age:lt:40"], sort="-age,name"
+    )
+    result = query.apply(frame.lazy())
+    assert isinstance(result, pl.LazyFrame)
+    assert result.collect().to_dict(as_series=False) == {"name": ["Ada", "Bob", "Di"]}
+
+    query = ViewQuery.parse(Person, filters=["age:ne:12", "name:eq:Cy"])
+    assert query.apply(frame.lazy()).collect()["name"].to_list() == ["Cy"]
+
+
+def test_in_filter_on_integer_column(frame: pl.DataFrame) -> None:
+    """Test that `in` values parsed as floats match integer columns."""
+    query = ViewQuery.parse(Person, filters=["age:in:36|12.5|52"], sort="name")
+    assert query.apply(frame.lazy()).collect()["name"].to_list() == ["Ada", "Cy"]
+
+
+def test_duplicate_columns(frame: pl.DataFrame) -> None:
+    """Test that columns selected twice are returned once."""
+    query = ViewQuery.parse(Person, columns="age,name,age")
+    assert query.columns == ("age", "name")
+    assert query.apply(frame.lazy()).collect().columns == ["age", "name"]
@@ -0,0 +1,64 @@
+"""Tests for the response formats of view endpoints."""
+
+import pandas as pd
+import polars as pl
+import pytest
+
+from tacobi.view.response_formats import (
+    ResponseFormat,
+    encode_frame,
+    negotiate_format,
+    to_polars_frame,
+)
+
+
+@pytest.mark.parametrize(
+    ("requested", "accept", "expected"),
+    [
+        (None, None, ResponseFormat.JSON),
+        (None, "*/*", ResponseFormat.JSON),
+        (None, "text/html,application/xml;q=0.9,*/*;q=0.8", ResponseFormat.JSON),
+        (None, "application/vnd.apache.arrow.stream", ResponseFormat.ARROW),
+        (None, "application/json;q=0.5, text/csv", ResponseFormat.CSV),
+        (None, "text/csv;q=0, application/x-parquet", ResponseFormat.PARQUET),
+        (None, "image/png", ResponseFormat.JSON),
+        (ResponseFormat.CSV, "application/json", ResponseFormat.CSV),
+    ],
+)
+def test_negotiate_format(
+    requested: ResponseFormat | None, accept: str | None, expected: ResponseFormat
+) -> None:
+    """Test choosing the format of a response."""
+    assert negotiate_format(requested, accept) == expected
+
+
+@pytest.mark.parametrize(
+    "response_format",
+    [ResponseFormat.ARROW, ResponseFormat.PARQUET, ResponseFormat.CSV],
+)
+def test_encode_frame(response_format: ResponseFormat) -> None:
+    """Test that frames are written in each columnar format."""
+    frame = pl.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+    body = encode_frame(frame, response_format)
+
+    readers = {
+        ResponseFormat.ARROW: pl.read_ipc_stream,
+        ResponseFormat.PARQUET: pl.read_parquet,
+        ResponseFormat.CSV: pl.read_csv,
+    }
+    assert readers[response_format](body).equals(frame)
+
+
+def test_encode_frame_json() -> None:
+    """Test that JSON isn't written as a columnar format."""
+    with pytest.raises(ValueError, match="not a columnar format"):
+        encode_frame(pl.DataFrame({"a": [1]}), ResponseFormat.JSON)
+
+
+def test_to_polars_frame() -> None:
+    """Test getting the data of views as Polars frames."""
+    frame = pl.DataFrame({"a": [1, 2]})
+    assert to_polars_frame(frame) is frame
+    assert to_polars_frame(frame.lazy()).equals(frame)
+    assert to_polars_frame(pd.DataFrame({"a": [1, 2]})).equals(frame)
+    assert to_polars_frame(object()) is None
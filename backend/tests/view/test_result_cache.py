@@ -0,0 +1,54 @@
+"""Tests for the caches of view results."""
+
+import time
+from datetime import timedelta
+
+import pytest
+
+from tacobi.view.result_cache import ResultCache
+
+
+def test_result_cache_lru() -> None:
+    """Test that the least recently used entries are evicted."""
+    cache: ResultCache[str, int] = ResultCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    # "b" is the least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3  # noqa: PLR2004
+    assert len(cache) == 2  # noqa: PLR2004
+    assert (cache.hits, cache.misses) == (3, 1)
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_result_cache_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that entries expire after their TTL."""
+    now = 100.0
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache: ResultCache[str, int] = ResultCache(ttl=timedelta(seconds=10))
+    cache.set("a", 1)
+
+    now = 109.0
+    assert cache.get("a") == 1
+    now = 110.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_result_cache_generation() -> None:
+    """Test that values computed before the cache was cleared aren't set."""
+    cache: ResultCache[str, int] = ResultCache()
+    generation = cache.generation
+    cache.clear()
+    cache.set("a", 1, generation)
+    assert cache.get("a") is None
+
+    cache.set("a", 2, cache.generation)
+    assert cache.get("a") == 2  # noqa: PLR2004
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
@@ -0,0 +1,73 @@
+"""Tests for the coalescing of identical concurrent calls."""
+
+import asyncio
+
+import pytest
+
+from tacobi.view.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_result() -> None:
+    """Test that identical concurrent calls share a single call."""
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+    calls: list[str] = []
+
+    async def fetch(key: str) -> str:
+        calls.append(key)
+        await release.wait()
+        return key.upper()
+
+    tasks = [
+        asyncio.create_task(single_flight.do(key, lambda k=key: fetch(k)))
+        for key in ["a", "a", "b", "a"]
+    ]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == ["A", "A", "B", "A"]
+    assert calls == ["a", "b"]
+    assert single_flight.stats() == {"calls": 2, "coalesced": 2, "in_flight": 0}
+
+    # Calls made once the previous one is done aren't coalesced
+    assert await single_flight.do("a", lambda: fetch("a")) == "A"
+    assert calls == ["a", "b", "a"]
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_errors() -> None:
+    """Test that the exception of a call is raised to every caller."""
+    single_flight = SingleFlight()
+
+    async def fail() -> None:
+        await asyncio.sleep(0.01)
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    results = await asyncio.gather(
+        single_flight.do("key", fail),
+        single_flight.do("key", fail),
+        return_exceptions=True,
+    )
+    assert [str(result) for result in results] == ["boom", "boom"]
+    assert single_flight.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_cancelled_caller() -> None:
+    """Test that cancelling one caller doesn't cancel the call for the others."""
+    single_flight = SingleFlight()
+
+    async def slow() -> int:
+        await asyncio.sleep(0.01)
+        return 1
+
+    first = asyncio.create_task(single_flight.do("key", slow))
+    second = asyncio.create_task(single_flight.do("key", slow))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == 1
+    with pytest.raises(asyncio.CancelledError):
+        await first
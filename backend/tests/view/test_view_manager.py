@@ -1,14 +1,27 @@
 """Tests for the ViewManager class."""
 
 import asyncio
+import json
 from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from pathlib import Path
+from typing import Annotated
 
+import httpx
+import polars as pl
 import pytest
 from apscheduler.triggers.interval import IntervalTrigger
-from fastapi import FastAPI
+from fastapi import FastAPI, Query
+from fastapi.testclient import TestClient
+from pandera.polars import DataFrameModel
+from pandera.typing.polars import DataFrame
 from pydantic import BaseModel
 
-from tacobi.view import MaterializedView, View, ViewManager
+from tacobi.data_source import FileCache
+from tacobi.view import MaterializationMode, MaterializedView, View, ViewManager
+from tacobi.view.compression import ContentEncoding
+from tacobi.view.query import ViewQuery
+from tacobi.view.response_formats import ResponseFormat
 
 
 class MockDataModel(BaseModel):
@@ -116,18 +129,80 @@ def test_get_sorted_views_circular_dependency(
     view_manager: ViewManager,
     mock_view_function: Callable[[], Awaitable[MockDataModel]],
 ) -> None:
-    """Test that circular dependencies are detected."""
+    """Test that circular dependencies are detected when registering views."""
     view1 = View(function=mock_view_function, dependencies=[])
     view2 = View(function=mock_view_function, dependencies=[view1.id])
     view1.dependencies = [view2.id]
 
     view_manager.add_view(view1)
-    view_manager.add_view(view2)
 
-    with pytest.raises(ValueError):  # noqa: PT011
+    with pytest.raises(ValueError, match="Circular dependency"):
+        view_manager.add_view(view2)
+
+    # The offending view isn't registered
+    assert view_manager._views == [view1]
+
+
+def test_missing_dependency(
+    view_manager: ViewManager,
+    mock_view_function: Callable[[], Awaitable[MockDataModel]],
+) -> None:
+    """Test that missing dependencies are rejected once the plan is needed."""
+    missing = View(function=mock_view_function, dependencies=[])
+    view = View(name="view", function=mock_view_function, dependencies=[missing.id])
+
+    # Views can be added in any order before starting
+    view_manager.add_view(view)
+
+    with pytest.raises(ValueError, match="Dependencies not found"):
         view_manager._get_sorted_views()
 
 
+@pytest.mark.asyncio
+async def test_missing_dependency_after_start(
+    view_manager: ViewManager,
+    mock_view_function: Callable[[], Awaitable[MockDataModel]],
+) -> None:
+    """Test that missing dependencies are rejected on registration once started."""
+    await view_manager.start()
+
+    missing = View(function=mock_view_function, dependencies=[])
+    with pytest.raises(ValueError, match="Dependencies not found"):
+        view_manager.add_view(
+            View(function=mock_view_function, dependencies=[missing.id])
+        )
+
+    view_manager.stop()
+
+
+def test_plan_downstream(
+    view_manager: ViewManager,
+    mock_view_function: Callable[[], Awaitable[MockDataModel]],
+) -> None:
+    """Test that the compiled plan knows the views up and downstream of each view."""
+    view1 = View(name="view1", function=mock_view_function, dependencies=[])
+    view2 = View(name="view2", function=mock_view_function, dependencies=[view1.id])
+    view3 = View(name="view3", function=mock_view_function, dependencies=[view2.id])
+    view4 = View(name="view4", function=mock_view_function, dependencies=[])
+
+    for view in [view1, view2, view3, view4]:
+        view_manager.add_view(view)
+
+    plan = view_manager._get_plan()
+    assert plan.downstream[view1.id] == {view2.id, view3.id}
+    assert plan.downstream[view2.id] == {view3.id}
+    assert plan.downstream[view3.id] == frozenset()
+    assert plan.downstream[view4.id] == frozenset()
+    assert plan.upstream[view1.id] == frozenset()
+    assert plan.upstream[view3.id] == {view1.id, view2.id}
+    assert plan.upstream[view4.id] == frozenset()
+    assert [{v.id for v in generation} for generation in plan.generations] == [
+        {view1.id, view4.id},
+        {view2.id},
+        {view3.id},
+    ]
+
+
 @pytest.mark.asyncio
 async def test_recompute_materialized_views_chain(
     view_manager: ViewManager,
@@ -195,3 +270,963 @@ async def test_start(
     await asyncio.sleep(1.5)
 
     assert mock_materialized_view.latest_data.value == 42  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_materialized_view_route_serves_precomputed_response(
+    view_manager: ViewManager,
+    fastapi_app: FastAPI,
+) -> None:
+    """Test that materialized routes return the body serialized on recompute."""
+    state = State(value=42)
+
+    async def mock_view() -> MockDataModel:
+        return MockDataModel(value=state.value)
+
+    mv = MaterializedView(name="view", function=mock_view, route="/view")
+    view_manager.add_materialized_view(mv)
+    client = TestClient(fastapi_app)
+
+    # Nothing computed yet
+    assert client.get("/view").json() == {"last_updated": None, "data": None}
+
+    await view_manager._recompute_materialized_views()
+    assert mv.latest_response is not None
+
+    response = client.get("/view")
+    assert response.content == mv.latest_response
+    assert response.json()["data"] == {"value": 42}
+
+    # The body only changes on recompute
+    state.value = 100
+    assert client.get("/view").json()["data"] == {"value": 42}
+    await view_manager._recompute_materialized_views()
+    assert client.get("/view").json()["data"] == {"value": 100}
+
+
+class PersonFrame(DataFrameModel):
+    """Mock DataFrame model for testing."""
+
+    name: str
+    age: int
+
+
+@pytest.mark.asyncio
+async def test_materialized_dataframe_view_route(
+    view_manager: ViewManager,
+    fastapi_app: FastAPI,
+) -> None:
+    """Test that DataFrame materialized views are served as a list of rows."""
+
+    async def people() -> DataFrame[PersonFrame]:
+        return pl.DataFrame({"name": ["John", "Jane"], "age": [30, 25]}).pipe(
+            PersonFrame
+        )
+
+    mv = MaterializedView(name="people", function=people, route="/people")
+    view_manager.add_materialized_view(mv)
+    await view_manager._recompute_materialized_views()
+
+    response = TestClient(fastapi_app).get("/people")
+    assert response.json()["data"] == [
+        {"name": "John", "age": 30},
+        {"name": "Jane", "age": 25},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_materialized_view_columnar_formats(
+    view_manager: ViewManager,
+    fastapi_app: FastAPI,
+) -> None:
+    """Test that materialized routes return columnar formats on request."""
+    frame = pl.DataFrame({"name": ["John", "Jane"], "age": [30, 25]})
+
+    async def people() -> DataFrame[PersonFrame]:
+        return frame.pipe(PersonFrame)
+
+    mv = MaterializedView(name="people", function=people, route="/people")
+    view_manager.add_materialized_view(mv)
+    client = TestClient(fastapi_app)
+
+    # No data yet
+    assert client.get("/people?format=arrow").status_code == 503  # noqa: PLR2004
+
+    await view_manager._recompute_materialized_views()
+
+    response = client.get(
+        "/people", headers={"Accept": "application/vnd.apache.arrow.stream"}
+    )
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    assert pl.read_ipc_stream(response.content).equals(frame)
+
+    response = client.get("/people?format=parquet")
+    assert pl.read_parquet(response.content).equals(frame)
+
+    response = client.get("/people", headers={"Accept": "text/csv"})
+    assert response.text == frame.write_csv()
+
+    # The query parameter wins over the Accept header
+    response = client.get("/people?format=json", headers={"Accept": "text/csv"})
+    assert response.json()["data"][0] == {"name": "John", "age": 30}
+
+    # Bodies are encoded once per recompute
+    body = mv.response_body(mv.snapshot, ResponseFormat.ARROW)
+    assert mv.response_body(mv.snapshot, ResponseFormat.ARROW) is body
+
+    assert client.get("/people?format=xml").status_code == 422  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_columnar_formats_need_dataframes(
+    view_manager: ViewManager,
+    fastapi_app: FastAPI,
+    mock_materialized_view_function: Callable[[], Awaitable[MockDataModel]],
+) -> None:
+    """Test that columnar formats are rejected for views not returning frames."""
+    mv = MaterializedView(
+        name="view", function=mock_materialized_view_function, route="/view"
+    )
+    view_manager.add_materialized_view(mv)
+    await view_manager._recompute_materialized_views()
+
+    client = TestClient(fastapi_app)
+    assert client.get("/view?format=csv").status_code == 406  # noqa: PLR2004
+    assert client.get("/view", headers={"Accept": "*/*"}).json()["data"] == {
+        "value": 42
+    }
+
+
+def test_view_route_columnar_formats(
+    view_manager: ViewManager,
+    fastapi_app: FastAPI,
+) -> None:
+    """Test that view routes keep their parameters and return columnar formats."""
+
+    async def adults(min_age: int = 18) -> DataFrame[PersonFrame]:
+        frame = pl.DataFrame({"name": ["John", "Tim"], "age": [30, 12]})
+        return frame.filter(pl.col("age") >= min_age).pipe(PersonFrame)
+
+    view_manager.add_view(View(name="adults", function=adults, route="/adults"))
+    client = TestClient(fastapi_app)
+
+    response = client.get("/adults?min_age=10&format=csv")
+    assert response.text == "name,age\nJohn,30\nTim,12\n"
+
+    response = client.get("/adults")
+    assert response.json()["data"] == [{"name": "John", "age": 30}]
+
+    response = client.get("/adults?min_age=10&limit=1&format=ndjson")
+    assert response.text == '{"name":"John","age":30}\n'
+    assert response.headers["x-total-count"] == "2"
+
+
+def test_view_route_own_format_parameter(
+    view_manager: ViewManager,
+    fastapi_app: FastAPI,
+) -> None:
+    """Test that views keep their own `format` parameter over the reserved one."""
+
+    async def labels(
+        format: str = "short",  # noqa: A002
+    ) -> DataFrame[PersonFrame]:
+        name = "John" if format == "short" else "John Smith"
+        return pl.DataFrame({"name": [name], "age": [30]}).pipe(PersonFrame)
+
+    view_manager.add_view(View(name="labels", function=labels, route="/labels"))
+    client = TestClient(fastapi_app)
+
+    response = client.get("/labels?format=long")
+    assert response.json()["data"] == [{"name": "John Smith", "age": 30}]
+
+    response = client.get("/labels?format=long", headers={"Accept": "text/csv"})
+    assert response.text == "name,age\nJohn Smith,30\n"
+
+
+@pytest.mark.parametrize(
+    "response_format",
+    [
+        ResponseFormat.ARROW,
+        ResponseFormat.PARQUET,
+        ResponseFormat.CSV,
+        ResponseFormat.NDJSON,
+    ],
+)
+@pytest.mark.asyncio
+async def test_formats_only_return_model_columns(
+    view_manager: ViewManager,
+    fastapi_app: FastAPI,
+    response_format: ResponseFormat,
+) -> None:
+    """Test that columns outside of the view's model are never returned."""
+
+    async def people() -> DataFrame[PersonFrame]:
+        frame = pl.DataFrame({"name": ["John"], "age": [30], "secret": ["x"]})
+        return frame.pipe(DataFrame[PersonFrame])
+
+    view_manager.add_materialized_view(
+        MaterializedView(name="people", function=people, route="/people")
+    )
+    view_manager.add_view(View(name="live", function=people, route="/live"))
+    await view_manager._recompute_materialized_views()
+
+    readers = {
+        ResponseFormat.ARROW: pl.read_ipc_stream,
+        ResponseFormat.PARQUET: pl.read_parquet,
+        ResponseFormat.CSV: pl.read_csv,
+        ResponseFormat.NDJSON: pl.read_ndjson,
+    }
+    client = TestClient(fastapi_app)
+    for url in ("/people", "/live", "/people?limit=1", "/live?limit=1"):
+        separator = "&" if "?" in url else "?"
+        response = client.get(f"{url}{separator}format={response_format.value}")
+        assert readers[response_format](response.content).columns == ["name", "age"]
+
+
+@pytest.mark.asyncio
+async def test_recompute_early_cutoff(view_manager: ViewManager) -> None:
+    """Test that dependents are skipped when a view's content didn't change."""
+    state = State(value=42)
+    calls: list[str] = []
+
+    async def mock_view1() -> MockDataModel:
+        calls.append("view1")
+        return MockDataModel(value=state.value // 10)
+
+    mv1 = MaterializedView(name="view1", function=mock_view1)
+
+    async def mock_view2() -> MockDataModel2:
+        calls.append("view2")
+        value = mv1.latest_data.value
+        return MockDataModel2(value=value, derived_value=value * 2)
+
+    mv2 = MaterializedView(
+        name="view2", function=mock_view2, dependencies=[mv1.id], data_sources=[]
+    )
+
+    view_manager.add_materialized_view(mv1)
+    view_manager.add_materialized_view(mv2)
+
+    await view_manager._recompute_materialized_views()
+    assert calls == ["view1", "view2"]
+
+    # view1 is recomputed but yields the same data, so view2 is skipped
+    state.value = 43
+    await view_manager._recompute_materialized_views()
+    assert calls == ["view1", "view2", "view1"]
+
+    # view1 changed, so view2 follows
+    state.value = 50
+    await view_manager._recompute_materialized_views()
+    assert calls == ["view1", "view2", "view1", "view1", "view2"]
+    assert mv2.latest_data.derived_value == 10  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_per_view_triggers(view_manager: ViewManager) -> None:
+    """Test that views with their own trigger are recomputed on their own."""
+    state = State(value=1)
+    calls: list[str] = []
+
+    async def fast() -> MockDataModel:
+        calls.append("fast")
+        return MockDataModel(value=state.value)
+
+    async def slow() -> MockDataModel:
+        calls.append("slow")
+        return MockDataModel(value=state.value)
+
+    async def after_fast() -> MockDataModel:
+        calls.append("after_fast")
+        return MockDataModel(value=fast_view.latest_data.value)
+
+    fast_view = MaterializedView(
+        name="fast", function=fast, trigger=IntervalTrigger(seconds=5)
+    )
+    slow_view = MaterializedView(name="slow", function=slow)
+    after_fast_view = MaterializedView(
+        name="after_fast",
+        function=after_fast,
+        dependencies=[fast_view.id],
+        data_sources=[],
+    )
+    for view in [fast_view, slow_view, after_fast_view]:
+        view_manager.add_materialized_view(view)
+
+    await view_manager.start()
+    job_ids = {job.id for job in view_manager._recompute_scheduler.get_jobs()}
+    assert job_ids == {"recompute_default", f"recompute_{fast_view.id}"}
+    view_manager.stop()
+    assert sorted(calls) == ["after_fast", "fast", "slow"]
+
+    # Only the due view and what changed downstream of it are recomputed
+    calls.clear()
+    state.value = 2
+    await view_manager._recompute_materialized_views({fast_view.id})
+    assert calls == ["fast", "after_fast"]
+
+    calls.clear()
+    await view_manager._recompute_default_views()
+    assert calls == ["slow"]
+
+
+@pytest.mark.asyncio
+async def test_warm_start_from_snapshots(tmp_path: Path) -> None:
+    """Test that views are restored from snapshots and refreshed in the background."""
+    state = State(value=1)
+    calls: list[str] = []
+
+    async def people() -> DataFrame[PersonFrame]:
+        calls.append("people")
+        return pl.DataFrame({"name": ["Ada"], "age": [state.value]})
+
+    def create_manager() -> tuple[ViewManager, MaterializedView]:
+        manager = ViewManager(
+            recompute_trigger=None,
+            fastapi_app=FastAPI(),
+            snapshot_cache=FileCache(directory=tmp_path),
+        )
+        view = MaterializedView(name="people", function=people, route="/people")
+        manager.add_materialized_view(view)
+        return manager, view
+
+    # A cold start computes the view before serving and persists it
+    manager, view = create_manager()
+    await manager.start()
+    assert calls == ["people"]
+    assert manager._refresh_task is None
+    first_update = view.latest_update
+
+    # A warm start serves the snapshot right away and refreshes in the background
+    state.value = 2
+    manager, view = create_manager()
+    await manager.start()
+    assert calls == ["people"]
+    assert view.latest_update == first_update
+    assert view.latest_data["age"].to_list() == [1]
+    assert view.is_stale
+    response = TestClient(manager.fastapi_app).get("/people")
+    assert response.json()["data"] == [{"name": "Ada", "age": 1}]
+
+    await manager._refresh_task
+    assert calls == ["people", "people"]
+    assert view.latest_data["age"].to_list() == [2]
+    assert view.latest_update > first_update
+
+
+@pytest.mark.asyncio
+async def test_warm_start_without_lazy_snapshots(tmp_path: Path) -> None:
+    """Test that lazy views never read don't prevent a warm start."""
+    calls: list[str] = []
+
+    async def people() -> DataFrame[PersonFrame]:
+        calls.append("people")
+        return pl.DataFrame({"name": ["Ada"], "age": [1]})
+
+    def create_manager() -> ViewManager:
+        manager = ViewManager(
+            recompute_trigger=None,
+            fastapi_app=FastAPI(),
+            snapshot_cache=FileCache(directory=tmp_path),
+        )
+        manager.add_materialized_view(MaterializedView(name="people", function=people))
+        manager.add_materialized_view(
+            MaterializedView(
+                name="lazy",
+                function=people,
+                materialization=MaterializationMode.LAZY,
+            )
+        )
+        return manager
+
+    manager = create_manager()
+    await manager.start()
+    assert calls == ["people"]
+
+    # Only the eager view has a snapshot, which is enough to serve it right away
+    manager = create_manager()
+    await manager.start()
+    assert calls == ["people"]
+    assert manager._refresh_task is not None
+    await manager._refresh_task
+
+
+@pytest.mark.asyncio
+async def test_materialized_view_pagination(
+    view_manager: ViewManager,
+    fastapi_app: FastAPI,
+) -> None:
+    """Test that materialized routes can be paginated."""
+    frame = pl.DataFrame({"name": ["A", "B", "C", "D", "E"], "age": [1, 2, 3, 4, 5]})
+
+    async def people() -> DataFrame[PersonFrame]:
+        return frame.pipe(PersonFrame)
+
+    mv = MaterializedView(name="people", function=people, route="/people")
+    view_manager.add_materialized_view(mv)
+    await view_manager._recompute_materialized_views()
+    client = TestClient(fastapi_app)
+
+    response = client.get("/people?limit=2&offset=1")
+    assert [row["name"] for row in response.json()["data"]] == ["B", "C"]
+    assert response.headers["x-total-count"] == "5"
+    assert "offset=3" in response.headers["link"]
+    assert 'rel="next"' in response.headers["link"]
+
+    # The last page has no next page
+    response = client.get("/people?limit=2&offset=4")
+    assert [row["name"] for row in response.json()["data"]] == ["E"]
+    assert "link" not in response.headers
+
+    response = client.get("/people?limit=2&format=csv")
+    assert response.text == "name,age\nA,1\nB,2\n"
+
+    assert client.get("/people?limit=0").status_code == 422  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_materialized_view_ndjson_stream(fastapi_app: FastAPI) -> None:
+    """Test that materialized routes stream NDJSON in chunks."""
+    frame = pl.DataFrame({"name": [str(i) for i in range(5)], "age": range(5)})
+
+    async def people() -> DataFrame[PersonFrame]:
+        return frame.pipe(PersonFrame)
+
+    view_manager = ViewManager(
+        recompute_trigger=None, fastapi_app=fastapi_app, stream_chunk_rows=2
+    )
+    mv = MaterializedView(name="people", function=people, route="/people")
+    view_manager.add_materialized_view(mv)
+    await view_manager._recompute_materialized_views()
+
+    assert len(list(mv.stream_ndjson(frame, 2))) == 3  # noqa: PLR2004
+
+    response = TestClient(fastapi_app).get(
+        "/people?offset=1", headers={"Accept": "application/x-ndjson"}
+    )
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows == [{"name": str(i), "age": i} for i in range(1, 5)]
+
+
+def test_view_route_own_pagination_parameters(
+    view_manager: ViewManager,
+    fastapi_app: FastAPI,
+) -> None:
+    """Test that views keep their own `limit` and `offset` parameters."""
+    frame = pl.DataFrame({"name": [str(i) for i in range(10)], "age": range(10)})
+
+    async def people(
+        limit: int = 5, skip: Annotated[int, Query(alias="offset")] = 0
+    ) -> DataFrame[PersonFrame]:
+        return frame.slice(skip, limit).pipe(PersonFrame)
+
+    view_manager.add_view(View(name="people", function=people, route="/people"))
+    client = TestClient(fastapi_app)
+
+    response = client.get("/people")
+    assert len(response.json()["data"]) == 5  # noqa: PLR2004
+    assert "x-total-count" not in response.headers
+
+    response = client.get("/people?limit=2&offset=7")
+    assert [row["name"] for row in response.json()["data"]] == ["7", "8"]
+    assert "x-total-count" not in response.headers
+    assert "link" not in response.headers
+
+
+def test_pagination_needs_dataframes(
+    view_manager: ViewManager,
+    fastapi_app: FastAPI,
+    mock_view_function: Callable[[], Awaitable[MockDataModel]],
+) -> None:
+    """Test that views not returning frames can't be paginated."""
+    view_manager.add_view(View(name="view", function=mock_view_function, route="/v"))
+    client = TestClient(fastapi_app)
+
+    response = client.get("/v?limit=1")
+    assert response.status_code == 406  # noqa: PLR2004
+    assert response.json()["detail"] == "Pagination is only available for DataFrames"
+    assert client.get("/v").json()["data"] == {"value": 42}
+
+
+@pytest.mark.asyncio
+async def test_materialized_view_conditional_requests(
+    view_manager: ViewManager,
+    fastapi_app: FastAPI,
+) -> None:
+    """Test that materialized routes answer conditional requests with a 304."""
+    state = State(value=42)
+
+    async def mock_view() -> MockDataModel:
+        return MockDataModel(value=state.value)
+
+    mv = MaterializedView(
+        name="view",
+        function=mock_view,
+        route="/view",
+        cache_max_age=timedelta(seconds=30),
+    )
+    view_manager.add_materialized_view(mv)
+    client = TestClient(fastapi_app)
+
+    # No ETag before there is data
+    response = client.get("/view")
+    assert "etag" not in response.headers
+    assert response.headers["cache-control"] == "max-age=30"
+
+    await view_manager._recompute_materialized_views()
+    response = client.get("/view")
+    etag = response.headers["etag"]
+    assert response.headers["last-modified"].endswith("GMT")
+
+    response = client.get("/view", headers={"If-None-Match": etag})
+    assert response.status_code == 304  # noqa: PLR2004
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    # Each format has its own tag
+    response = client.get("/view?format=json", headers={"If-None-Match": "W/" + etag})
+    assert response.status_code == 304  # noqa: PLR2004
+
+    # A recompute with the same content keeps the tag, new content changes it
+    await view_manager._recompute_materialized_views()
+    assert client.get("/view", headers={"If-None-Match": etag}).status_code == 304  # noqa: PLR2004
+    state.value = 43
+    await view_manager._recompute_materialized_views()
+    response = client.get("/view", headers={"If-None-Match": etag})
+    assert response.status_code == 200  # noqa: PLR2004
+    assert response.json()["data"] == {"value": 43}
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("in_background", [False, True])
+async def test_materialized_view_compressed_responses(
+    fastapi_app: FastAPI, *, in_background: bool
+) -> None:
+    """Test that materialized routes serve responses compressed on recompute."""
+    frame = pl.DataFrame({"name": ["Ada"] * 1000, "age": range(1000)})
+
+    async def people() -> DataFrame[PersonFrame]:
+        return frame.pipe(PersonFrame)
+
+    view_manager = ViewManager(
+        recompute_trigger=None,
+        fastapi_app=fastapi_app,
+        compression_encodings=(ContentEncoding.GZIP,),
+        compress_in_background=in_background,
+    )
+    mv = MaterializedView(name="people", function=people, route="/people")
+    view_manager.add_materialized_view(mv)
+    await view_manager._recompute_materialized_views()
+    await asyncio.gather(*view_manager._background_tasks)
+
+    variant = mv.latest_compressed_responses[ContentEncoding.GZIP]
+    assert variant.original_size == len(mv.latest_response)
+
+    client = TestClient(fastapi_app)
+    response = client.get("/people", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].endswith('-json-gzip"')
+    assert response.content == mv.latest_response
+
+    response = client.get("/people", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.content == mv.latest_response
+
+
+@pytest.mark.asyncio
+async def test_materialized_view_queries(
+    view_manager: ViewManager,
+    fastapi_app: FastAPI,
+) -> None:
+    """Test that materialized routes run queries and cache their results."""
+    state = State(value=0)
+
+    async def people() -> DataFrame[PersonFrame]:
+        ages = [10, 20, 30, 40, 50]
+        return pl.DataFrame(
+            {"name": ["A", "B", "C", "D", "E"], "age": [a + state.value for a in ages]}
+        ).pipe(PersonFrame)
+
+    mv = MaterializedView(name="people", function=people, route="/people")
+    view_manager.add_materialized_view(mv)
+    await view_manager._recompute_materialized_views()
+    client = TestClient(fastapi_app)
+
+    route = "/people?columns=name&filter=age:gte:20&sort=-age&limit=2"
+    response = client.get(route)
+    assert response.json()["data"] == [{"name": "E"}, {"name": "D"}]
+    assert "offset=2" in response.headers["link"]
+    assert "etag" in response.headers
+
+    response = client.get(route.replace("limit=2", "format=csv"))
+    assert response.text == "name\nE\nD\nC\nB\n"
+
+    # Identical queries hit the cache until the next recompute
+    client.get(route)
+    assert mv.query_results.hits == 1
+    assert mv.query_results.misses == 2  # noqa: PLR2004
+
+    state.value = 100
+    await view_manager._recompute_materialized_views()
+    assert len(mv.query_results) == 0
+    response = client.get("/people?filter=age:gt:140")
+    assert response.json()["data"] == [{"name": "E", "age": 150}]
+
+    response = client.get("/people?filter=height:gt:1")
+    assert response.status_code == 400  # noqa: PLR2004
+    assert "Unknown column 'height'" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_queries_only_return_model_columns(
+    view_manager: ViewManager,
+    fastapi_app: FastAPI,
+) -> None:
+    """Test that queries never expose columns outside of the view's model."""
+
+    async def people() -> DataFrame[PersonFrame]:
+        frame = pl.DataFrame(
+            {"name": ["John", "Jane"], "age": [30, 25], "secret": ["x", "y"]}
+        )
+        return frame.pipe(DataFrame[PersonFrame])
+
+    view_manager.add_materialized_view(
+        MaterializedView(name="people", function=people, route="/people")
+    )
+    await view_manager._recompute_materialized_views()
+    client = TestClient(fastapi_app)
+
+    for query in ("sort=age", "filter=age:in:30|25", "columns=age,age"):
+        response = client.get(f"/people?{query}")
+        assert response.status_code == 200  # noqa: PLR2004
+        assert all("secret" not in row for row in response.json()["data"])
+    response = client.get("/people?sort=age&format=csv")
+    assert response.text == "name,age\nJane,25\nJohn,30\n"
+
+    response = client.get("/people?filter=secret:eq:x")
+    assert response.status_code == 400  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_query_errors_are_bad_requests(
+    view_manager: ViewManager,
+    fastapi_app: FastAPI,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that queries Polars can't run on the data are rejected with a 400."""
+
+    async def people() -> DataFrame[PersonFrame]:
+        frame = pl.DataFrame({"name": ["John"], "age": [30]})
+        return frame.pipe(DataFrame[PersonFrame])
+
+    view_manager.add_materialized_view(
+        MaterializedView(name="people", function=people, route="/people")
+    )
+    await view_manager._recompute_materialized_views()
+    monkeypatch.setattr(
+        ViewQuery,
+        "apply",
+        lambda _, frame: frame.filter(pl.col("age").str.starts_with("3")),
+    )
+
+    response = TestClient(fastapi_app).get("/people?sort=age")
+    assert response.status_code == 400  # noqa: PLR2004
+    assert response.json()["detail"].startswith("Invalid query")
+
+
+@pytest.mark.asyncio
+async def test_view_route_coalesces_identical_calls(
+    view_manager: ViewManager,
+    fastapi_app: FastAPI,
+) -> None:
+    """Test that identical concurrent requests share a single call of the view."""
+    release = asyncio.Event()
+    calls: list[int] = []
+
+    async def slow_view(value: int) -> MockDataModel:
+        calls.append(value)
+        await release.wait()
+        return MockDataModel(value=value)
+
+    view_manager.add_view(View(name="slow", function=slow_view, route="/slow"))
+
+    transport = httpx.ASGITransport(app=fastapi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        requests = [
+            asyncio.create_task(client.get(f"/slow?value={value}"))
+            for value in [1, 1, 2, 1]
+        ]
+        await asyncio.sleep(0.1)
+        release.set()
+        responses = await asyncio.gather(*requests)
+
+    assert [r.json()["data"]["value"] for r in responses] == [1, 1, 2, 1]
+    assert sorted(calls) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_recompute_coalesces_identical_requests(
+    view_manager: ViewManager,
+) -> None:
+    """Test that identical on-demand recomputes share a single pass."""
+    calls: list[str] = []
+
+    async def mock_view() -> MockDataModel:
+        calls.append("view")
+        await asyncio.sleep(0.01)
+        return MockDataModel(value=len(calls))
+
+    mv = MaterializedView(name="view", function=mock_view)
+    view_manager.add_materialized_view(mv)
+
+    await asyncio.gather(*(view_manager.recompute() for _ in range(3)))
+    assert calls == ["view"]
+    assert mv.latest_data.value == 1
+
+    await asyncio.gather(view_manager.recompute([mv]), view_manager.recompute([mv]))
+    assert calls == ["view", "view"]
+
+
+@pytest.mark.asyncio
+async def test_recompute_publishes_consistent_generations(fastapi_app: FastAPI) -> None:
+    """Test that readers never mix views from different recompute passes."""
+    view_manager = ViewManager(
+        recompute_trigger=None,
+        fastapi_app=fastapi_app,
+        generation_grace_period=timedelta(minutes=1),
+    )
+    state = State(value=1)
+    release = asyncio.Event()
+
+    async def base() -> MockDataModel:
+        return MockDataModel(value=state.value)
+
+    async def derived() -> MockDataModel2:
+        await release.wait()
+        value = base_view.latest_data.value
+        return MockDataModel2(value=value, derived_value=value * 2)
+
+    base_view = MaterializedView(name="base", function=base, route="/base")
+    derived_view = MaterializedView(
+        name="derived",
+        function=derived,
+        route="/derived",
+        dependencies=[base_view.id],
+    )
+    view_manager.add_materialized_view(base_view)
+    view_manager.add_materialized_view(derived_view)
+
+    release.set()
+    await view_manager._recompute_materialized_views()
+    client = TestClient(fastapi_app)
+    response = client.get("/base")
+    assert response.headers["X-Generation"] == "1"
+
+    # Mid-pass, the base view is recomputed but not published yet
+    state.value = 2
+    release.clear()
+    recompute = asyncio.create_task(view_manager._recompute_materialized_views())
+    await asyncio.sleep(0.05)
+    assert base_view.latest_data.value == 1
+    assert client.get("/base").json()["data"]["value"] == 1
+
+    release.set()
+    await recompute
+    response = client.get("/derived")
+    assert response.headers["X-Generation"] == "2"
+    assert response.json()["data"]["value"] == 2  # noqa: PLR2004
+
+    # The previous generation can still be read during the grace period
+    response = client.get("/base?generation=1")
+    assert response.headers["X-Generation"] == "1"
+    assert response.json()["data"]["value"] == 1
+    assert client.get("/base?generation=5").status_code == 410  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_generation_headers_match_the_body(fastapi_app: FastAPI) -> None:
+    """Test that the generation and ETag are those of the data that was read."""
+    view_manager = ViewManager(
+        recompute_trigger=None,
+        fastapi_app=fastapi_app,
+        generation_grace_period=timedelta(minutes=1),
+    )
+    release = asyncio.Event()
+
+    async def first() -> MockDataModel:
+        return MockDataModel(value=1)
+
+    async def second() -> MockDataModel:
+        return MockDataModel(value=2)
+
+    async def slow_view() -> MockDataModel:
+        value = first_view.latest_data.value
+        await release.wait()
+        return MockDataModel(value=value)
+
+    first_view = MaterializedView(name="first", function=first, route="/first")
+    view_manager.add_materialized_view(first_view)
+    view_manager.add_view(View(name="slow", function=slow_view, route="/slow"))
+    await view_manager._recompute_materialized_views()
+
+    # A view added later isn't part of the first generation
+    second_view = MaterializedView(name="second", function=second, route="/second")
+    view_manager.add_materialized_view(second_view)
+    await view_manager._recompute_materialized_views({second_view.id})
+    response = TestClient(fastapi_app).get("/second?generation=1")
+    assert response.json()["data"] is None
+    assert "etag" not in response.headers
+
+    # A call joining one in flight gets the generation the call read
+    transport = httpx.ASGITransport(app=fastapi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        leader = asyncio.create_task(client.get("/slow"))
+        await asyncio.sleep(0.05)
+        view_manager._generations.publish({first_view.id: first_view.snapshot})
+        follower = asyncio.create_task(client.get("/slow"))
+        await asyncio.sleep(0.05)
+        release.set()
+        responses = await asyncio.gather(leader, follower)
+    assert [r.headers["X-Generation"] for r in responses] == ["2", "2"]
+
+
+@pytest.mark.asyncio
+async def test_lazy_materialized_view(fastapi_app: FastAPI) -> None:
+    """Test that lazy views are computed on read and refreshed in the background."""
+    view_manager = ViewManager(recompute_trigger=None, fastapi_app=fastapi_app)
+    state = State(value=1)
+    calls: list[int] = []
+
+    async def base() -> MockDataModel:
+        return MockDataModel(value=state.value)
+
+    async def lazy() -> MockDataModel:
+        await asyncio.sleep(0.01)
+        calls.append(base_view.latest_data.value)
+        return MockDataModel(value=base_view.latest_data.value)
+
+    base_view = MaterializedView(name="base", function=base)
+    lazy_view = MaterializedView(
+        name="lazy",
+        function=lazy,
+        route="/lazy",
+        dependencies=[base_view.id],
+        materialization=MaterializationMode.LAZY,
+        ttl=timedelta(minutes=1),
+    )
+    view_manager.add_materialized_view(base_view)
+    view_manager.add_materialized_view(lazy_view)
+
+    # Passes don't compute lazy views
+    await view_manager._recompute_materialized_views()
+    assert lazy_view.latest_data is None
+
+    transport = httpx.ASGITransport(app=fastapi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        # The first read waits for the view, later ones are served from memory
+        assert (await client.get("/lazy")).json()["data"]["value"] == 1
+        assert (await client.get("/lazy")).json()["data"]["value"] == 1
+        assert calls == [1]
+
+        # A dependency changed, so the next read is stale and triggers a refresh
+        state.value = 2
+        await view_manager._recompute_materialized_views()
+        assert calls == [1]
+        assert (await client.get("/lazy")).json()["data"]["value"] == 1
+        await asyncio.gather(*view_manager._background_tasks)
+        assert calls == [1, 2]
+        assert (await client.get("/lazy")).json()["data"]["value"] == 2  # noqa: PLR2004
+
+        # The TTL expired, so the same happens
+        lazy_view.ttl = timedelta(0)
+        assert (await client.get("/lazy")).json()["data"]["value"] == 2  # noqa: PLR2004
+        await asyncio.gather(*view_manager._background_tasks)
+        assert calls == [1, 2, 2]
+
+
+def test_lazy_views_read_through_shared_dependencies(
+    view_manager: ViewManager, fastapi_app: FastAPI
+) -> None:
+    """Test that each lazy view a request reads is materialized once, in order."""
+    calls: list[str] = []
+
+    def make_lazy(name: str, dependencies: list[MaterializedView]) -> MaterializedView:
+        async def function() -> MockDataModel:
+            calls.append(name)
+            return MockDataModel(value=len(calls))
+
+        return MaterializedView(
+            name=name,
+            function=function,
+            dependencies=[dep.id for dep in dependencies],
+            materialization=MaterializationMode.LAZY,
+        )
+
+    async def report() -> MockDataModel:
+        return MockDataModel(value=len(calls))
+
+    async def eager() -> MockDataModel:
+        return MockDataModel(value=0)
+
+    base = make_lazy("base", [])
+    left = make_lazy("left", [base])
+    right = make_lazy("right", [base])
+    eager_view = MaterializedView(name="eager", function=eager, route="/eager")
+    report_view = View(
+        name="report",
+        function=report,
+        route="/report",
+        dependencies=[left.id, right.id],
+    )
+    for view in (base, left, right, eager_view):
+        view_manager.add_materialized_view(view)
+    view_manager.add_view(report_view)
+
+    client = TestClient(fastapi_app)
+    assert client.get("/report").json()["data"]["value"] == 3  # noqa: PLR2004
+    assert calls[0] == "base"
+    assert sorted(calls) == ["base", "left", "right"]
+    assert view_manager._lazy_upstream[report_view.id][0] is base
+
+    # Requests only reading eager views have no lazy views to check
+    client.get("/eager")
+    assert view_manager._lazy_upstream[eager_view.id] == []
+
+
+@pytest.mark.asyncio
+async def test_background_failures_are_logged_and_retried(
+    fastapi_app: FastAPI,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+) -> None:
+    """Test that failed background refreshes are logged, and restored ones retried."""
+    view_manager = ViewManager(recompute_trigger=None, fastapi_app=fastapi_app)
+    attempts = 0
+
+    async def flaky() -> MockDataModel:
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:  # noqa: PLR2004
+            msg = "source unavailable"
+            raise RuntimeError(msg)
+        return MockDataModel(value=attempts)
+
+    view = MaterializedView(name="flaky", function=flaky)
+    view_manager.add_materialized_view(view)
+
+    view_manager._start_background(view_manager.recompute([view]), "Catch-up")
+    await asyncio.gather(*view_manager._background_tasks, return_exceptions=True)
+    assert (
+        "Catch-up failed: RuntimeError('source unavailable')" in capsys.readouterr().out
+    )
+
+    async def no_sleep(_: float) -> None:
+        pass
+
+    monkeypatch.setattr(asyncio, "sleep", no_sleep)
+    await view_manager._refresh_restored_views()
+    assert attempts == 3  # noqa: PLR2004
+    assert view.latest_data.value == 3  # noqa: PLR2004
+    assert "retrying in 1s" in capsys.readouterr().out
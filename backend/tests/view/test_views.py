@@ -1,8 +1,14 @@
 """Tests for view implementations."""
 
+import json
 from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
 
+import polars as pl
 import pytest
+from pandera.errors import SchemaError
+from pandera.polars import DataFrameModel
+from pandera.typing.polars import DataFrame
 from pydantic import BaseModel
 
 from tacobi.view import MaterializedView, View
@@ -70,3 +76,56 @@ async def test_recompute_updates_data(
     new_data: MockDataModel = mock_materialized_view.latest_data
     assert initial_data is not new_data  # Should be new instance
     assert initial_data.value == new_data.value  # But same value
+
+
+@pytest.mark.asyncio
+async def test_recompute_with_same_content_keeps_latest_update(
+    mock_materialized_view: MaterializedView,
+) -> None:
+    """Test that a recompute yielding the same content isn't reported as a change."""
+    assert await mock_materialized_view.recompute_latest_data()
+    latest_update = mock_materialized_view.latest_update
+
+    assert not await mock_materialized_view.recompute_latest_data()
+    assert mock_materialized_view.latest_update == latest_update
+
+
+class PersonFrame(DataFrameModel):
+    """Mock DataFrame model for testing."""
+
+    name: str
+    age: int
+
+
+async def people() -> DataFrame[PersonFrame]:
+    """Mock view function returning a DataFrame."""
+    return pl.DataFrame({"name": ["John", "Jane"], "age": [30, 25]})
+
+
+def test_serialize_dataframe_response() -> None:
+    """Test that frames serialize like the response model would."""
+    view = View(name="people", function=people)
+    frame = pl.DataFrame({"name": ["John", "Jane"], "age": [30, 25], "extra": [1, 2]})
+    last_updated = datetime(2024, 1, 1, tzinfo=UTC)
+
+    body = view.serialize_response(frame, last_updated)
+
+    expected = view.fastapi_response_model(
+        data=view.convert_to_base_model(frame), last_updated=last_updated
+    )
+    parsed = view.fastapi_response_model.model_validate_json(body)
+    assert parsed == expected
+    assert json.loads(body)["data"] == [
+        {"name": "John", "age": 30},
+        {"name": "Jane", "age": 25},
+    ]
+
+    # The schema is validated once for the whole frame
+    with pytest.raises(SchemaError):
+        view.serialize_response(frame.drop("age"), last_updated)
+
+    # Empty responses keep the envelope
+    assert json.loads(view.serialize_response(None, None)) == {
+        "last_updated": None,
+        "data": None,
+    }